@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Name: Video2X Batch Scheduler
+Author: K4YT3X
+Date Created: October 17, 2026
+Last Modified: October 17, 2026
+
+Description: This class decides when the videos of a directory
+are upscaled and shares driver slots, encode slots and scratch
+space between the videos that are upscaled at the same time.
+"""
+
+# built-in imports
+import threading
+
+# how often threads waiting for a slot check if they have been stopped (in seconds)
+SLOT_INTERVAL = 0.5
+
+
+class BatchScheduler:
+    """ Video2X Batch Scheduler
+
+    Videos are started shortest first, which minimizes the mean
+    time until a video is finished. A video is started when fewer
+    than the allowed number of videos are running and its
+    estimated peak scratch usage fits into the scratch space the
+    running videos leave. If the shortest pending video does not
+    fit, the next shortest one that fits is started instead.
+
+    The videos that are running share the driver slots and the
+    encode slots, so one video's drivers can keep running while
+    another video is being extracted or encoded, without running
+    more drivers or encoders at once than configured.
+    """
+
+    def __init__(self, plans, concurrent_videos, driver_slots, encode_slots, scratch_size):
+        # videos that could not be probed are started last
+        self.pending_videos = sorted(plans, key=lambda plan: (plan['frames'] is None, plan['frames'] or 0))
+        self.concurrent_videos = concurrent_videos
+        self.driver_slots = threading.BoundedSemaphore(driver_slots)
+        self.encode_slots = threading.BoundedSemaphore(encode_slots)
+        self.scratch_size = scratch_size
+        self.reserved_scratch_size = 0
+        self.running_videos = {}
+
+    def next_video(self):
+        """ take the shortest pending video that can be started now
+
+        A video needing more scratch space than there is at all
+        reserves all of it, so it is started once no other video
+        is running.
+
+        Returns:
+            dict -- estimates of the video from Upscaler.plan(), None if no video can be started
+        """
+        if len(self.running_videos) >= self.concurrent_videos:
+            return None
+
+        for plan in self.pending_videos:
+            scratch_size = min(plan['peak_scratch_size'] or 0, self.scratch_size)
+            if self.reserved_scratch_size + scratch_size <= self.scratch_size:
+                self.pending_videos.remove(plan)
+                self.running_videos[plan['input']] = scratch_size
+                self.reserved_scratch_size += scratch_size
+                return plan
+
+        return None
+
+    def finish_video(self, plan):
+        """ free the scratch space reserved for a video
+
+        Arguments:
+            plan {dict} -- estimates of the video returned by next_video()
+        """
+        self.reserved_scratch_size -= self.running_videos.pop(plan['input'])
+
+    def get_scratch_size(self, plan):
+        """ get the scratch space reserved for a running video
+
+        Arguments:
+            plan {dict} -- estimates of the video returned by next_video()
+
+        Returns:
+            int -- reserved scratch space in bytes
+        """
+        return self.running_videos[plan['input']]
+
+    @staticmethod
+    def acquire(slots, is_stopped):
+        """ wait for a free driver or encode slot
+
+        Arguments:
+            slots {threading.BoundedSemaphore} -- driver_slots or encode_slots
+            is_stopped {callable} -- returns True once waiting is pointless
+
+        Returns:
+            bool -- True if a slot has been taken, False if stopped before
+        """
+        # waking up once in a while lets stop requests through
+        while not is_stopped():
+            if slots.acquire(timeout=SLOT_INTERVAL):
+                return True
+        return False
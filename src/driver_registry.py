@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Name: Video2X Driver Registry
+Author: K4YT3X
+Date Created: October 17, 2026
+Last Modified: October 17, 2026
+
+Description: These functions find the wrappers of built-in
+drivers and of drivers installed as plugins.
+"""
+
+# local imports
+from exceptions import UnrecognizedDriverError
+
+# built-in imports
+import importlib
+import threading
+
+# these names are consistent for
+# - driver selection in command line
+# - driver wrapper file names
+# - config file keys
+BUILTIN_DRIVERS = ['waifu2x_caffe',
+                   'waifu2x_converter_cpp',
+                   'waifu2x_ncnn_vulkan',
+                   'srmd_ncnn_vulkan',
+                   'anime4kcpp']
+
+# packages register drivers as entry points in this group
+# the name of an entry point is the driver's name, its object the wrapper class
+# e.g. realsr_ncnn_vulkan = video2x_realsr.wrapper:WrapperMain
+ENTRY_POINT_GROUP = 'video2x.drivers'
+
+# wrapper classes of drivers that have been imported
+DRIVER_WRAPPERS = {}
+DRIVER_WRAPPERS_LOCK = threading.Lock()
+
+# entry points of plugin drivers, read once per process
+PLUGIN_DRIVERS = None
+
+
+def get_plugin_drivers():
+    """ find the drivers installed as plugins
+
+    Returns:
+        dict -- driver names to their entry points
+    """
+    global PLUGIN_DRIVERS
+    if PLUGIN_DRIVERS is None:
+        # reading the metadata of every installed package takes a while
+        # it is only done once a driver that is not built in is asked for
+        import importlib.metadata
+        entry_points = importlib.metadata.entry_points()
+        if hasattr(entry_points, 'select'):
+            entry_points = entry_points.select(group=ENTRY_POINT_GROUP)
+        else:
+            entry_points = entry_points.get(ENTRY_POINT_GROUP, [])
+        PLUGIN_DRIVERS = {entry_point.name: entry_point for entry_point in entry_points if entry_point.name not in BUILTIN_DRIVERS}
+    return PLUGIN_DRIVERS
+
+
+def get_available_drivers():
+    """ list built-in drivers and drivers installed as plugins
+
+    Returns:
+        list -- names of the drivers
+    """
+    return BUILTIN_DRIVERS + sorted(get_plugin_drivers())
+
+
+def get_driver_wrapper(driver):
+    """ import the wrapper class of a driver
+
+    Arguments:
+        driver {str} -- name of the driver
+
+    Returns:
+        class -- the driver's wrapper class, usually a subclass of DriverWrapper
+
+    Raises:
+        UnrecognizedDriverError -- if there is no such driver
+    """
+    with DRIVER_WRAPPERS_LOCK:
+        if driver not in DRIVER_WRAPPERS:
+            if driver in BUILTIN_DRIVERS:
+                DRIVER_WRAPPERS[driver] = getattr(importlib.import_module(f'wrappers.{driver}'), 'WrapperMain')
+            elif driver in get_plugin_drivers():
+                DRIVER_WRAPPERS[driver] = get_plugin_drivers()[driver].load()
+            else:
+                raise UnrecognizedDriverError(f'unrecognized driver {driver}')
+        return DRIVER_WRAPPERS[driver]
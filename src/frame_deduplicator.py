@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Name: Video2X Frame Deduplicator
+Author: K4YT3X
+Date Created: October 17, 2026
+Last Modified: October 17, 2026
+
+Description: This class finds extracted frames that are
+identical or nearly identical to the frame before them.
+"""
+
+# built-in imports
+import hashlib
+
+# third-party imports
+from PIL import Image
+import numpy
+
+# frames are compared in blocks of this size in near mode
+# so a small moving area is not averaged away by a static background
+BLOCK_SIZE = 16
+
+
+class FrameDeduplicator:
+    """ Video2X Frame Deduplicator
+
+    Frames have to be checked in order. Each frame is compared
+    against the last frame that was not a duplicate, so held
+    frames (animation on twos/threes, title cards, pauses) only
+    have to be upscaled once.
+
+    In exact mode, the image files are hashed. FFmpeg encodes
+    identical pixels into identical files, so this is the same
+    as hashing the pixels without having to decode them.
+
+    In near mode, the largest mean squared error of all blocks
+    of the frame is compared against the threshold.
+    """
+
+    def __init__(self, mode, threshold):
+        self.mode = mode
+        self.threshold = threshold
+        self.previous_frame_index = None
+        self.previous_frame = None
+        self.duplicates = 0
+
+    def find_duplicate(self, frame_index, frame):
+        """ check if a frame duplicates the last unique frame
+
+        Arguments:
+            frame_index {int} -- index of the frame in extracted_%d
+            frame {pathlib.Path} -- path of the extracted frame
+
+        Returns:
+            int -- index of the unique frame this frame duplicates, None if unique
+        """
+        if self.mode == 'exact':
+            current_frame = hashlib.blake2b(frame.read_bytes(), digest_size=16).digest()
+            duplicate = current_frame == self.previous_frame
+        else:
+            with Image.open(frame) as image:
+                current_frame = numpy.asarray(image.convert('RGB'), dtype=numpy.float32)
+            duplicate = (self.previous_frame is not None and
+                         current_frame.shape == self.previous_frame.shape and
+                         self._distance(current_frame, self.previous_frame) <= self.threshold)
+
+        if duplicate:
+            self.duplicates += 1
+            return self.previous_frame_index
+
+        self.previous_frame_index = frame_index
+        self.previous_frame = current_frame
+        return None
+
+    def reset(self):
+        """ forget the last unique frame
+
+        The next frame is always treated as unique.
+        """
+        self.previous_frame_index = None
+        self.previous_frame = None
+
+    @staticmethod
+    def _distance(frame, previous_frame):
+        """ largest mean squared error of all blocks
+
+        Arguments:
+            frame {numpy.ndarray} -- pixels of the frame
+            previous_frame {numpy.ndarray} -- pixels of the frame to compare to
+
+        Returns:
+            float -- largest mean squared error of all blocks
+        """
+        return float(block_errors(frame, previous_frame).max())
+
+
+def block_errors(frame, previous_frame):
+    """ mean squared error of each block of two frames
+
+    Arguments:
+        frame {numpy.ndarray} -- pixels of the frame
+        previous_frame {numpy.ndarray} -- pixels of the frame to compare to
+
+    Returns:
+        numpy.ndarray -- 2D array of mean squared errors, one per block
+    """
+    squared_error = numpy.square(frame - previous_frame).mean(axis=2)
+
+    # pad the edges so the frame divides into whole blocks
+    height, width = squared_error.shape
+    squared_error = numpy.pad(squared_error,
+                              ((0, -height % BLOCK_SIZE), (0, -width % BLOCK_SIZE)),
+                              mode='edge')
+
+    blocks = squared_error.reshape(squared_error.shape[0] // BLOCK_SIZE, BLOCK_SIZE,
+                                   squared_error.shape[1] // BLOCK_SIZE, BLOCK_SIZE)
+    return blocks.mean(axis=(1, 3))
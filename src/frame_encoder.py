@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Name: Video2X Frame Encoder
+Author: K4YT3X
+Date Created: October 17, 2026
+Last Modified: October 17, 2026
+
+Description: This class streams upscaled frames into FFmpeg
+while the rest of the video is still being upscaled.
+"""
+
+# built-in imports
+import contextlib
+import heapq
+import queue
+import threading
+
+
+class FrameEncoder(threading.Thread):
+    """ Video2X Frame Encoder
+
+    Upscaled frames do not finish in order since several
+    drivers work on different batches at the same time. This
+    class keeps the indices of finished frames in a reorder
+    buffer and pipes the frames into FFmpeg as soon as the
+    frames before them have all been piped. Each frame is
+    deleted once FFmpeg has received it.
+
+    Extends:
+        threading.Thread
+    """
+
+    def __init__(self, upscaler, encoder_process):
+        threading.Thread.__init__(self)
+        self.upscaler = upscaler
+        self.encoder_process = encoder_process
+        self.frame_queue = queue.Queue()
+        self.reorder_buffer = []
+        self.next_frame_index = 1
+        self.previous_frame = None
+        self.exception = None
+        self.running = False
+
+    def run(self):
+        """ Run frame encoder
+        """
+        self.running = True
+
+        try:
+            while self.running:
+                frame_index = self.frame_queue.get()
+
+                # no more frames will be upscaled
+                if frame_index is None:
+                    break
+
+                heapq.heappush(self.reorder_buffer, frame_index)
+
+                # pipe all frames that are now in order
+                while self.reorder_buffer and self.reorder_buffer[0] == self.next_frame_index:
+                    self._encode_frame(heapq.heappop(self.reorder_buffer))
+                    self.next_frame_index += 1
+
+            # frames still in the buffer have missing frames before them
+            if self.running and self.reorder_buffer:
+                raise FileNotFoundError(f'upscaled frame {self.next_frame_index} is missing')
+
+        except Exception as e:
+            self.exception = e
+
+        finally:
+            # closing stdin tells FFmpeg to finish encoding
+            with contextlib.suppress(OSError):
+                self.encoder_process.stdin.close()
+            self.upscaler.supervisor.notify(self)
+
+    def put(self, frame_index):
+        """ mark a frame as upscaled
+
+        Arguments:
+            frame_index {int} -- index of the upscaled frame in extracted_%d
+        """
+        self.frame_queue.put(frame_index)
+
+    def finish(self):
+        """ signal that all frames have been upscaled
+        """
+        self.frame_queue.put(None)
+
+    def stop(self):
+        """ Stop the frame encoder and FFmpeg
+        """
+        self.running = False
+        self.finish()
+        with contextlib.suppress(OSError):
+            self.encoder_process.terminate()
+        self.join()
+
+    def _encode_frame(self, frame_index):
+        """ pipe one upscaled frame into FFmpeg and reclaim it
+
+        Arguments:
+            frame_index {int} -- index of the frame in extracted_%d
+        """
+        # duplicate frames always duplicate the last unique frame
+        # which is the last frame that has been piped
+        if frame_index in self.upscaler.duplicate_frames:
+            pass
+
+        # tiled frames only have their changed tiles upscaled
+        elif self.upscaler.frame_tiler is not None and frame_index in self.upscaler.frame_tiler.tiled_frames:
+            self.previous_frame = self.upscaler.frame_tiler.composite(frame_index, self.previous_frame, self.upscaler.upscaled_frames)
+
+        else:
+            frame = self.upscaler.upscaled_frames / f'extracted_{frame_index}.{self.upscaler.image_format}'
+            self.previous_frame = frame.read_bytes()
+            self.upscaler.frame_reclaimer.reclaim([frame])
+
+        self.encoder_process.stdin.write(self.previous_frame)
+        if self.upscaler.job_ledger is not None:
+            self.upscaler.job_ledger.mark('encoded', frame_index)
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Name: Video2X Frame Feeder
+Author: K4YT3X
+Date Created: October 17, 2026
+Last Modified: October 17, 2026
+
+Description: This class hands frames to the frame scheduler
+while FFmpeg is still extracting them.
+"""
+
+# built-in imports
+import contextlib
+import threading
+import time
+
+# extraction is resumed once frames take less than this fraction of the cache size limit
+RESUME_FRACTION = 0.9
+
+
+class FrameFeeder(threading.Thread):
+    """ Video2X Frame Feeder
+
+    FFmpeg writes extracted frames one after another. A frame
+    is therefore complete once the next frame shows up or once
+    FFmpeg has exited. This class watches for completed frames
+    and puts them into the frame scheduler in order.
+
+    When too many extracted frames are waiting to be upscaled,
+    or frames take more disk space than the cache size limit,
+    the FFmpeg process is suspended until the drivers catch up
+    to keep the disk usage bounded.
+
+    Extends:
+        threading.Thread
+    """
+
+    def __init__(self, upscaler, extraction_process, frame_scheduler):
+        threading.Thread.__init__(self)
+        self.upscaler = upscaler
+        self.extraction_process = extraction_process
+        self.frame_scheduler = frame_scheduler
+        self.suspended = False
+        self.exception = None
+        self.running = False
+
+        # extraction has been started right before the feeder is created
+        self.started = time.time()
+        self.extraction_time = None
+
+        # FFmpeg is only reaped once the supervisor watches it, which is after the feeder is created
+        # until then its PID cannot have been given to another process, and psutil refuses
+        # to suspend a process whose PID has been reused once it has a handle
+        self.extraction_handle = None
+        if extraction_process is not None and extraction_process.returncode is None:
+            import psutil
+            with contextlib.suppress(psutil.NoSuchProcess):
+                self.extraction_handle = psutil.Process(extraction_process.pid)
+
+    def run(self):
+        """ Run frame feeder
+        """
+        self.running = True
+
+        try:
+            frame_index = 1
+            while self.running:
+
+                # check if FFmpeg has exited before looking at the files
+                # so no frame can be written after the check
+                # frames of resumed jobs may have been extracted by an earlier attempt
+                extraction_finished = self.extraction_process is None or self.extraction_process.poll() is not None
+                if extraction_finished and self.extraction_time is None and self.extraction_process is not None:
+                    self.extraction_time = time.time() - self.started
+
+                frame = self.upscaler.extracted_frames / f'extracted_{frame_index}.{self.upscaler.image_format}'
+                next_frame = self.upscaler.extracted_frames / f'extracted_{frame_index + 1}.{self.upscaler.image_format}'
+
+                # frames upscaled by an earlier attempt have been deleted already
+                resumed_frame = (self.extraction_process is None and
+                                 self.upscaler.job_ledger.is_marked('upscaled', frame_index))
+
+                if resumed_frame or (extraction_finished and frame.is_file()) or next_frame.is_file():
+
+                    # duplicate and cached frames are not upscaled
+                    frames = self.upscaler._find_changes(frame_index, frame)
+                    if frames:
+                        self.frame_scheduler.put(frame_index, frames)
+                    else:
+                        self.frame_scheduler.put_upscaled(frame_index)
+
+                    frame_index += 1
+                    self._throttle()
+
+                # all frames have been handed out, the exact number of frames is now known
+                elif extraction_finished:
+                    self.upscaler.total_frames = frame_index - 1
+                    if self.upscaler.job_ledger is not None and (self.extraction_process is None or self.extraction_process.returncode == 0):
+                        self.upscaler.job_ledger.complete_stage('extracted', frames=self.upscaler.total_frames)
+                    break
+
+                else:
+                    time.sleep(0.01)
+
+        # the upscaler stops the job instead of encoding the frames handed out so far
+        except Exception as e:
+            self.exception = e
+
+        finally:
+            self._resume_extraction()
+            self.frame_scheduler.finish()
+            self.upscaler.supervisor.notify(self)
+
+    def stop(self):
+        """ Stop the frame feeder
+        """
+        self.running = False
+        self.join()
+
+    def _throttle(self):
+        """ suspend FFmpeg while too many frames are waiting or on disk
+
+        Extraction is resumed once the number of frames waiting
+        to be upscaled drops to half of the window, and the disk
+        space used by frames drops below the cache size limit
+        again.
+        """
+        if self.extraction_handle is None:
+            return
+
+        window = self.upscaler.pipeline_window
+        if self.frame_scheduler.pending_frames < window and not self._over_cache_size(1):
+            return
+
+        # FFmpeg that has exited has nothing left to extract
+        if self.extraction_process.poll() is not None:
+            return
+
+        import psutil
+        try:
+            self.extraction_handle.suspend()
+        except psutil.NoSuchProcess:
+            return
+        self.suspended = True
+
+        # frames that have been reclaimed free up the window and the disk
+        # disk space can only be freed while frames are being upscaled or encoded
+        reclaimed = self.upscaler.frame_reclaimer.reclaimed
+        while self.running and self.frame_scheduler.is_alive():
+            reclaimable = self.frame_scheduler.pending_frames > 0 or self.upscaler.frame_encoder is not None
+            if self.frame_scheduler.pending_frames <= window // 2 and not (reclaimable and self._over_cache_size(RESUME_FRACTION)):
+                break
+            with reclaimed:
+                reclaimed.wait(0.1)
+
+        self._resume_extraction()
+
+    def _over_cache_size(self, fraction):
+        """ check if frames take more disk space than a fraction of the cache size limit
+
+        Arguments:
+            fraction {float} -- fraction of the cache size limit
+
+        Returns:
+            bool -- True if the frames take more space
+        """
+        return (self.upscaler.max_cache_size is not None and
+                self.upscaler.frame_reclaimer.disk_usage > self.upscaler.max_cache_size * fraction)
+
+    def _resume_extraction(self):
+        if self.suspended:
+            import psutil
+            with contextlib.suppress(psutil.NoSuchProcess):
+                self.extraction_handle.resume()
+            self.suspended = False
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Name: Video2X Frame Reclaimer
+Author: K4YT3X
+Date Created: October 17, 2026
+Last Modified: October 17, 2026
+
+Description: This class deletes frames that are no longer
+needed and keeps track of the disk space used by frames.
+"""
+
+# built-in imports
+import contextlib
+import queue
+import threading
+
+# third-party imports
+from avalon_framework import Avalon
+
+
+class FrameReclaimer(threading.Thread):
+    """ Video2X Frame Reclaimer
+
+    Frames are tracked when they are written into the pipeline
+    (extracted frames, tiles and upscaled frames), and handed
+    to the reclaimer once they are no longer needed. The
+    reclaimer deletes them in bulk in its own thread, so drivers
+    do not wait for file deletions between batches.
+
+    The size of each tracked frame is remembered until it is
+    deleted, so the disk space used by frames is known at any
+    time without listing directories.
+
+    Extends:
+        threading.Thread
+    """
+
+    def __init__(self):
+        threading.Thread.__init__(self)
+        self.reclaim_queue = queue.Queue()
+        self.tracked_files = {}
+        self.lock = threading.Lock()
+        self.reclaimed = threading.Condition(self.lock)
+        self.disk_usage = 0
+        self.peak_disk_usage = 0
+        self.bytes_reclaimed = 0
+        self.files_reclaimed = 0
+
+    def run(self):
+        """ Run frame reclaimer
+        """
+        while True:
+            files = [self.reclaim_queue.get()]
+
+            # take all files that are waiting at once
+            with contextlib.suppress(queue.Empty):
+                while True:
+                    files.append(self.reclaim_queue.get_nowait())
+
+            finished = None in files
+            self._delete_files([file for file in files if file is not None])
+            for file in files:
+                self.reclaim_queue.task_done()
+
+            if finished:
+                break
+
+    def track(self, files):
+        """ count files that have been written into the pipeline
+
+        Arguments:
+            files {list} -- paths of the files
+        """
+        for file in files:
+            with contextlib.suppress(FileNotFoundError):
+                size = file.stat().st_size
+                with self.lock:
+                    self.disk_usage += size - self.tracked_files.get(file, 0)
+                    self.tracked_files[file] = size
+                    self.peak_disk_usage = max(self.peak_disk_usage, self.disk_usage)
+
+    def move(self, source, destination):
+        """ keep tracking a file that has been renamed
+
+        Arguments:
+            source {pathlib.Path} -- old path of the file
+            destination {pathlib.Path} -- new path of the file
+        """
+        with self.lock:
+            if source in self.tracked_files:
+                self.tracked_files[destination] = self.tracked_files.pop(source)
+
+    def reclaim(self, files):
+        """ delete files that are no longer needed
+
+        Arguments:
+            files {list} -- paths of the files
+        """
+        for file in files:
+            self.reclaim_queue.put(file)
+
+    def flush(self):
+        """ wait until all files handed to the reclaimer have been deleted
+        """
+        self.reclaim_queue.join()
+
+    def stop(self):
+        """ delete the remaining files and stop the reclaimer
+        """
+        self.reclaim_queue.put(None)
+        self.join()
+
+    def _delete_files(self, files):
+        """ delete files and count the space freed
+
+        Arguments:
+            files {list} -- paths of the files
+        """
+        freed_size = 0
+        for file in files:
+            try:
+                size = file.stat().st_size
+                file.unlink()
+                freed_size += size
+                self.files_reclaimed += 1
+
+            except FileNotFoundError:
+                pass
+
+            # a file still opened by another process cannot be deleted on Windows
+            except OSError as e:
+                Avalon.warning(_('Unable to delete {}: {}').format(file, e))
+
+        with self.lock:
+            for file in files:
+                self.disk_usage -= self.tracked_files.pop(file, 0)
+            self.bytes_reclaimed += freed_size
+            self.reclaimed.notify_all()
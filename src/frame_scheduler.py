@@ -0,0 +1,631 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Name: Video2X Frame Scheduler
+Author: K4YT3X
+Date Created: October 17, 2026
+Last Modified: October 17, 2026
+
+Description: This class hands extracted frames to upscaling
+driver workers as the frames become available.
+"""
+
+# built-in imports
+import contextlib
+import queue
+import re
+import shutil
+import subprocess
+import threading
+import time
+
+# third-party imports
+from avalon_framework import Avalon
+
+# number of times a batch is run before it is split to find failing frames
+BATCH_ATTEMPTS = 3
+
+# delay before the first retry of a failed batch (in seconds), doubled on each retry
+RETRY_DELAY = 1
+
+# more failing frames than this means the driver is broken rather than the frames
+MAX_QUARANTINED_FRAMES = 10
+
+# a batch taking this many times longer than the average batch is a straggler
+STRAGGLER_FACTOR = 1.5
+
+# how often idle workers look for stragglers (in seconds)
+STRAGGLER_INTERVAL = 0.5
+
+
+class FrameScheduler:
+    """ Video2X Frame Scheduler
+
+    Frames are put into a shared queue by the producer (usually
+    the frame feeder). Each worker thread takes the frames that
+    are waiting in the queue, moves them into its own directory
+    and runs one driver process on them. Upscaled frames are
+    then moved into the upscaled frames directory under their
+    original names.
+
+    A frame can also be put in as several tiles. The frame is
+    counted as upscaled once all of its tiles are upscaled.
+
+    A failing driver only affects the batch it was running on.
+    Other workers keep running while the batch is retried.
+
+    Workers that run out of frames re-run the oldest batches that
+    take much longer than usual on other workers. Whichever copy
+    finishes first is used and the other one is terminated.
+
+    When several videos are upscaled at once, each driver process
+    takes one of the driver slots shared by all videos. Copies of
+    straggling batches only run on slots no other video waits for.
+
+    Each process of a video2x worker on another machine gets a
+    worker thread of its own. Its batches are sent to the worker
+    instead of being upscaled by a local driver, but are retried,
+    split and re-run like any other batch.
+    """
+
+    def __init__(self, upscaler, workers, ffmpeg, batch_size):
+        self.upscaler = upscaler
+        self.ffmpeg = ffmpeg
+        self.batch_size = batch_size
+        self.frame_queue = queue.Queue()
+
+        # worker threads after the local ones send their batches to video2x workers
+        self.local_workers = workers
+        self.remote_addresses = upscaler.render_nodes.get_slots() if upscaler.render_nodes is not None else []
+        self.workers = [threading.Thread(target=self._work, args=(worker_id,)) for worker_id in range(workers + len(self.remote_addresses))]
+        self.driver_processes = {}
+        self.pending_frames = 0
+        self.remaining_parts = {}
+        self.pending_frames_lock = threading.Lock()
+        self.upscaled_batches = 0
+        self.active_workers = 0
+        self.runs = {}
+        self.runs_lock = threading.Lock()
+        self.upscale_time = 0
+        self.upscaled_parts = 0
+        self.exception = None
+        self.running = False
+        self.stopped = threading.Event()
+
+    def start(self):
+        """ start all worker threads
+        """
+        self.running = True
+        self.active_workers = len(self.workers)
+        for worker in self.workers:
+            worker.start()
+
+    def put(self, frame_index, frames):
+        """ add a frame to the queue
+
+        Arguments:
+            frame_index {int} -- index of the frame in extracted_%d
+            frames {list} -- paths of the extracted frame or of its tiles
+        """
+        # frames are counted once however many tiles they are split into
+        with self.pending_frames_lock:
+            self.pending_frames += 1
+            self.remaining_parts[frame_index] = len(frames)
+        if self.upscaler.job_ledger is not None:
+            self.upscaler.job_ledger.mark('dispatched', frame_index)
+        for frame in frames:
+            self.frame_queue.put((frame_index, frame))
+
+    def put_upscaled(self, frame_index):
+        """ add a frame that does not have to be upscaled
+
+        Duplicate frames and frames found in the upscale cache
+        are not upscaled, but still counted and handed to the
+        encoder in order.
+
+        Arguments:
+            frame_index {int} -- index of the frame in extracted_%d
+        """
+        self._complete_frames([frame_index])
+
+    def finish(self):
+        """ signal that no more frames will be added
+
+        Workers exit after the queue has been drained.
+        """
+        for worker in self.workers:
+            self.frame_queue.put(None)
+
+    def stop(self):
+        """ terminate all running drivers and stop workers
+        """
+        self.running = False
+        self.stopped.set()
+        for process in list(self.driver_processes.values()):
+            with contextlib.suppress(OSError):
+                process.terminate()
+        self.finish()
+        self.join()
+
+    def join(self):
+        for worker in self.workers:
+            if worker.is_alive():
+                worker.join()
+
+    def is_alive(self):
+        # worker threads can still be alive right after notifying the supervisor
+        return self.active_workers > 0
+
+    def _next_batch(self):
+        """ take the next batch of frames from the queue
+
+        Blocks until at least one frame is available. Then takes
+        up to the batch size of the frames that are already
+        waiting in the queue without waiting for more.
+
+        Returns:
+            list -- list of (frame_index, frame) tuples, empty when finished
+        """
+        item = self.frame_queue.get()
+        if item is None:
+            return []
+
+        batch = [item]
+        while len(batch) < self.batch_size:
+            try:
+                item = self.frame_queue.get_nowait()
+            except queue.Empty:
+                break
+
+            # put the end signal back for this worker's next call
+            if item is None:
+                self.frame_queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _work(self, worker_id):
+        """ worker thread main loop
+
+        Arguments:
+            worker_id {int} -- id of this worker
+        """
+        input_directory = self.upscaler.extracted_frames / str(worker_id)
+        output_directory = self.upscaler.upscaled_frames / str(worker_id)
+        input_directory.mkdir(parents=True, exist_ok=True)
+        output_directory.mkdir(parents=True, exist_ok=True)
+
+        try:
+            while self.running:
+                batch = self._next_batch()
+                if not batch or not self.running:
+                    break
+                self._upscale_batch(worker_id, batch, input_directory, output_directory)
+
+            # help out with the batches that are still running
+            if self.running and self.upscaler.speculative_execution:
+                self._speculate(worker_id, input_directory, output_directory)
+
+        except Exception as e:
+            if self.exception is None:
+                self.exception = e
+
+        finally:
+            # put frames that have not been upscaled back so resumed jobs can find them
+            # upscaled frames handed to the reclaimer have to be gone first
+            self.upscaler.frame_reclaimer.flush()
+            for frame in input_directory.iterdir():
+                self._move_frame(frame, self.upscaler.extracted_frames / frame.name)
+
+            for directory in [input_directory, output_directory]:
+                shutil.rmtree(directory, ignore_errors=True)
+
+            with self.pending_frames_lock:
+                self.active_workers -= 1
+            self.upscaler.supervisor.notify(self)
+
+    def _upscale_batch(self, worker_id, batch, input_directory, output_directory):
+        """ upscale one batch of frames, isolating frames the driver fails on
+
+        A failed batch is retried with a growing delay first, since
+        drivers can fail for reasons unrelated to the frames (e.g.
+        running out of video memory). A batch that keeps failing is
+        split in halves until the failing frames are found. Those
+        frames are scaled with FFmpeg instead, unless no batch and
+        no part of this batch could be upscaled at all, which means
+        the driver is broken rather than the frames.
+
+        Arguments:
+            worker_id {int} -- id of the worker running this batch
+            batch {list} -- list of (frame_index, frame) tuples, frame can be a tile
+            input_directory {pathlib.Path} -- the worker's input directory
+            output_directory {pathlib.Path} -- the worker's output directory
+
+        Raises:
+            subprocess.CalledProcessError -- if the driver does not seem to work at all
+        """
+        failed_frames = self._split_batch(worker_id, batch, input_directory, output_directory, BATCH_ATTEMPTS)
+        if not failed_frames or not self.running:
+            return
+
+        with self.pending_frames_lock:
+            driver_works = self.upscaled_batches > 0
+        if not driver_works:
+            Avalon.error(_('Driver keeps failing, giving up'))
+            raise subprocess.CalledProcessError(1, str(self.upscaler.driver))
+
+        for frame_index, frame in failed_frames:
+            self._quarantine_frame(frame_index, frame)
+            self._finish_batch([(frame_index, frame)])
+
+    def _split_batch(self, worker_id, batch, input_directory, output_directory, attempts):
+        """ run the driver on a batch, splitting it in halves while it keeps failing
+
+        Arguments:
+            worker_id {int} -- id of the worker running this batch
+            batch {list} -- list of (frame_index, frame) tuples, frame can be a tile
+            input_directory {pathlib.Path} -- the worker's input directory
+            output_directory {pathlib.Path} -- the worker's output directory
+            attempts {int} -- number of times to run the driver on the batch
+
+        Returns:
+            list -- (frame_index, frame) tuples of the frames the driver keeps failing on
+        """
+        for attempt in range(attempts):
+            if attempt > 0:
+                delay = RETRY_DELAY * 2 ** (attempt - 1)
+                Avalon.warning(_('Retrying a batch of {} frames in {} seconds').format(len(batch), delay))
+                self.stopped.wait(delay)
+
+            if not self.running:
+                return []
+
+            if self._run_driver(worker_id, batch, input_directory, output_directory):
+                with self.pending_frames_lock:
+                    self.upscaled_batches += 1
+                self._finish_batch(batch)
+                return []
+
+            if not self.running:
+                return []
+
+        if len(batch) == 1:
+            return batch
+
+        # find the failing frames, frames that fail alone get all attempts again
+        middle = len(batch) // 2
+        failed_frames = []
+        for half in [batch[:middle], batch[middle:]]:
+            failed_frames.extend(self._split_batch(worker_id, half, input_directory, output_directory, BATCH_ATTEMPTS if len(half) == 1 else 1))
+        return failed_frames
+
+    def _run_driver(self, worker_id, batch, input_directory, output_directory):
+        """ run one driver process on a batch of frames
+
+        Frames of a failed batch are moved back to where they
+        were, so the batch can be retried or split.
+
+        Arguments:
+            worker_id {int} -- id of the worker running this batch
+            batch {list} -- list of (frame_index, frame) tuples, frame can be a tile
+            input_directory {pathlib.Path} -- the worker's input directory
+            output_directory {pathlib.Path} -- the worker's output directory
+
+        Returns:
+            bool -- True if the driver or a copy of the batch on another worker upscaled the batch
+        """
+        if not self._acquire_driver_slot(worker_id):
+            return False
+
+        for frame_index, frame in batch:
+            self._move_frame(frame, input_directory / frame.name)
+
+        run = {'batch': batch,
+               'input_directory': input_directory,
+               'output_directory': output_directory,
+               'started': time.time(),
+               'owner': worker_id,
+               'speculator': None,
+               'winner': None,
+               'speculation_finished': threading.Event()}
+
+        try:
+            with self.runs_lock:
+                process = self._launch_driver(worker_id, input_directory, output_directory)
+                self.driver_processes[worker_id] = process
+                self.runs[worker_id] = run
+
+            return_code = process.wait()
+
+        finally:
+            self._release_driver_slot(worker_id)
+
+        with self.runs_lock:
+            del self.driver_processes[worker_id]
+            del self.runs[worker_id]
+            if return_code == 0 and self.running and run['winner'] is None:
+                run['winner'] = worker_id
+                self._terminate_driver(run['speculator'])
+                self.upscale_time += time.time() - run['started']
+                self.upscaled_parts += len(batch)
+
+        # a failed batch may still be upscaled by its copy
+        # and a copy that has won may still be moving its frames into place
+        if run['winner'] != worker_id and run['speculator'] is not None:
+            run['speculation_finished'].wait()
+
+        if run['winner'] == worker_id:
+            self._move_upscaled_frames(output_directory)
+            self.upscaler.frame_reclaimer.reclaim([input_directory / frame.name for frame_index, frame in batch])
+            return True
+
+        # the copy of the batch finished first
+        if run['winner'] is not None:
+            self.upscaler.frame_reclaimer.reclaim([input_directory / frame.name for frame_index, frame in batch])
+            self._clear_directory(output_directory)
+            return True
+
+        # put the frames back and drop what the driver has written so far
+        for frame_index, frame in batch:
+            self._move_frame(input_directory / frame.name, frame)
+        self._clear_directory(output_directory)
+
+        # driver killed by stop()
+        if self.running:
+            Avalon.warning(_('Subprocess {} exited with code {} on a batch of {} frames').format(process.pid, return_code, len(batch)))
+        return False
+
+    def _speculate(self, worker_id, input_directory, output_directory):
+        """ re-run straggling batches of other workers until all batches are done
+
+        Arguments:
+            worker_id {int} -- id of this worker
+            input_directory {pathlib.Path} -- this worker's input directory
+            output_directory {pathlib.Path} -- this worker's output directory
+        """
+        while self.running:
+            with self.runs_lock:
+                if not self.runs:
+                    return
+                run = self._find_straggler()
+                if run is not None and self._acquire_driver_slot(worker_id, blocking=False):
+                    run['speculator'] = worker_id
+                else:
+                    run = None
+
+            if run is None:
+                self.stopped.wait(STRAGGLER_INTERVAL)
+                continue
+
+            try:
+                self._run_copy(worker_id, run, input_directory, output_directory)
+            finally:
+                self._release_driver_slot(worker_id)
+                self._clear_directory(input_directory)
+                self._clear_directory(output_directory)
+                run['speculation_finished'].set()
+
+    def _launch_driver(self, worker_id, input_directory, output_directory):
+        """ launch a driver process or send the batch to the worker's video2x worker
+
+        Arguments:
+            worker_id {int} -- id of the worker running the batch
+            input_directory {pathlib.Path} -- the worker's input directory
+            output_directory {pathlib.Path} -- the worker's output directory
+
+        Returns:
+            subprocess.Popen -- the driver process or a RemoteBatch
+        """
+        address = None
+        if worker_id >= self.local_workers:
+            address = self.remote_addresses[worker_id - self.local_workers]
+        return self.upscaler._launch_driver(input_directory, output_directory, address)
+
+    def _acquire_driver_slot(self, worker_id, blocking=True):
+        """ take one of the driver slots shared by the videos of a batch
+
+        Batches sent to video2x workers do not take a slot.
+
+        Arguments:
+            worker_id {int} -- id of the worker running the driver
+
+        Keyword Arguments:
+            blocking {bool} -- wait for a free slot (default: {True})
+
+        Returns:
+            bool -- True if a slot has been taken or no slots are shared
+        """
+        batch_scheduler = self.upscaler.batch_scheduler
+        if batch_scheduler is None or worker_id >= self.local_workers:
+            return True
+        if not blocking:
+            return batch_scheduler.driver_slots.acquire(blocking=False)
+        return batch_scheduler.acquire(batch_scheduler.driver_slots, lambda: not self.running)
+
+    def _release_driver_slot(self, worker_id):
+        if self.upscaler.batch_scheduler is not None and worker_id < self.local_workers:
+            self.upscaler.batch_scheduler.driver_slots.release()
+
+    def _find_straggler(self):
+        """ find the oldest batch that takes much longer than the average batch
+
+        Must be called with runs_lock held.
+
+        Returns:
+            dict -- the straggling run, None if there is none
+        """
+        # nothing to compare against yet
+        if self.upscaled_parts == 0:
+            return None
+
+        part_time = self.upscale_time / self.upscaled_parts
+        now = time.time()
+        stragglers = [run for run in self.runs.values()
+                      if run['speculator'] is None and now - run['started'] > part_time * len(run['batch']) * STRAGGLER_FACTOR]
+        return min(stragglers, key=lambda run: run['started'], default=None)
+
+    def _run_copy(self, worker_id, run, input_directory, output_directory):
+        """ upscale a copy of another worker's batch
+
+        Arguments:
+            worker_id {int} -- id of this worker
+            run {dict} -- the straggling run
+            input_directory {pathlib.Path} -- this worker's input directory
+            output_directory {pathlib.Path} -- this worker's output directory
+        """
+        # the batch can finish while it is being copied
+        try:
+            for frame_index, frame in run['batch']:
+                shutil.copyfile(run['input_directory'] / frame.name, input_directory / frame.name)
+        except FileNotFoundError:
+            return
+
+        with self.runs_lock:
+            if run['winner'] is not None or not self.running:
+                return
+            process = self._launch_driver(worker_id, input_directory, output_directory)
+            self.driver_processes[worker_id] = process
+            self.upscaler.stragglers += 1
+
+        Avalon.debug_info(_('Re-running a straggling batch of worker {} on worker {}').format(run['owner'], worker_id))
+        return_code = process.wait()
+
+        with self.runs_lock:
+            del self.driver_processes[worker_id]
+            if return_code != 0 or not self.running or run['winner'] is not None:
+                return
+            run['winner'] = worker_id
+
+            # estimate how much longer the straggler would have taken from the frames it has upscaled
+            now = time.time()
+            finished_parts = len(list(run['output_directory'].iterdir()))
+            remaining_time = (len(run['batch']) - finished_parts) * (now - run['started']) / max(finished_parts, 1)
+            self._terminate_driver(run['owner'])
+            self.upscaler.stragglers_overtaken += 1
+            self.upscaler.straggler_time_saved += remaining_time
+
+        self._move_upscaled_frames(output_directory)
+
+    def _terminate_driver(self, worker_id):
+        """ terminate the driver running the losing copy of a batch
+
+        Must be called with runs_lock held.
+
+        Arguments:
+            worker_id {int} -- id of the worker running the other copy, can be None
+        """
+        process = self.driver_processes.get(worker_id)
+        if process is not None:
+            with contextlib.suppress(OSError):
+                process.terminate()
+
+    def _move_upscaled_frames(self, output_directory):
+        """ move upscaled frames into the upscaled frames directory
+
+        Arguments:
+            output_directory {pathlib.Path} -- the worker's output directory
+        """
+        # drivers name their outputs differently (e.g. extracted_1.png.png)
+        # rename them back to extracted_%d so FFmpeg can recognize them
+        for upscaled_frame in output_directory.iterdir():
+            match = re.match(r'extracted_\d+|tile_\d+_\d+', upscaled_frame.name)
+            if match is not None:
+                upscaled_frame = upscaled_frame.rename(self.upscaler.upscaled_frames / f'{match.group(0)}.{self.upscaler.image_format}')
+
+                # upscaled tiles are deleted by the frame tiler once they have been composited
+                if not upscaled_frame.name.startswith('tile_'):
+                    self.upscaler.frame_reclaimer.track([upscaled_frame])
+
+    def _move_frame(self, source, destination):
+        """ move a frame that is tracked by the frame reclaimer
+
+        Arguments:
+            source {pathlib.Path} -- current path of the frame
+            destination {pathlib.Path} -- path to move the frame to
+        """
+        source.replace(destination)
+        self.upscaler.frame_reclaimer.move(source, destination)
+
+    @staticmethod
+    def _clear_directory(directory):
+        for file in directory.iterdir():
+            file.unlink()
+
+    def _quarantine_frame(self, frame_index, frame):
+        """ scale a frame the driver keeps failing on with FFmpeg
+
+        Arguments:
+            frame_index {int} -- index of the frame in extracted_%d
+            frame {pathlib.Path} -- path of the extracted frame or tile
+
+        Raises:
+            subprocess.CalledProcessError -- if the driver fails on too many frames
+        """
+        # the driver is broken rather than the frames
+        if len(self.upscaler.quarantined_frames) >= MAX_QUARANTINED_FRAMES:
+            Avalon.error(_('Driver keeps failing, giving up'))
+            raise subprocess.CalledProcessError(1, str(self.upscaler.driver))
+
+        Avalon.warning(_('Driver keeps failing on {}, scaling it with FFmpeg instead').format(frame.name))
+
+        # tiles are scaled by the ratio, whole frames to the output resolution
+        if frame.name.startswith('tile_'):
+            from PIL import Image
+            with Image.open(frame) as image:
+                resolution = f'{round(image.width * self.upscaler.scale_ratio)}x{round(image.height * self.upscaler.scale_ratio)}'
+        else:
+            resolution = f'{self.upscaler.scale_width}x{self.upscaler.scale_height}'
+
+        upscaled_frame = self.upscaler.upscaled_frames / f'{frame.stem}.{self.upscaler.image_format}'
+        process = self.ffmpeg.scale_image(frame, upscaled_frame, resolution)
+        return_code = process.wait()
+        if return_code != 0:
+            raise subprocess.CalledProcessError(return_code, process.args)
+
+        if not upscaled_frame.name.startswith('tile_'):
+            self.upscaler.frame_reclaimer.track([upscaled_frame])
+        self.upscaler.frame_reclaimer.reclaim([frame])
+        with self.pending_frames_lock:
+            self.upscaler.quarantined_frames.append(frame_index)
+
+    def _finish_batch(self, batch):
+        """ count the parts of a batch and complete the frames that are done
+
+        Arguments:
+            batch {list} -- list of (frame_index, frame) tuples, frame can be a tile
+        """
+        # frames are complete once all of their tiles are upscaled
+        completed_frames = []
+        with self.pending_frames_lock:
+            for frame_index, frame in batch:
+                self.remaining_parts[frame_index] -= 1
+                if self.remaining_parts[frame_index] == 0:
+                    del self.remaining_parts[frame_index]
+                    completed_frames.append(frame_index)
+            self.pending_frames -= len(completed_frames)
+
+        # frames scaled by FFmpeg are not cached
+        self.upscaler._cache_frames([frame_index for frame_index in completed_frames if frame_index not in self.upscaler.quarantined_frames])
+        self._complete_frames(completed_frames)
+
+    def _complete_frames(self, frame_indices):
+        """ count frames as upscaled and hand them to the encoder
+
+        Arguments:
+            frame_indices {list} -- indices of the upscaled frames
+        """
+        with self.pending_frames_lock:
+            self.upscaler.total_frames_upscaled += len(frame_indices)
+
+        # tiled frames are recorded once their tiles have been composited
+        if self.upscaler.job_ledger is not None:
+            for frame_index in frame_indices:
+                if self.upscaler.frame_tiler is None or frame_index not in self.upscaler.frame_tiler.tiled_frames:
+                    self.upscaler.job_ledger.mark('upscaled', frame_index)
+
+        self.upscaler._report_progress()
+
+        # hand upscaled frames to the encoder if frames are encoded incrementally
+        if self.upscaler.frame_encoder is not None:
+            for frame_index in frame_indices:
+                self.upscaler.frame_encoder.put(frame_index)
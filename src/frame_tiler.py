@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Name: Video2X Frame Tiler
+Author: K4YT3X
+Date Created: October 17, 2026
+Last Modified: October 17, 2026
+
+Description: This class splits frames into tiles so only
+the parts of a frame that changed have to be upscaled.
+"""
+
+# local imports
+from frame_deduplicator import BLOCK_SIZE
+from frame_deduplicator import block_errors
+
+# built-in imports
+import io
+
+# third-party imports
+from PIL import Image
+import numpy
+
+
+class FrameTiler:
+    """ Video2X Frame Tiler
+
+    Frames have to be split in order. Each frame is divided
+    into square tiles, and every tile is compared against the
+    same area of the reference frame. The reference frame holds
+    the source pixels of what the last upscaled frame shows, so
+    small changes cannot pile up unnoticed over many frames.
+
+    Changed tiles are saved as separate small images together
+    with some padding around them, so the driver sees the same
+    neighbourhood it would see when upscaling the whole frame.
+    After upscaling, the padding is cropped off again and the
+    tiles are pasted over the previous upscaled frame.
+    """
+
+    def __init__(self, tile_size, tile_padding, threshold, max_changed):
+        self.tile_size = tile_size
+        self.tile_padding = tile_padding
+        self.threshold = threshold
+        self.max_changed = max_changed
+        self.reference = None
+        self.frame_size = None
+        self.tiled_frames = {}
+        self.tiles = 0
+
+    def split(self, frame_index, frame):
+        """ save the changed tiles of a frame
+
+        Arguments:
+            frame_index {int} -- index of the frame in extracted_%d
+            frame {pathlib.Path} -- path of the extracted frame
+
+        Returns:
+            list -- paths of the changed tiles, None if the whole frame has to be upscaled
+        """
+        with Image.open(frame) as image:
+            current_frame = numpy.asarray(image.convert('RGB'), dtype=numpy.float32)
+
+        # the first frame has nothing to be compared against
+        if self.reference is None or current_frame.shape != self.reference.shape:
+            self.reference = current_frame.copy()
+            return None
+
+        # largest block error within each tile
+        errors = block_errors(current_frame, self.reference)
+        blocks_per_tile = self.tile_size // BLOCK_SIZE
+        errors = numpy.pad(errors, ((0, -errors.shape[0] % blocks_per_tile), (0, -errors.shape[1] % blocks_per_tile)))
+        tile_errors = errors.reshape(errors.shape[0] // blocks_per_tile, blocks_per_tile,
+                                     errors.shape[1] // blocks_per_tile, blocks_per_tile).max(axis=(1, 3))
+
+        changed_tiles = numpy.argwhere(tile_errors > self.threshold)
+
+        # upscaling most of the tiles separately is slower than upscaling the whole frame
+        if len(changed_tiles) > self.max_changed * tile_errors.size:
+            self.reference = current_frame.copy()
+            return None
+
+        height, width = current_frame.shape[:2]
+        self.frame_size = (width, height)
+        tiles = []
+        boxes = []
+        with Image.open(frame) as image:
+            for tile_index, (row, column) in enumerate(changed_tiles):
+                left, top = int(column) * self.tile_size, int(row) * self.tile_size
+                right, bottom = min(left + self.tile_size, width), min(top + self.tile_size, height)
+                box = (left, top, right, bottom)
+                padded_box = (max(left - self.tile_padding, 0),
+                              max(top - self.tile_padding, 0),
+                              min(right + self.tile_padding, width),
+                              min(bottom + self.tile_padding, height))
+
+                tile = frame.parent / f'tile_{frame_index}_{tile_index}{frame.suffix}'
+                image.crop(padded_box).save(tile)
+                tiles.append(tile)
+                boxes.append((box, padded_box))
+
+                self.reference[top:bottom, left:right] = current_frame[top:bottom, left:right]
+
+        if boxes:
+            self.tiled_frames[frame_index] = boxes
+            self.tiles += len(boxes)
+        return tiles
+
+    def reset(self):
+        """ forget the reference frame
+
+        The next frame is always upscaled whole.
+        """
+        self.reference = None
+
+    def composite(self, frame_index, previous_frame, upscaled_frames):
+        """ paste the upscaled tiles of a frame over the previous upscaled frame
+
+        The upscaled tiles are deleted afterwards.
+
+        Arguments:
+            frame_index {int} -- index of the frame in extracted_%d
+            previous_frame {bytes} -- the encoded previous upscaled frame
+            upscaled_frames {pathlib.Path} -- directory containing the upscaled tiles
+
+        Returns:
+            bytes -- the encoded upscaled frame
+        """
+        with Image.open(io.BytesIO(previous_frame)) as encoded_image:
+            image_format = encoded_image.format
+            image = encoded_image.copy()
+
+        # size of the source frames the tiles were cut from
+        width, height = self.frame_size
+        scale_x, scale_y = image.width / width, image.height / height
+
+        for tile_index, (box, padded_box) in enumerate(self.tiled_frames.pop(frame_index)):
+            left, top, right, bottom = box
+            padded_left, padded_top, padded_right, padded_bottom = padded_box
+
+            tile_path = next(upscaled_frames.glob(f'tile_{frame_index}_{tile_index}.*'))
+            with Image.open(tile_path) as tile:
+
+                # crop the padding off the upscaled tile
+                tile_scale_x = tile.width / (padded_right - padded_left)
+                tile_scale_y = tile.height / (padded_bottom - padded_top)
+                tile = tile.crop((round((left - padded_left) * tile_scale_x),
+                                  round((top - padded_top) * tile_scale_y),
+                                  round((right - padded_left) * tile_scale_x),
+                                  round((bottom - padded_top) * tile_scale_y)))
+
+                # rounding can make the tile one pixel off at fractional ratios
+                position = (round(left * scale_x), round(top * scale_y))
+                size = (round(right * scale_x) - position[0], round(bottom * scale_y) - position[1])
+                if tile.size != size:
+                    tile = tile.resize(size, Image.LANCZOS)
+
+                image.paste(tile.convert(image.mode), position)
+            tile_path.unlink()
+
+        output = io.BytesIO()
+        image.save(output, format=image_format, compress_level=1)
+        return output.getvalue()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Name: Video2X Job Ledger
+Author: K4YT3X
+Date Created: October 17, 2026
+Last Modified: October 17, 2026
+
+Description: This class records the progress of upscaling a
+video so an interrupted job can be resumed.
+"""
+
+# built-in imports
+import json
+import os
+import struct
+import threading
+import time
+
+# states a frame can be in, each state is kept in its own bitmap
+FRAME_STATES = ['extracted', 'dispatched', 'upscaled', 'encoded', 'duplicate']
+
+# the ledger is written to disk at most this often (in seconds)
+# while frames are being marked
+SAVE_INTERVAL = 5
+
+
+class JobLedger:
+    """ Video2X Job Ledger
+
+    The manifest holds the fingerprint of the input video and
+    the stages that have finished. The ledger holds one bitmap
+    for each frame state, so a million frames only take 125 KB
+    per state. Both files are replaced atomically so a job that
+    dies while saving still has the previous copy.
+    """
+
+    def __init__(self, job_directory):
+        self.job_directory = job_directory
+        self.manifest_path = job_directory / 'manifest.json'
+        self.ledger_path = job_directory / 'ledger'
+        self.manifest = {}
+        self.bitmaps = {state: bytearray() for state in FRAME_STATES}
+        self.lock = threading.Lock()
+        self.save_lock = threading.Lock()
+        self.last_saved = time.time()
+
+    @staticmethod
+    def load_job(job_directory):
+        """ read the settings of a job
+
+        Arguments:
+            job_directory {pathlib.Path} -- directory of the job
+
+        Returns:
+            dict -- settings of the job
+        """
+        return json.loads((job_directory / 'job.json').read_text())
+
+    @staticmethod
+    def save_job(job_directory, job):
+        """ write the settings of a job
+
+        Arguments:
+            job_directory {pathlib.Path} -- directory of the job
+            job {dict} -- settings of the job
+        """
+        job_directory.mkdir(parents=True, exist_ok=True)
+        JobLedger._replace(job_directory / 'job.json', json.dumps(job, indent=2, default=str).encode())
+
+    def load(self, fingerprint):
+        """ load the ledger of an earlier attempt
+
+        Arguments:
+            fingerprint {dict} -- fingerprint of the input video
+
+        Returns:
+            bool -- True if a ledger of the same input video was loaded
+        """
+        self.reset(fingerprint)
+
+        try:
+            manifest = json.loads(self.manifest_path.read_text())
+            ledger = self.ledger_path.read_bytes()
+        except (FileNotFoundError, ValueError):
+            return False
+
+        if manifest.get('fingerprint') != fingerprint:
+            return False
+
+        offset = 0
+        for state in FRAME_STATES:
+            length, = struct.unpack_from('<I', ledger, offset)
+            self.bitmaps[state] = bytearray(ledger[offset + 4:offset + 4 + length])
+            offset += 4 + length
+
+        self.manifest = manifest
+        return True
+
+    def reset(self, fingerprint):
+        """ start over with an empty ledger
+
+        Arguments:
+            fingerprint {dict} -- fingerprint of the input video
+        """
+        with self.lock:
+            self.manifest = {'fingerprint': fingerprint, 'stages': []}
+            self.bitmaps = {state: bytearray() for state in FRAME_STATES}
+
+    def save(self):
+        """ write the manifest and the ledger to disk
+        """
+        with self.lock:
+            ledger = b''.join(struct.pack('<I', len(self.bitmaps[state])) + bytes(self.bitmaps[state]) for state in FRAME_STATES)
+            manifest = json.dumps(self.manifest, indent=2).encode()
+            self.last_saved = time.time()
+
+        with self.save_lock:
+            self.job_directory.mkdir(parents=True, exist_ok=True)
+            self._replace(self.ledger_path, ledger)
+            self._replace(self.manifest_path, manifest)
+
+    def mark(self, state, frame_index):
+        """ mark a frame as being in a state
+
+        Arguments:
+            state {str} -- one of FRAME_STATES
+            frame_index {int} -- index of the frame in extracted_%d
+        """
+        byte, bit = divmod(frame_index - 1, 8)
+        with self.lock:
+            bitmap = self.bitmaps[state]
+            if byte >= len(bitmap):
+                bitmap.extend(bytes(byte - len(bitmap) + 1))
+            bitmap[byte] |= 1 << bit
+            save = time.time() - self.last_saved > SAVE_INTERVAL
+
+        if save:
+            self.save()
+
+    def is_marked(self, state, frame_index):
+        """ check if a frame is in a state
+
+        Arguments:
+            state {str} -- one of FRAME_STATES
+            frame_index {int} -- index of the frame in extracted_%d
+
+        Returns:
+            bool -- True if the frame has been marked
+        """
+        byte, bit = divmod(frame_index - 1, 8)
+        bitmap = self.bitmaps[state]
+        return byte < len(bitmap) and bool(bitmap[byte] & 1 << bit)
+
+    def get_frames(self, state):
+        """ list all frames in a state
+
+        Arguments:
+            state {str} -- one of FRAME_STATES
+
+        Returns:
+            list -- indices of the frames in the state
+        """
+        return [byte * 8 + bit + 1 for byte, value in enumerate(self.bitmaps[state]) if value for bit in range(8) if value & 1 << bit]
+
+    def complete_stage(self, stage, **values):
+        """ record that a stage has finished
+
+        Arguments:
+            stage {str} -- name of the stage
+            values {dict} -- values to record in the manifest along with the stage
+        """
+        with self.lock:
+            if stage not in self.manifest['stages']:
+                self.manifest['stages'].append(stage)
+            self.manifest.update(values)
+        self.save()
+
+    def is_completed(self, stage):
+        """ check if a stage has finished
+
+        Arguments:
+            stage {str} -- name of the stage
+
+        Returns:
+            bool -- True if the stage has finished
+        """
+        return stage in self.manifest['stages']
+
+    @staticmethod
+    def _replace(path, data):
+        """ write a file atomically
+
+        Arguments:
+            path {pathlib.Path} -- path of the file
+            data {bytes} -- content of the file
+        """
+        temp_path = path.with_name(f'{path.name}.tmp')
+        with open(temp_path, 'wb') as temp_file:
+            temp_file.write(data)
+            temp_file.flush()
+            os.fsync(temp_file.fileno())
+        os.replace(temp_path, path)
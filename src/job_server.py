@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Name: Video2X Job Server
+Author: K4YT3X
+Date Created: October 17, 2026
+Last Modified: October 17, 2026
+
+Description: This class accepts upscaling jobs over a local
+HTTP API and upscales them in the same long-running process.
+"""
+
+# local imports
+from exceptions import ArgumentError
+
+# built-in imports
+import contextlib
+import http.server
+import json
+import queue
+import re
+import socket
+import socketserver
+import stat
+import threading
+import time
+import traceback
+import uuid
+
+# third-party imports
+from avalon_framework import Avalon
+
+# port video2x serve listens on unless specified otherwise
+SERVER_PORT = 8965
+
+# how often the progress of a job is streamed at most (in seconds)
+PROGRESS_INTERVAL = 0.5
+
+# number of jobs that have ended whose status is kept
+MAX_ENDED_JOBS = 1000
+
+# statuses of jobs that will not change anymore
+ENDED_STATUSES = ('finished', 'failed', 'cancelled')
+
+
+class JobServer:
+    """ Video2X Job Server
+
+    The configuration is read and the modules are imported once
+    when the server starts. FFmpeg, the driver and the driver
+    settings of a job are only checked for the first job using
+    them, later jobs with the same settings skip the check.
+
+    Jobs are JSON objects with the input and output paths and
+    optionally driver, processes, width, height, ratio and
+    driver_settings, like the command line options. Up to the
+    given number of jobs are upscaled at once, the others are
+    queued in the order they were submitted.
+
+    Requests:
+        POST /jobs -- queue a job, answers with its id
+        GET /jobs -- status of every job
+        GET /jobs/<id> -- status and progress of a job
+        GET /jobs/<id>/progress -- progress of a job as a JSON line each time it changes, until it ends
+        DELETE /jobs/<id> -- cancel a job
+    """
+
+    def __init__(self, create_upscaler, concurrent_jobs):
+        """
+        Arguments:
+            create_upscaler {function} -- creates the upscaler of a job from its JSON object
+            concurrent_jobs {int} -- number of jobs upscaled at once
+        """
+        self.create_upscaler = create_upscaler
+        self.concurrent_jobs = concurrent_jobs
+        self.jobs = {}
+        self.job_queue = queue.Queue()
+        self.checked_drivers = set()
+        self.lock = threading.Lock()
+        self.changed = threading.Condition(self.lock)
+        self.stopped = threading.Event()
+        self.server = None
+
+    def serve(self, host, port, socket_path=None):
+        """ accept jobs until stop() is called or the server is interrupted
+
+        Arguments:
+            host {str} -- address to listen on
+            port {int} -- port to listen on
+
+        Keyword Arguments:
+            socket_path {pathlib.Path} -- listen on this Unix socket instead (default: {None})
+        """
+        if socket_path is not None:
+            self._remove_stale_socket(socket_path)
+            self.server = UnixHTTPServer(str(socket_path), JobServerHandler)
+            address = socket_path
+        else:
+            self.server = http.server.ThreadingHTTPServer((host, port), JobServerHandler)
+            address = f'{host}:{port}'
+        self.server.daemon_threads = True
+        self.server.job_server = self
+
+        runners = [threading.Thread(target=self._run_jobs) for runner in range(self.concurrent_jobs)]
+        for runner in runners:
+            runner.start()
+
+        Avalon.info(_('Waiting for jobs on {}').format(address))
+        try:
+            self.server.serve_forever()
+
+        finally:
+            # running jobs are stopped and terminate their subprocesses
+            self.stopped.set()
+            for job_id in list(self.jobs):
+                self.cancel(job_id)
+            for runner in runners:
+                self.job_queue.put(None)
+            for runner in runners:
+                runner.join()
+            self.server.server_close()
+            if socket_path is not None:
+                with contextlib.suppress(FileNotFoundError):
+                    socket_path.unlink()
+
+    def stop(self):
+        """ stop accepting jobs
+
+        Must be called from another thread than serve().
+        """
+        self.server.shutdown()
+
+    def submit(self, request):
+        """ check a job and queue it
+
+        Arguments:
+            request {dict} -- the job's JSON object
+
+        Returns:
+            str -- id of the job
+
+        Raises:
+            ValueError -- if the job is invalid
+        """
+        if not isinstance(request, dict):
+            raise ValueError('job must be a JSON object')
+
+        try:
+            upscaler = self.create_upscaler(request)
+
+            # FFmpeg and the driver only have to be found once for the same settings
+            driver_key = json.dumps([upscaler.driver, upscaler.driver_settings, upscaler.ffmpeg_settings], sort_keys=True, default=str)
+            upscaler.driver_checked = driver_key in self.checked_drivers
+            upscaler._check_arguments()
+            self.checked_drivers.add(driver_key)
+
+        except (KeyError, TypeError, AttributeError, OSError, ArgumentError) as e:
+            raise ValueError(f'{type(e).__name__}: {e}')
+
+        job_id = uuid.uuid4().hex
+        job = {'id': job_id,
+               'status': 'queued',
+               'input': str(upscaler.input_path),
+               'output': str(upscaler.output_path),
+               'driver': upscaler.driver,
+               'frames_upscaled': 0,
+               'total_frames': 0,
+               'error': None,
+               'submitted': time.time(),
+               'started': None,
+               'ended': None,
+               'upscaler': upscaler}
+
+        def update_progress(total_frames_upscaled, total_frames):
+            with self.changed:
+                job['frames_upscaled'] = total_frames_upscaled
+                job['total_frames'] = total_frames
+                self.changed.notify_all()
+
+        upscaler.progress_listeners.append(update_progress)
+
+        with self.lock:
+            self.jobs[job_id] = job
+        self.job_queue.put(job_id)
+        Avalon.info(_('Queued job {}: {}').format(job_id, upscaler.input_path))
+        return job_id
+
+    def get_status(self, job_id):
+        """ get the status of a job
+
+        Arguments:
+            job_id {str} -- id of the job
+
+        Returns:
+            dict -- status and progress of the job, None if the job is unknown
+        """
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            return self._get_status(job)
+
+    def get_statuses(self):
+        with self.lock:
+            return [self._get_status(job) for job in self.jobs.values()]
+
+    def stream_progress(self, job_id, write_status):
+        """ write the status of a job each time it changes until the job has ended
+
+        Arguments:
+            job_id {str} -- id of the job
+            write_status {function} -- called with each status
+        """
+        previous_status = None
+        while True:
+            with self.changed:
+                while True:
+                    job = self.jobs.get(job_id)
+                    if job is None:
+                        return
+                    status = self._get_status(job)
+                    if status != previous_status or self.stopped.is_set():
+                        break
+                    self.changed.wait(PROGRESS_INTERVAL)
+
+            write_status(status)
+            if status['status'] in ENDED_STATUSES or self.stopped.is_set():
+                return
+            previous_status = status
+
+            # frames are upscaled much more often than clients need to know
+            time.sleep(PROGRESS_INTERVAL)
+
+    def cancel(self, job_id):
+        """ cancel a queued job or stop a running job
+
+        Arguments:
+            job_id {str} -- id of the job
+
+        Returns:
+            bool -- False if the job is unknown
+        """
+        with self.changed:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return False
+
+            # queued jobs are skipped when their turn comes
+            if job['status'] == 'queued':
+                job['status'] = 'cancelled'
+                job['ended'] = time.time()
+                job['upscaler'] = None
+                self.changed.notify_all()
+
+            # running upscalers terminate their subprocesses and raise SystemExit
+            elif job['status'] == 'running':
+                job['upscaler'].stop()
+        return True
+
+    def _get_status(self, job):
+        """ copy the status of a job, the lock must be held
+
+        Arguments:
+            job {dict} -- the job
+
+        Returns:
+            dict -- status and progress of the job
+        """
+        status = {key: value for key, value in job.items() if key != 'upscaler'}
+
+        # the ETA is only known while frames are upscaled
+        progress_monitor = getattr(job['upscaler'], 'progress_monitor', None)
+        status['eta'] = progress_monitor.eta if job['status'] == 'running' and progress_monitor is not None else None
+        return status
+
+    def _run_jobs(self):
+        while True:
+            job_id = self.job_queue.get()
+            if job_id is None:
+                return
+
+            with self.changed:
+                job = self.jobs.get(job_id)
+                if job is None or job['status'] != 'queued':
+                    continue
+                job['status'] = 'running'
+                job['started'] = time.time()
+                upscaler = job['upscaler']
+                self.changed.notify_all()
+
+            Avalon.info(_('Starting job {}: {}').format(job_id, upscaler.input_path))
+            try:
+                upscaler.run()
+                status, error = 'finished', None
+                Avalon.info(_('Job {} finished').format(job_id))
+
+            except SystemExit:
+                status, error = 'cancelled', None
+                Avalon.warning(_('Job {} cancelled').format(job_id))
+
+            except Exception as e:
+                status, error = 'failed', f'{type(e).__name__}: {e}'
+                Avalon.error(_('Job {} failed').format(job_id))
+                traceback.print_exc()
+
+            with self.changed:
+                job['status'] = status
+                job['error'] = error
+                job['ended'] = time.time()
+                job['upscaler'] = None
+                self._drop_ended_jobs()
+                self.changed.notify_all()
+
+    def _drop_ended_jobs(self):
+        """ forget the oldest jobs that have ended, the lock must be held
+        """
+        ended_jobs = [job_id for job_id, job in self.jobs.items() if job['status'] in ENDED_STATUSES]
+        for job_id in ended_jobs[:-MAX_ENDED_JOBS]:
+            del self.jobs[job_id]
+
+    @staticmethod
+    def _remove_stale_socket(socket_path):
+        """ remove the socket of a server that has not been stopped properly
+
+        Arguments:
+            socket_path {pathlib.Path} -- path of the Unix socket
+
+        Raises:
+            OSError -- if another server is listening on the socket
+        """
+        if not socket_path.exists() or not stat.S_ISSOCK(socket_path.stat().st_mode):
+            return
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            try:
+                client.connect(str(socket_path))
+            except ConnectionRefusedError:
+                socket_path.unlink()
+                return
+        raise OSError(f'another server is listening on {socket_path}')
+
+
+# Unix sockets are not available on every platform
+if hasattr(socketserver, 'UnixStreamServer'):
+
+    class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        """ HTTP server listening on a Unix socket
+
+        Extends:
+            socketserver.ThreadingMixIn
+            socketserver.UnixStreamServer
+        """
+
+
+class JobServerHandler(http.server.BaseHTTPRequestHandler):
+    """ answers the requests of JobServer
+
+    Extends:
+        http.server.BaseHTTPRequestHandler
+    """
+
+    def do_GET(self):
+        job_server = self.server.job_server
+        if self.path == '/jobs':
+            self._send_json(200, job_server.get_statuses())
+            return
+
+        match = re.fullmatch(r'/jobs/(\w+)(/progress)?', self.path)
+        status = job_server.get_status(match.group(1)) if match is not None else None
+        if status is None:
+            self._send_json(404, {'error': 'unknown job'})
+
+        elif match.group(2) is None:
+            self._send_json(200, status)
+
+        # the connection is closed once the job has ended
+        else:
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/x-ndjson')
+            self.end_headers()
+
+            def write_status(status):
+                self.wfile.write(json.dumps(status).encode('utf-8') + b'\n')
+                self.wfile.flush()
+
+            # clients may stop following the job at any time
+            with contextlib.suppress(OSError):
+                job_server.stream_progress(match.group(1), write_status)
+
+    def do_POST(self):
+        if self.path != '/jobs':
+            self._send_json(404, {'error': 'unknown path'})
+            return
+
+        try:
+            request = json.loads(self.rfile.read(int(self.headers['Content-Length'])).decode('utf-8'))
+            job_id = self.server.job_server.submit(request)
+        except (ValueError, TypeError) as e:
+            self._send_json(400, {'error': str(e)})
+            return
+        self._send_json(201, {'id': job_id})
+
+    def do_DELETE(self):
+        match = re.fullmatch(r'/jobs/(\w+)', self.path)
+        if match is None or not self.server.job_server.cancel(match.group(1)):
+            self._send_json(404, {'error': 'unknown job'})
+            return
+        self._send_json(200, self.server.job_server.get_status(match.group(1)))
+
+    def address_string(self):
+        # clients of Unix sockets have no address
+        if isinstance(self.client_address, tuple):
+            return self.client_address[0]
+        return 'local'
+
+    def log_message(self, format, *args):
+        Avalon.debug_info(f'{self.address_string()} {format % args}')
+
+    def _send_json(self, status, content):
+        body = json.dumps(content).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
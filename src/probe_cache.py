@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Name: Video2X Probe Cache
+Author: K4YT3X
+Date Created: October 17, 2026
+Last Modified: October 17, 2026
+
+Description: This class keeps the video information read by
+FFprobe, so videos are only probed again once they change.
+"""
+
+# built-in imports
+import contextlib
+import threading
+
+
+class ProbeCache:
+    """ Video2X Probe Cache
+
+    Video information is keyed by the path, size and modification
+    time of the video and by the FFprobe binary that read it, so
+    a video that has been replaced is probed again. Information
+    is kept in memory for the current run and, if a database path
+    is given, in a SQLite database for later runs. Only the latest
+    information of each path is kept in the database.
+
+    Information is stored as JSON text, so callers always get
+    their own copy.
+    """
+
+    def __init__(self, database_path=None):
+        self.database_path = database_path
+        self.video_info = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def get_key(input_video, ffprobe_binary):
+        """ compute the key of a video's information
+
+        Arguments:
+            input_video {pathlib.Path} -- path of the video
+            ffprobe_binary {pathlib.Path} -- path of the FFprobe binary
+
+        Returns:
+            tuple -- path, size, modification time and FFprobe binary
+
+        Raises:
+            OSError -- if the video cannot be found
+        """
+        video_stat = input_video.stat()
+        return str(input_video.absolute()), video_stat.st_size, video_stat.st_mtime_ns, str(ffprobe_binary)
+
+    def get(self, key):
+        """ get the information of a video
+
+        Arguments:
+            key {tuple} -- key returned by get_key()
+
+        Returns:
+            str -- video information as JSON text, None if the video has not been probed
+        """
+        with self.lock:
+            video_info = self.video_info.get(key)
+        if video_info is not None or self.database_path is None or not self.database_path.is_file():
+            return video_info
+
+        with contextlib.closing(self._connect()) as connection:
+            row = connection.execute('SELECT info FROM probes WHERE path = ? AND size = ? AND mtime = ? AND ffprobe = ?', key).fetchone()
+        if row is None:
+            return None
+
+        with self.lock:
+            self.video_info[key] = row[0]
+        return row[0]
+
+    def put(self, key, video_info):
+        """ store the information of a video
+
+        Arguments:
+            key {tuple} -- key returned by get_key()
+            video_info {str} -- video information as JSON text
+        """
+        with self.lock:
+            self.video_info[key] = video_info
+        if self.database_path is None:
+            return
+
+        self.database_path.parent.mkdir(parents=True, exist_ok=True)
+        with contextlib.closing(self._connect()) as connection, connection:
+            connection.execute('INSERT OR REPLACE INTO probes (path, size, mtime, ffprobe, info) VALUES (?, ?, ?, ?, ?)', key + (video_info,))
+
+    def _connect(self):
+        # SQLite is only imported when information is kept for later runs
+        import sqlite3
+
+        connection = sqlite3.connect(self.database_path, timeout=30)
+        connection.execute('CREATE TABLE IF NOT EXISTS probes ('
+                           'path TEXT PRIMARY KEY, size INTEGER, mtime INTEGER, ffprobe TEXT, info TEXT)')
+        return connection
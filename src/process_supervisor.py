@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Name: Video2X Process Supervisor
+Author: K4YT3X
+Date Created: October 17, 2026
+Last Modified: October 17, 2026
+
+Description: This class turns subprocess exits, thread
+notifications and stop requests into events, so the upscaler
+can wait for them without polling.
+"""
+
+# built-in imports
+import contextlib
+import queue
+import threading
+import time
+
+
+class ProcessSupervisor:
+    """ Video2X Process Supervisor
+
+    Each watched subprocess gets a thread that blocks until the
+    subprocess exits and then puts an exit event into the event
+    queue. This works the same on Windows, which has neither
+    pidfd nor SIGCHLD. Threads of the upscaler (e.g. the frame
+    scheduler's workers) put in notify events when something
+    changed that the waiting thread has to look at.
+
+    Events are tuples whose first element is the event type:
+        ('exit', process, return_code, elapsed_time)
+        ('notify', source)
+        ('cancel',)
+    """
+
+    def __init__(self):
+        self.events = queue.Queue()
+        self.cancelled = threading.Event()
+        self.watched_processes = set()
+        self.lock = threading.Lock()
+
+    def watch(self, process):
+        """ put an exit event into the queue once a subprocess exits
+
+        Watching a subprocess more than once has no effect.
+
+        Arguments:
+            process {subprocess.Popen} -- the subprocess to watch
+        """
+        with self.lock:
+            if process in self.watched_processes:
+                return
+            self.watched_processes.add(process)
+
+        started = time.time()
+
+        def wait():
+            return_code = process.wait()
+            with self.lock:
+                self.watched_processes.discard(process)
+            self.events.put(('exit', process, return_code, time.time() - started))
+
+        threading.Thread(target=wait, daemon=True).start()
+
+    def notify(self, source=None):
+        """ wake up the thread waiting for events
+
+        Arguments:
+            source -- object the event is about (default: {None})
+        """
+        self.events.put(('notify', source))
+
+    def cancel(self):
+        """ request everything to stop
+
+        Can be called from any thread.
+        """
+        self.cancelled.set()
+        self.events.put(('cancel',))
+
+    def is_cancelled(self):
+        return self.cancelled.is_set()
+
+    def next_event(self):
+        """ wait for the next event
+
+        Returns:
+            tuple -- the event
+        """
+        # a blocking get cannot be interrupted by Ctrl+C on Windows
+        # waking up once in a while lets KeyboardInterrupt through
+        while True:
+            with contextlib.suppress(queue.Empty):
+                return self.events.get(timeout=1)
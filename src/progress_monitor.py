@@ -4,58 +4,131 @@
 Name: Video2X Upscale Progress Monitor
 Author: BrianPetkovsek
 Date Created: May 7, 2020
-Last Modified: May 7, 2020
+Last Modified: October 17, 2026
 """
 
 # built-in imports
-import contextlib
+import math
 import threading
 import time
 
-# third-party imports
-from tqdm import tqdm
+# frames completed within this many seconds are measured together
+# so frames completed at the same time do not give an infinite rate
+MEASURE_INTERVAL = 0.5
+
+# time constant of the smoothed throughput (in seconds)
+SMOOTHING_TIME = 10
 
 
 class ProgressMonitor(threading.Thread):
     """ progress monitor
 
     This class provides progress monitoring functionalities
-    by keeping track of the amount of frames in the input
-    directory and the output directory. This is originally
-    suggested by @ArmandBernard.
+    by showing the number of upscaled frames counted by the
+    upscaler. This is originally suggested by @ArmandBernard.
+
+    The monitor is told about upscaled frames by the upscaler
+    as they are completed and only keeps running counters, so
+    updates take the same time no matter how many frames the
+    video has.
+
+    The smoothed throughput starts at the throughput predicted
+    from earlier runs, so the ETA is known before the first
+    frames are upscaled and moves to the measured throughput as
+    the run goes on.
     """
 
-    def __init__(self, upscaler, extracted_frames_directories):
+    def __init__(self, upscaler):
         threading.Thread.__init__(self)
         self.upscaler = upscaler
-        self.extracted_frames_directories = extracted_frames_directories
-        self.running = False
+        self.updated = threading.Event()
+        self.lock = threading.Lock()
 
-    def run(self):
+        # throughput in frames per second
+        self.frames_per_second = 0.0
+        self.smoothed_frames_per_second = upscaler.expected_frames_per_second or 0.0
+        self.eta = None
+        if self.smoothed_frames_per_second > 0:
+            self.eta = upscaler.total_frames / self.smoothed_frames_per_second
+        self.measure_start_time = None
+        self.measure_start_frames = 0
+
+        # set before the thread starts so stop() cannot be called before it is set
         self.running = True
-        
-        # get number of extracted frames
-        self.upscaler.total_frames = 0
-        for directory in self.extracted_frames_directories:
-            self.upscaler.total_frames += len([f for f in directory.iterdir() if str(f).lower().endswith(self.upscaler.image_format.lower())])
+        self.upscaler.progress_listeners.append(self.update)
+
+    def run(self):
+        # tqdm is only imported once a progress bar is shown
+        from tqdm import tqdm
 
-        with tqdm(total=self.upscaler.total_frames, ascii=True, desc=_('Upscaling Progress')) as progress_bar:
+        # segments and videos upscaled at the same time report their progress through the upscaler they belong to
+        # jobs of video2x serve report their progress to clients instead
+        disable = self.upscaler.parent_supervisor is not None or not self.upscaler.progress_bar
+        with tqdm(total=self.upscaler.total_frames, ascii=True, desc=_('Upscaling Progress'), disable=disable) as progress_bar:
             # tqdm update method adds the value to the progress
             # bar instead of setting the value. Therefore, a delta
             # needs to be calculated.
             previous_cycle_frames = 0
-            while self.running:
+            while True:
+
+                # total number of frames changes when it has been estimated
+                if progress_bar.total != self.upscaler.total_frames:
+                    progress_bar.total = self.upscaler.total_frames
+                    progress_bar.refresh()
+
+                # tqdm only knows the throughput measured in this run
+                if self.eta is not None:
+                    progress_bar.set_postfix_str(_('ETA {}').format(tqdm.format_interval(self.eta)), refresh=False)
+
+                # update progress bar
+                delta = self.upscaler.total_frames_upscaled - previous_cycle_frames
+                previous_cycle_frames = self.upscaler.total_frames_upscaled
+                progress_bar.update(delta)
+
+                if not self.running:
+                    break
+
+                # wait for the next upscaled frames
+                self.updated.wait()
+                self.updated.clear()
+
+    def update(self, total_frames_upscaled, total_frames):
+        """ count upscaled frames
+
+        Called by the upscaler whenever frames have been upscaled.
+
+        Arguments:
+            total_frames_upscaled {int} -- number of frames upscaled so far
+            total_frames {int} -- total number of frames
+        """
+        with self.lock:
+            now = time.time()
+
+            # frames of resumed jobs that have been counted at once are not measured
+            if self.measure_start_time is None:
+                self.measure_start_time = now
+                self.measure_start_frames = total_frames_upscaled
+
+            elapsed_time = now - self.measure_start_time
+            if elapsed_time >= MEASURE_INTERVAL:
+                self.frames_per_second = (total_frames_upscaled - self.measure_start_frames) / elapsed_time
+
+                # exponential moving average that does not depend on how often frames complete
+                weight = 1 - math.exp(-elapsed_time / SMOOTHING_TIME)
+                if self.smoothed_frames_per_second == 0:
+                    weight = 1
+                self.smoothed_frames_per_second += weight * (self.frames_per_second - self.smoothed_frames_per_second)
 
-                with contextlib.suppress(FileNotFoundError):
-                    self.upscaler.total_frames_upscaled = len([f for f in self.upscaler.upscaled_frames.iterdir() if str(f).lower().endswith(self.upscaler.image_format.lower())])
+                self.measure_start_time = now
+                self.measure_start_frames = total_frames_upscaled
 
-                    # update progress bar
-                    delta = self.upscaler.total_frames_upscaled - previous_cycle_frames
-                    previous_cycle_frames = self.upscaler.total_frames_upscaled
-                    progress_bar.update(delta)
+            if self.smoothed_frames_per_second > 0:
+                self.eta = max(total_frames - total_frames_upscaled, 0) / self.smoothed_frames_per_second
 
-                time.sleep(1)
+        self.updated.set()
 
     def stop(self):
         self.running = False
+        self.upscaler.progress_listeners.remove(self.update)
+        self.updated.set()
         self.join()
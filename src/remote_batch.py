@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Name: Video2X Remote Batch
+Author: K4YT3X
+Date Created: October 17, 2026
+Last Modified: October 17, 2026
+
+Description: This class upscales a batch of frames on a
+video2x worker and behaves like the driver process that would
+upscale it locally.
+"""
+
+# local imports
+from render_nodes import HEARTBEAT_INTERVAL
+
+# built-in imports
+import http.client
+import io
+import json
+import re
+import shutil
+import tarfile
+import tempfile
+import threading
+
+# third-party imports
+from avalon_framework import Avalon
+
+# names frames and tiles may have in an archive
+FRAME_NAME = re.compile(r'\w[\w.]*')
+
+
+class RemoteBatch:
+    """ Video2X Remote Batch
+
+    The frame scheduler waits for remote batches like it waits
+    for driver processes. When wait() is called, the frames in
+    the input directory are sent to the worker as a tar archive
+    together with the settings of the job. The batch's status is
+    then polled once a second, which also tells the worker that
+    the batch is still wanted. Once the worker's driver has
+    finished, the upscaled frames are written into the output
+    directory and the driver's exit code is returned.
+
+    A batch whose worker stops answering is sent to another
+    worker that is still answering.
+    """
+
+    def __init__(self, render_nodes, address, job, input_directory, output_directory):
+        self.render_nodes = render_nodes
+        self.address = address
+        self.job = job
+        self.input_directory = input_directory
+        self.output_directory = output_directory
+        self.returncode = None
+        self.terminated = threading.Event()
+
+        # shown where the process id of a driver would be
+        self.pid = address
+        self.args = [address, str(input_directory)]
+
+    def poll(self):
+        return self.returncode
+
+    def wait(self):
+        """ upscale the batch on a worker
+
+        Returns:
+            int -- exit code of the worker's driver
+        """
+        if self.returncode is None:
+            self.returncode = self._upscale()
+        return self.returncode
+
+    def terminate(self):
+        """ stop upscaling the batch
+
+        Can be called from any thread, wait() then returns 1.
+        """
+        self.terminated.set()
+
+    def _upscale(self):
+        """ send the batch to a worker until one of them has upscaled it
+
+        Returns:
+            int -- exit code of the worker's driver, 1 if no worker is answering or terminated
+        """
+        while not self.terminated.is_set():
+            address = self.render_nodes.take_node(self.address)
+            if address is None:
+                Avalon.warning(_('No worker is answering'))
+                return 1
+            if address != self.address:
+                Avalon.warning(_('Worker {} is not answering, sending a batch of {} frames to worker {}').format(
+                    self.address, len(list(self.input_directory.iterdir())), address))
+                self.address = self.pid = address
+
+            try:
+                return_code = self._upscale_on(address)
+            finally:
+                self.render_nodes.release_node(address)
+            if return_code is not None:
+                return return_code
+
+        return 1
+
+    def _upscale_on(self, address):
+        """ send the batch to one worker and wait for it
+
+        Arguments:
+            address {str} -- address of the worker
+
+        Returns:
+            int -- exit code of the worker's driver, None if the batch has to be sent again
+        """
+        try:
+            batch_id = self._submit(address)
+        except (OSError, http.client.HTTPException, ValueError) as e:
+            Avalon.debug_info(_('Unable to send a batch to worker {}: {}').format(address, e))
+            self.terminated.wait(HEARTBEAT_INTERVAL)
+            return None
+
+        # a batch the worker does not know rejects the settings of the job
+        if batch_id is None:
+            return 1
+
+        try:
+            while not self.terminated.wait(HEARTBEAT_INTERVAL):
+                try:
+                    status = self._request(address, 'GET', f'/batches/{batch_id}')
+                except (OSError, http.client.HTTPException, ValueError):
+
+                    # the worker may only be busy for a moment
+                    if self.render_nodes.is_alive(address):
+                        continue
+                    return None
+
+                # the worker has dropped the batch, e.g. after a restart
+                if status is None:
+                    return None
+
+                self.render_nodes.seen(address)
+                if status['status'] != 'finished':
+                    continue
+
+                if status['return_code'] != 0:
+                    return status['return_code']
+
+                # frames that could not be copied back are asked for again
+                try:
+                    self._download(address, batch_id)
+                    return 0
+                except (OSError, http.client.HTTPException, tarfile.TarError) as e:
+                    Avalon.debug_info(_('Unable to copy upscaled frames from worker {}: {}').format(address, e))
+                    for frame in self.output_directory.iterdir():
+                        frame.unlink()
+
+            return 1
+
+        finally:
+            # frames left on the worker are deleted by the worker once it stops being asked for them
+            try:
+                self._request(address, 'DELETE', f'/batches/{batch_id}')
+            except (OSError, http.client.HTTPException, ValueError):
+                pass
+
+    def _submit(self, address):
+        """ send the frames and the settings of the job to a worker
+
+        Arguments:
+            address {str} -- address of the worker
+
+        Returns:
+            str -- id of the batch on the worker, None if the worker rejected the batch
+        """
+        with tempfile.TemporaryFile(dir=self.input_directory.parent) as archive_file:
+            with tarfile.open(fileobj=archive_file, mode='w') as archive:
+                job = json.dumps(self.job, default=str).encode('utf-8')
+                job_info = tarfile.TarInfo('job.json')
+                job_info.size = len(job)
+                archive.addfile(job_info, io.BytesIO(job))
+                for frame in sorted(self.input_directory.iterdir()):
+                    archive.add(frame, arcname=frame.name)
+
+            size = archive_file.tell()
+            archive_file.seek(0)
+            connection = self.render_nodes.connect(address)
+            try:
+                connection.request('POST', '/batches', body=archive_file,
+                                   headers={'Content-Type': 'application/x-tar', 'Content-Length': str(size)})
+                response = connection.getresponse()
+                body = response.read()
+            finally:
+                connection.close()
+
+        if response.status == 400:
+            Avalon.error(_('Worker {} rejected a batch: {}').format(address, body.decode('utf-8', 'replace')))
+            return None
+        if response.status != 201:
+            raise http.client.HTTPException(f'unexpected status {response.status}')
+        return json.loads(body.decode('utf-8'))['id']
+
+    def _download(self, address, batch_id):
+        """ write the upscaled frames of a batch into the output directory
+
+        Arguments:
+            address {str} -- address of the worker
+            batch_id {str} -- id of the batch on the worker
+        """
+        connection = self.render_nodes.connect(address)
+        try:
+            connection.request('GET', f'/batches/{batch_id}/frames')
+            response = connection.getresponse()
+            if response.status != 200:
+                raise http.client.HTTPException(f'unexpected status {response.status}')
+
+            with tarfile.open(fileobj=response, mode='r|') as archive:
+                for member in archive:
+                    if not (member.isfile() and FRAME_NAME.fullmatch(member.name)):
+                        raise tarfile.TarError(f'unexpected file {member.name}')
+                    with open(self.output_directory / member.name, 'wb') as frame:
+                        shutil.copyfileobj(archive.extractfile(member), frame)
+
+        finally:
+            connection.close()
+
+    def _request(self, address, method, path):
+        """ send a request without a body to a worker
+
+        Arguments:
+            address {str} -- address of the worker
+            method {str} -- HTTP method
+            path {str} -- path of the request
+
+        Returns:
+            dict -- JSON the worker answered with, None if the batch is unknown to the worker
+        """
+        connection = self.render_nodes.connect(address)
+        try:
+            connection.request(method, path)
+            response = connection.getresponse()
+            body = response.read()
+        finally:
+            connection.close()
+
+        if response.status == 404:
+            return None
+        if response.status != 200:
+            raise http.client.HTTPException(f'unexpected status {response.status}')
+        return json.loads(body.decode('utf-8'))
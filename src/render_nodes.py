@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Name: Video2X Render Nodes
+Author: K4YT3X
+Date Created: October 17, 2026
+Last Modified: October 17, 2026
+
+Description: This class keeps track of the video2x workers
+batches of frames can be sent to, and of which of them are
+still answering.
+"""
+
+# built-in imports
+import http.client
+import json
+import threading
+import time
+
+# third-party imports
+from avalon_framework import Avalon
+
+# port video2x workers listen on unless specified otherwise
+WORKER_PORT = 8964
+
+# how often workers and the batches running on them are asked for their status (in seconds)
+HEARTBEAT_INTERVAL = 1
+
+
+class RenderNodes:
+    """ Video2X Render Nodes
+
+    Every worker is asked for its status once a second. A worker
+    that has not answered for longer than the worker timeout is
+    considered lost, and batches that were running on it are sent
+    to the worker with the fewest batches per process instead.
+
+    Workers report how many batches they upscale at once. The
+    frame scheduler runs one worker thread per remote process, so
+    faster workers take more batches from the shared queue.
+    """
+
+    def __init__(self, addresses, timeout):
+        self.addresses = addresses
+        self.timeout = timeout
+        self.slots = {address: 0 for address in addresses}
+        self.last_seen = {address: None for address in addresses}
+        self.batches = {address: 0 for address in addresses}
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.heartbeat_thread = threading.Thread(target=self._send_heartbeats, daemon=True)
+
+    def start(self):
+        """ ask every worker for its number of processes and start sending heartbeats
+        """
+        for address in self.addresses:
+            if self._ask_status(address):
+                Avalon.info(_('Worker {} is ready with {} processes').format(address, self.slots[address]))
+            else:
+                Avalon.warning(_('Worker {} is not answering, batches are only sent to it once it answers').format(address))
+        self.heartbeat_thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.heartbeat_thread.join()
+
+    def get_slots(self):
+        """ list each process of the workers that answered
+
+        Returns:
+            list -- worker address of each process
+        """
+        return [address for address in self.addresses for slot in range(self.slots[address])]
+
+    def connect(self, address):
+        """ open an HTTP connection to a worker
+
+        Arguments:
+            address {str} -- host or host:port of the worker
+
+        Returns:
+            http.client.HTTPConnection -- connection to the worker
+        """
+        return http.client.HTTPConnection(address, None if ':' in address else WORKER_PORT, timeout=self.timeout)
+
+    def seen(self, address):
+        """ record that a worker has answered
+
+        Arguments:
+            address {str} -- address of the worker
+        """
+        with self.lock:
+            self.last_seen[address] = time.time()
+
+    def is_alive(self, address):
+        with self.lock:
+            return self.last_seen[address] is not None and time.time() - self.last_seen[address] <= self.timeout
+
+    def take_node(self, address):
+        """ choose the worker a batch is sent to
+
+        Arguments:
+            address {str} -- address of the worker the batch belongs to
+
+        Returns:
+            str -- address of the worker, None if no worker is answering
+        """
+        if not self.is_alive(address):
+            alive_addresses = [address for address in self.addresses if self.is_alive(address)]
+            if not alive_addresses:
+                return None
+            with self.lock:
+                address = min(alive_addresses, key=lambda address: self.batches[address] / max(self.slots[address], 1))
+
+        with self.lock:
+            self.batches[address] += 1
+        return address
+
+    def release_node(self, address):
+        """ record that a batch is no longer running on a worker
+
+        Arguments:
+            address {str} -- address returned by take_node()
+        """
+        with self.lock:
+            self.batches[address] -= 1
+
+    def _send_heartbeats(self):
+        while not self.stopped.wait(HEARTBEAT_INTERVAL):
+            for address in self.addresses:
+                self._ask_status(address)
+
+    def _ask_status(self, address):
+        """ ask a worker for its status
+
+        Arguments:
+            address {str} -- address of the worker
+
+        Returns:
+            bool -- True if the worker answered
+        """
+        connection = self.connect(address)
+        try:
+            connection.request('GET', '/status')
+            response = connection.getresponse()
+            if response.status != 200:
+                return False
+            status = json.loads(response.read().decode('utf-8'))
+
+        except (OSError, http.client.HTTPException, ValueError):
+            return False
+
+        finally:
+            connection.close()
+
+        with self.lock:
+            self.slots[address] = status['processes']
+        self.seen(address)
+        return True
@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Name: Video2X Render Worker
+Author: K4YT3X
+Date Created: October 17, 2026
+Last Modified: October 17, 2026
+
+Description: This class receives batches of frames from
+other video2x instances over HTTP and upscales them with the
+drivers installed on this machine.
+"""
+
+# local imports
+from driver_registry import get_driver_wrapper
+from exceptions import UnrecognizedDriverError
+from remote_batch import FRAME_NAME
+from upscaler import Upscaler
+
+# built-in imports
+import contextlib
+import copy
+import http.server
+import json
+import os
+import re
+import shutil
+import tarfile
+import threading
+import time
+import uuid
+
+# third-party imports
+from avalon_framework import Avalon
+
+# how often batches nobody asks for anymore are looked for (in seconds)
+LEASE_INTERVAL = 1
+
+
+class RenderWorker:
+    """ Video2X Render Worker
+
+    Batches are tar archives of frames with a job.json holding
+    the driver, its settings and the scaling options of the job.
+    The driver path and the settings the job does not mention are
+    taken from this machine's configuration. Up to the given
+    number of batches are upscaled at once, the others wait.
+
+    Requests:
+        GET /status -- number of processes and batches
+        POST /batches -- upscale a batch, answers with its id
+        GET /batches/<id> -- status and driver exit code of a batch
+        GET /batches/<id>/frames -- tar archive of the upscaled frames
+        DELETE /batches/<id> -- stop upscaling a batch and delete its frames
+
+    A batch whose status has not been asked for within the
+    worker timeout is dropped, since the video2x instance that
+    sent it has stopped or sent it to another worker.
+    """
+
+    def __init__(self, config, processes, timeout, work_directory):
+        self.config = config
+        self.processes = processes
+        self.timeout = timeout
+        self.work_directory = work_directory
+        self.slots = threading.BoundedSemaphore(processes)
+        self.batches = {}
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.server = None
+
+    def serve(self, host, port):
+        """ accept batches until stop() is called or the worker is interrupted
+
+        Arguments:
+            host {str} -- address to listen on
+            port {int} -- port to listen on
+        """
+        self.server = http.server.ThreadingHTTPServer((host, port), RenderWorkerHandler)
+        self.server.daemon_threads = True
+
+        # frames left behind by a worker that was killed on the same port are of no use
+        # no other worker can be using them once the port has been taken
+        shutil.rmtree(self.work_directory, ignore_errors=True)
+        self.work_directory.mkdir(parents=True)
+        self.server.worker = self
+        expiry_thread = threading.Thread(target=self._drop_expired_batches)
+        expiry_thread.start()
+
+        Avalon.info(_('Waiting for batches on {}:{}').format(host, port))
+        try:
+            self.server.serve_forever()
+
+        finally:
+            self.stopped.set()
+            expiry_thread.join()
+            for batch_id in list(self.batches):
+                self.cancel(batch_id)
+            self.server.server_close()
+            shutil.rmtree(self.work_directory, ignore_errors=True)
+
+    def stop(self):
+        """ stop accepting batches
+
+        Must be called from another thread than serve().
+        """
+        self.server.shutdown()
+
+    def get_status(self):
+        with self.lock:
+            return {'processes': self.processes, 'batches': len(self.batches)}
+
+    def submit(self, archive_file, size):
+        """ unpack a batch and start upscaling it
+
+        Arguments:
+            archive_file {file} -- stream the tar archive is read from
+            size {int} -- size of the tar archive in bytes
+
+        Returns:
+            str -- id of the batch
+
+        Raises:
+            ValueError -- if the archive or the job is invalid
+        """
+        batch_id = uuid.uuid4().hex
+        batch_directory = self.work_directory / batch_id
+        input_directory = batch_directory / 'input'
+        output_directory = batch_directory / 'output'
+        input_directory.mkdir(parents=True)
+        output_directory.mkdir()
+
+        try:
+            # the archive is written to disk first, the request does not end with the archive
+            archive_path = batch_directory / 'batch.tar'
+            with open(archive_path, 'wb') as archive:
+                while size > 0:
+                    chunk = archive_file.read(min(size, 1024 ** 2))
+                    if not chunk:
+                        raise ValueError('archive is incomplete')
+                    archive.write(chunk)
+                    size -= len(chunk)
+
+            job = None
+            with tarfile.open(archive_path) as archive:
+                for member in archive:
+                    if not (member.isfile() and FRAME_NAME.fullmatch(member.name)):
+                        raise ValueError(f'unexpected file {member.name}')
+                    if member.name == 'job.json':
+                        job = json.load(archive.extractfile(member))
+                    else:
+                        with open(input_directory / member.name, 'wb') as frame:
+                            shutil.copyfileobj(archive.extractfile(member), frame)
+            archive_path.unlink()
+
+            if job is None:
+                raise ValueError('job.json is missing')
+            upscaler = self._create_upscaler(job)
+
+        except (ValueError, KeyError, TypeError, tarfile.TarError):
+            shutil.rmtree(batch_directory, ignore_errors=True)
+            raise
+
+        batch = {'directory': batch_directory,
+                 'status': 'waiting',
+                 'return_code': None,
+                 'process': None,
+                 'last_seen': time.time(),
+                 'cancelled': threading.Event()}
+        with self.lock:
+            self.batches[batch_id] = batch
+        threading.Thread(target=self._upscale_batch, args=(batch, upscaler, input_directory, output_directory)).start()
+
+        Avalon.debug_info(_('Received batch {} of {} frames').format(batch_id, len(list(input_directory.iterdir()))))
+        return batch_id
+
+    def get_batch_status(self, batch_id):
+        """ get the status of a batch
+
+        Arguments:
+            batch_id {str} -- id of the batch
+
+        Returns:
+            dict -- status and exit code of the driver, None if the batch is unknown
+        """
+        with self.lock:
+            batch = self.batches.get(batch_id)
+            if batch is None:
+                return None
+            batch['last_seen'] = time.time()
+            return {'status': batch['status'], 'return_code': batch['return_code']}
+
+    def get_frames(self, batch_id):
+        """ list the upscaled frames of a batch
+
+        The frames are listed while the batch cannot be cancelled,
+        since cancelling a finished batch deletes its frames.
+
+        Arguments:
+            batch_id {str} -- id of the batch
+
+        Returns:
+            list -- paths of the upscaled frames, None if the batch is unknown
+        """
+        with self.lock:
+            batch = self.batches.get(batch_id)
+            if batch is None:
+                return None
+            batch['last_seen'] = time.time()
+            return sorted((batch['directory'] / 'output').iterdir())
+
+    @staticmethod
+    def write_frames(frames, output_file):
+        """ write upscaled frames as a tar archive
+
+        Arguments:
+            frames {list} -- paths of the frames from get_frames()
+            output_file {file} -- stream to write the tar archive into
+        """
+        with tarfile.open(fileobj=output_file, mode='w|') as archive:
+            for frame in frames:
+                archive.add(frame, arcname=frame.name)
+
+    def cancel(self, batch_id):
+        """ stop upscaling a batch and delete its frames
+
+        Arguments:
+            batch_id {str} -- id of the batch
+
+        Returns:
+            bool -- False if the batch is unknown
+        """
+        with self.lock:
+            batch = self.batches.pop(batch_id, None)
+            if batch is None:
+                return False
+            batch['cancelled'].set()
+            finished = batch['status'] == 'finished'
+
+        # a batch that is still upscaling deletes its frames once its driver has exited
+        if batch['process'] is not None:
+            with contextlib.suppress(OSError):
+                batch['process'].terminate()
+        if finished:
+            shutil.rmtree(batch['directory'], ignore_errors=True)
+        return True
+
+    def _create_upscaler(self, job):
+        """ create an upscaler that launches drivers with the settings of a job
+
+        Arguments:
+            job {dict} -- settings of the job from job.json
+
+        Returns:
+            Upscaler -- upscaler for the batch
+
+        Raises:
+            ValueError -- if the driver is not available on this worker
+        """
+        driver = job['driver']
+        try:
+            driver_wrapper = get_driver_wrapper(driver)
+        except UnrecognizedDriverError:
+            driver_wrapper = None
+
+        # batches are directories of frames
+        if driver_wrapper is None or not driver_wrapper.DIRECTORY_INPUT or driver not in self.config:
+            raise ValueError(f'driver {driver} is not available')
+
+        # only settings this machine's configuration knows are taken from the job
+        # the driver is always run from where it is installed on this machine
+        driver_settings = copy.deepcopy(self.config[driver])
+        driver_settings.update({key: value for key, value in job['driver_settings'].items() if key in driver_settings and key != 'path'})
+        driver_settings['path'] = os.path.expandvars(driver_settings['path'])
+
+        upscaler = Upscaler(None, None, driver_settings, self.config['ffmpeg'])
+        upscaler.driver = driver
+        upscaler.scale_ratio = job['scale_ratio']
+        upscaler.scale_width = job['scale_width']
+        upscaler.scale_height = job['scale_height']
+        upscaler.image_format = job['image_format']
+        upscaler.bit_depth = job['bit_depth']
+        upscaler.processes = self.processes
+        return upscaler
+
+    def _upscale_batch(self, batch, upscaler, input_directory, output_directory):
+        """ run a driver process on a batch once a process is free
+
+        Arguments:
+            batch {dict} -- the batch
+            upscaler {Upscaler} -- upscaler for the batch
+            input_directory {pathlib.Path} -- directory of the batch's frames
+            output_directory {pathlib.Path} -- directory to save upscaled frames into
+        """
+        return_code = 1
+        try:
+            while not batch['cancelled'].is_set():
+                if not self.slots.acquire(timeout=LEASE_INTERVAL):
+                    continue
+
+                try:
+                    with self.lock:
+                        if batch['cancelled'].is_set():
+                            break
+                        batch['status'] = 'upscaling'
+                        batch['process'] = upscaler._launch_driver(input_directory, output_directory)
+                    return_code = batch['process'].wait()
+
+                finally:
+                    self.slots.release()
+                break
+
+        except OSError as e:
+            Avalon.error(_('Unable to launch driver: {}').format(e))
+
+        # the batch is still reported as finished, so the video2x instance that sent it retries it
+        except Exception as e:
+            Avalon.error(_('Unable to upscale a batch: {}').format(e))
+
+        with self.lock:
+            batch['status'] = 'finished'
+            batch['return_code'] = return_code
+            cancelled = batch['cancelled'].is_set()
+
+        if cancelled:
+            shutil.rmtree(batch['directory'], ignore_errors=True)
+
+    def _drop_expired_batches(self):
+        while not self.stopped.wait(LEASE_INTERVAL):
+            now = time.time()
+            with self.lock:
+                expired_batches = [batch_id for batch_id, batch in self.batches.items() if now - batch['last_seen'] > self.timeout]
+            for batch_id in expired_batches:
+                Avalon.warning(_('Batch {} has not been asked for in {} seconds, dropping it').format(batch_id, self.timeout))
+                self.cancel(batch_id)
+
+
+class RenderWorkerHandler(http.server.BaseHTTPRequestHandler):
+    """ answers the requests of RenderWorker
+
+    Extends:
+        http.server.BaseHTTPRequestHandler
+    """
+
+    def do_GET(self):
+        worker = self.server.worker
+        if self.path == '/status':
+            self._send_json(200, worker.get_status())
+            return
+
+        match = re.fullmatch(r'/batches/(\w+)(/frames)?', self.path)
+        status = worker.get_batch_status(match.group(1)) if match is not None else None
+        if status is None:
+            self._send_json(404, {'error': 'unknown batch'})
+            return
+
+        if match.group(2) is None:
+            self._send_json(200, status)
+            return
+
+        if status['status'] != 'finished':
+            self._send_json(409, {'error': 'batch has not finished'})
+            return
+
+        # the batch can be cancelled after its status has been read
+        frames = worker.get_frames(match.group(1))
+        if frames is None:
+            self._send_json(404, {'error': 'unknown batch'})
+            return
+
+        # the connection is closed after the archive, so its size does not have to be known
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-tar')
+        self.end_headers()
+        worker.write_frames(frames, self.wfile)
+
+    def do_POST(self):
+        if self.path != '/batches':
+            self._send_json(404, {'error': 'unknown path'})
+            return
+
+        try:
+            batch_id = self.server.worker.submit(self.rfile, int(self.headers['Content-Length']))
+        except (ValueError, KeyError, TypeError, tarfile.TarError) as e:
+            self._send_json(400, {'error': str(e)})
+            return
+        self._send_json(201, {'id': batch_id})
+
+    def do_DELETE(self):
+        match = re.fullmatch(r'/batches/(\w+)', self.path)
+        if match is None or not self.server.worker.cancel(match.group(1)):
+            self._send_json(404, {'error': 'unknown batch'})
+            return
+        self._send_json(200, {})
+
+    def log_message(self, format, *args):
+        Avalon.debug_info(f'{self.address_string()} {format % args}')
+
+    def _send_json(self, status, content):
+        body = json.dumps(content).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
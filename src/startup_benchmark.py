@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Name: Video2X Startup Benchmark
+Author: K4YT3X
+Date Created: October 17, 2026
+Last Modified: October 17, 2026
+
+Description: This script measures how long video2x takes to
+start, and exits with code 1 when `video2x --version` or a job
+with nothing to upscale takes longer than its budget, so changes
+that slow down startup are noticed before they are released.
+
+Each command is run several times with -X importtime and the
+median wall time is compared with the budget. The modules that
+took the longest to import in the median run are listed to show
+where the time went.
+
+Example:
+    python3 startup_benchmark.py -c video2x.yaml -d waifu2x_ncnn_vulkan
+"""
+
+# built-in imports
+import argparse
+import pathlib
+import subprocess
+import sys
+import tempfile
+import time
+
+# third-party imports
+from avalon_framework import Avalon
+
+VIDEO2X = pathlib.Path(__file__).parent.absolute() / 'video2x.py'
+
+
+def parse_arguments():
+    """ parse CLI arguments
+    """
+    parser = argparse.ArgumentParser(prog='startup_benchmark', formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('-c', '--config', type=pathlib.Path, help='video2x config file path with working FFmpeg and driver paths', action='store',
+                        default=pathlib.Path(__file__).parent.absolute() / 'video2x.yaml')
+    parser.add_argument('-d', '--driver', help='upscaling driver of the job', action='store', default='waifu2x_caffe')
+    parser.add_argument('-n', '--runs', help='number of times each command is run', action='store', type=int, default=5)
+    parser.add_argument('--version-budget', help='seconds video2x --version may take', action='store', type=float, default=0.3)
+    parser.add_argument('--job-budget', help='seconds a job with nothing to upscale may take', action='store', type=float, default=0.5)
+    parser.add_argument('--top', help='number of the slowest imports to list', action='store', type=int, default=10)
+    return parser.parse_args()
+
+
+def parse_import_times(output):
+    """ read the cumulative import times of top-level modules from -X importtime output
+
+    Arguments:
+        output {str} -- standard error of the command
+
+    Returns:
+        list -- (seconds, module) of each top-level module, the slowest first
+    """
+    import_times = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        columns = line[len('import time:'):].split('|')
+
+        # modules imported by other modules are indented
+        if len(columns) != 3 or columns[2].startswith('  ') or not columns[1].strip().isdigit():
+            continue
+        import_times.append((int(columns[1]) / 1000000, columns[2].strip()))
+    return sorted(import_times, reverse=True)
+
+
+def measure(arguments, runs):
+    """ run video2x and measure how long it takes
+
+    Arguments:
+        arguments {list} -- arguments of video2x.py
+        runs {int} -- number of times the command is run
+
+    Returns:
+        tuple -- median wall time in seconds and the import times of the median run
+
+    Raises:
+        subprocess.CalledProcessError -- if video2x fails
+    """
+    results = []
+    for run in range(runs):
+        start_time = time.perf_counter()
+        process = subprocess.run([sys.executable, '-X', 'importtime', str(VIDEO2X)] + arguments,
+                                 stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+        wall_time = time.perf_counter() - start_time
+
+        # video2x reports errors of jobs without changing its exit code
+        if process.returncode != 0 or 'Traceback' in process.stdout + process.stderr:
+            print(process.stdout + process.stderr, file=sys.stderr)
+            raise subprocess.CalledProcessError(process.returncode, process.args)
+        results.append((wall_time, parse_import_times(process.stderr)))
+
+    results.sort(key=lambda result: result[0])
+    return results[len(results) // 2]
+
+
+def check_budget(name, arguments, budget, runs, top):
+    """ measure a command and compare it with its budget
+
+    Arguments:
+        name {str} -- name of the command in the report
+        arguments {list} -- arguments of video2x.py
+        budget {float} -- seconds the command may take
+        runs {int} -- number of times the command is run
+        top {int} -- number of the slowest imports to list
+
+    Returns:
+        bool -- True if the command is within its budget
+    """
+    wall_time, import_times = measure(arguments, runs)
+    import_time = sum(seconds for seconds, module in import_times)
+
+    if wall_time <= budget:
+        Avalon.info(f'{name}: {wall_time:.3f}s (budget {budget:.3f}s), {import_time:.3f}s importing modules')
+    else:
+        Avalon.error(f'{name}: {wall_time:.3f}s is over the budget of {budget:.3f}s, {import_time:.3f}s importing modules')
+
+    for seconds, module in import_times[:top]:
+        print(f'    {seconds * 1000:8.1f} ms  {module}')
+    return wall_time <= budget
+
+
+def main():
+    args = parse_arguments()
+
+    within_budget = check_budget('video2x --version', ['--version'], args.version_budget, args.runs, args.top)
+
+    # upscaling an empty directory runs everything up to the first video
+    with tempfile.TemporaryDirectory() as temp_directory:
+        input_directory = pathlib.Path(temp_directory) / 'input'
+        input_directory.mkdir()
+        job_arguments = ['-c', str(args.config), '-d', args.driver, '-r', '2',
+                         '-i', str(input_directory), '-o', str(pathlib.Path(temp_directory) / 'output')]
+        within_budget = check_budget('empty job', job_arguments, args.job_budget, args.runs, args.top) and within_budget
+
+    sys.exit(0 if within_budget else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Name: Video2X Test Configuration
+Author: K4YT3X
+Date Created: October 17, 2026
+Last Modified: October 17, 2026
+
+Description: This file makes the modules of video2x importable
+by the tests the same way video2x.py imports them.
+"""
+
+# built-in imports
+import gettext
+import pathlib
+import sys
+
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent.absolute()))
+
+# modules such as frame_scheduler use the _ installed by video2x.py
+gettext.NullTranslations().install()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Name: Video2X Batch Scheduler Tests
+Author: K4YT3X
+Date Created: October 17, 2026
+Last Modified: October 17, 2026
+"""
+
+# local imports
+from batch_scheduler import BatchScheduler
+import batch_scheduler
+
+# built-in imports
+import threading
+
+
+def create_plan(name, frames, peak_scratch_size):
+    return {'input': name, 'frames': frames, 'peak_scratch_size': peak_scratch_size}
+
+
+def test_shortest_videos_are_started_first():
+    plans = [create_plan('long', 300, 10), create_plan('unknown', None, None), create_plan('short', 100, 10), create_plan('medium', 200, 10)]
+    scheduler = BatchScheduler(plans, 1, 1, 1, 100)
+
+    started = []
+    plan = scheduler.next_video()
+    while plan is not None:
+        started.append(plan['input'])
+        scheduler.finish_video(plan)
+        plan = scheduler.next_video()
+    assert started == ['short', 'medium', 'long', 'unknown']
+
+
+def test_videos_are_started_while_slots_and_scratch_space_are_left():
+    plans = [create_plan('a', 100, 60), create_plan('b', 200, 60), create_plan('c', 300, 30), create_plan('d', 400, 10)]
+    scheduler = BatchScheduler(plans, 2, 1, 1, 100)
+
+    # b does not fit next to a, the next shortest video that fits is started
+    a = scheduler.next_video()
+    c = scheduler.next_video()
+    assert (a['input'], c['input']) == ('a', 'c')
+    assert scheduler.reserved_scratch_size == 90
+
+    # no more than two videos run at once
+    assert scheduler.next_video() is None
+
+    scheduler.finish_video(a)
+    assert scheduler.get_scratch_size(c) == 30
+    assert scheduler.next_video()['input'] == 'b'
+
+
+def test_video_larger_than_the_scratch_space_runs_alone():
+    plans = [create_plan('small', 100, 10), create_plan('huge', 200, 1000)]
+    scheduler = BatchScheduler(plans, 2, 1, 1, 100)
+
+    small = scheduler.next_video()
+    assert scheduler.next_video() is None
+
+    scheduler.finish_video(small)
+    huge = scheduler.next_video()
+    assert huge['input'] == 'huge'
+    assert scheduler.get_scratch_size(huge) == 100
+
+
+def test_acquire_gives_up_once_stopped(monkeypatch):
+    monkeypatch.setattr(batch_scheduler, 'SLOT_INTERVAL', 0.01)
+    slots = threading.BoundedSemaphore(1)
+
+    assert BatchScheduler.acquire(slots, lambda: False)
+
+    stopped = threading.Event()
+    threading.Timer(0.05, stopped.set).start()
+    assert not BatchScheduler.acquire(slots, stopped.is_set)
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Name: Video2X FFmpeg Wrapper Tests
+Author: K4YT3X
+Date Created: October 17, 2026
+Last Modified: October 17, 2026
+"""
+
+# local imports
+from wrappers.ffmpeg import Ffmpeg
+
+
+def test_source_pixel_format_is_not_written_into_the_settings():
+    ffmpeg_settings = {'ffmpeg_path': '/usr/bin', 'frames_to_video': {'output_options': {'-pix_fmt': None, '-crf': 17}}}
+    fm = Ffmpeg(ffmpeg_settings, 'png')
+    fm.pixel_format = 'yuv420p10le'
+    assert fm._read_configuration(phase='frames_to_video', section='output_options') == ['-pix_fmt', 'yuv420p10le', '-crf', '17']
+
+    # the next video gets its own source pixel format
+    assert ffmpeg_settings['frames_to_video']['output_options']['-pix_fmt'] is None
+    fm = Ffmpeg(ffmpeg_settings, 'png')
+    fm.pixel_format = 'yuv420p'
+    assert fm._read_configuration(phase='frames_to_video', section='output_options') == ['-pix_fmt', 'yuv420p', '-crf', '17']
+
+
+def test_configured_pixel_format_is_kept():
+    fm = Ffmpeg({'ffmpeg_path': '/usr/bin', 'video_to_frames': {'output_options': {'-pix_fmt': 'rgb24'}}}, 'png')
+    fm.pixel_format = 'yuv420p10le'
+    assert fm._read_configuration(phase='video_to_frames', section='output_options') == ['-pix_fmt', 'rgb24']
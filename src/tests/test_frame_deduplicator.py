@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Name: Video2X Frame Deduplicator Tests
+Author: K4YT3X
+Date Created: October 17, 2026
+Last Modified: October 17, 2026
+"""
+
+# local imports
+from frame_deduplicator import FrameDeduplicator
+
+# third-party imports
+from PIL import Image
+import numpy
+
+
+def save_frame(path, pixels):
+    Image.fromarray(numpy.asarray(pixels, dtype=numpy.uint8), 'RGB').save(path)
+    return path
+
+
+def test_exact_mode_finds_held_frames(tmp_path):
+    black = numpy.zeros((32, 32, 3))
+    white = numpy.full((32, 32, 3), 255)
+    frames = [save_frame(tmp_path / f'extracted_{i}.png', pixels) for i, pixels in enumerate([black, black, black, white, black], 1)]
+
+    frame_deduplicator = FrameDeduplicator('exact', 0)
+    duplicates = [frame_deduplicator.find_duplicate(i, frame) for i, frame in enumerate(frames, 1)]
+
+    # held frames point at the first frame they repeat, not at the frame right before them
+    assert duplicates == [None, 1, 1, None, None]
+    assert frame_deduplicator.duplicates == 2
+
+
+def test_near_mode_ignores_noise_but_not_small_changes(tmp_path):
+    background = numpy.full((64, 64, 3), 128)
+    noise = background.copy()
+    noise[0, 0] = 129
+    moved = background.copy()
+    moved[40:56, 40:56] = 0
+
+    frame_deduplicator = FrameDeduplicator('near', 1.0)
+    assert frame_deduplicator.find_duplicate(1, save_frame(tmp_path / 'extracted_1.png', background)) is None
+    assert frame_deduplicator.find_duplicate(2, save_frame(tmp_path / 'extracted_2.png', noise)) == 1
+
+    # a single changed block is not averaged away by the static background
+    assert frame_deduplicator.find_duplicate(3, save_frame(tmp_path / 'extracted_3.png', moved)) is None
+
+
+def test_reset_treats_next_frame_as_unique(tmp_path):
+    frame = save_frame(tmp_path / 'extracted_1.png', numpy.zeros((16, 16, 3)))
+
+    frame_deduplicator = FrameDeduplicator('exact', 0)
+    frame_deduplicator.find_duplicate(1, frame)
+    frame_deduplicator.reset()
+    assert frame_deduplicator.find_duplicate(2, frame) is None
+    assert frame_deduplicator.find_duplicate(3, frame) == 2
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Name: Video2X Frame Feeder Tests
+Author: K4YT3X
+Date Created: October 17, 2026
+Last Modified: October 17, 2026
+"""
+
+# local imports
+from frame_feeder import FrameFeeder
+from upscaler import Upscaler
+
+# built-in imports
+import subprocess
+import sys
+import threading
+import time
+
+# third-party imports
+import psutil
+import pytest
+
+
+class FakeFrameScheduler:
+    """ records what the frame feeder hands out
+    """
+
+    def __init__(self):
+        self.frames = []
+        self.finished = False
+        self.exception = None
+        self.pending_frames = 0
+
+    def put(self, frame_index, frames):
+        self.frames.append(frame_index)
+
+    def put_upscaled(self, frame_index):
+        self.frames.append(frame_index)
+
+    def finish(self):
+        self.finished = True
+
+    def is_alive(self):
+        return not self.finished
+
+    def stop(self):
+        self.finish()
+
+
+def create_upscaler(tmp_path, frames):
+    upscaler = Upscaler(None, None, {}, {})
+    upscaler.extracted_frames = tmp_path
+    upscaler.process_pool = []
+    upscaler.frame_encoder = None
+    for frame_index in range(1, frames + 1):
+        (tmp_path / f'extracted_{frame_index}.png').write_bytes(b'frame')
+    return upscaler
+
+
+def create_extraction_process():
+    # FFmpeg has already extracted all frames
+    process = subprocess.Popen([sys.executable, '-c', ''])
+    process.wait()
+    return process
+
+
+def test_frames_are_handed_out_in_order(tmp_path):
+    upscaler = create_upscaler(tmp_path, 3)
+    upscaler._find_changes = lambda frame_index, frame: [frame]
+    frame_scheduler = FakeFrameScheduler()
+
+    frame_feeder = FrameFeeder(upscaler, create_extraction_process(), frame_scheduler)
+    frame_feeder.start()
+    frame_feeder.join()
+
+    assert frame_scheduler.frames == [1, 2, 3]
+    assert frame_scheduler.finished
+    assert frame_feeder.exception is None
+    assert upscaler.total_frames == 3
+
+
+def test_failure_is_raised_by_wait(tmp_path):
+    upscaler = create_upscaler(tmp_path, 3)
+
+    def find_changes(frame_index, frame):
+        if frame_index == 2:
+            raise OSError('cannot read frame')
+        return [frame]
+
+    upscaler._find_changes = find_changes
+    upscaler.frame_scheduler = FakeFrameScheduler()
+    upscaler.frame_feeder = FrameFeeder(upscaler, create_extraction_process(), upscaler.frame_scheduler)
+    upscaler.frame_feeder.start()
+    upscaler.frame_feeder.join()
+
+    # the frames handed out before the failure must not be encoded as the whole video
+    assert upscaler.frame_scheduler.frames == [1]
+    assert upscaler.frame_scheduler.finished
+    assert isinstance(upscaler.frame_feeder.exception, OSError)
+    with pytest.raises(OSError, match='cannot read frame'):
+        upscaler._wait()
+
+
+class FakeFrameReclaimer:
+    def __init__(self):
+        self.reclaimed = threading.Condition()
+        self.disk_usage = 0
+
+
+def create_throttled_feeder(tmp_path, extraction_process):
+    upscaler = create_upscaler(tmp_path, 0)
+    upscaler.pipeline_window = 2
+    upscaler.frame_reclaimer = FakeFrameReclaimer()
+    frame_scheduler = FakeFrameScheduler()
+    frame_scheduler.pending_frames = 2
+    return FrameFeeder(upscaler, extraction_process, frame_scheduler)
+
+
+def test_extraction_is_suspended_while_too_many_frames_wait(tmp_path):
+    extraction_process = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])
+    try:
+        frame_feeder = create_throttled_feeder(tmp_path, extraction_process)
+        frame_feeder.running = True
+        throttle = threading.Thread(target=frame_feeder._throttle)
+        throttle.start()
+
+        # half of the window has to be upscaled before extraction is resumed
+        deadline = time.time() + 10
+        while psutil.Process(extraction_process.pid).status() != psutil.STATUS_STOPPED and time.time() < deadline:
+            time.sleep(0.01)
+        assert frame_feeder.suspended
+        assert psutil.Process(extraction_process.pid).status() == psutil.STATUS_STOPPED
+
+        frame_feeder.frame_scheduler.pending_frames = 1
+        throttle.join(10)
+        assert not frame_feeder.suspended
+        assert psutil.Process(extraction_process.pid).status() != psutil.STATUS_STOPPED
+
+    finally:
+        extraction_process.kill()
+        extraction_process.wait()
+
+
+def test_exited_extraction_is_not_suspended(tmp_path):
+    extraction_process = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])
+    frame_feeder = create_throttled_feeder(tmp_path, extraction_process)
+    frame_feeder.running = True
+    extraction_process.kill()
+    extraction_process.wait()
+
+    # the PID may already belong to another process
+    frame_feeder._throttle()
+    assert not frame_feeder.suspended
+
+
+def test_reaped_extraction_gets_no_handle(tmp_path):
+    frame_feeder = create_throttled_feeder(tmp_path, create_extraction_process())
+    assert frame_feeder.extraction_handle is None
+    frame_feeder._throttle()
+    assert not frame_feeder.suspended
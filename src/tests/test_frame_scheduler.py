@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Name: Video2X Frame Scheduler Tests
+Author: K4YT3X
+Date Created: October 17, 2026
+Last Modified: October 17, 2026
+"""
+
+# local imports
+from frame_reclaimer import FrameReclaimer
+from upscaler import Upscaler
+import frame_scheduler
+
+# built-in imports
+import shutil
+import subprocess
+import threading
+import time
+
+# third-party imports
+import pytest
+
+
+class FakeProcess:
+    """ a driver process that has already exited
+    """
+
+    def __init__(self, return_code):
+        self.return_code = return_code
+        self.pid = 0
+        self.args = ['driver']
+
+    def wait(self):
+        return self.return_code
+
+    def terminate(self):
+        pass
+
+
+class FakeFfmpeg:
+    """ scales images by copying them
+    """
+
+    def scale_image(self, input_image, output_image, resolution):
+        shutil.copyfile(input_image, output_image)
+        return FakeProcess(0)
+
+
+def create_upscaler(tmp_path, launch_driver):
+    upscaler = Upscaler(None, None, {}, {})
+    upscaler.driver = 'waifu2x_ncnn_vulkan'
+    upscaler.scale_width, upscaler.scale_height = 64, 64
+    upscaler.speculative_execution = False
+    upscaler.frame_encoder = None
+    upscaler.extracted_frames = tmp_path / 'extracted'
+    upscaler.upscaled_frames = tmp_path / 'upscaled'
+    upscaler.extracted_frames.mkdir()
+    upscaler.upscaled_frames.mkdir()
+    upscaler._launch_driver = launch_driver
+    upscaler.frame_reclaimer = FrameReclaimer()
+    upscaler.frame_reclaimer.start()
+    return upscaler
+
+
+def upscale_frames(upscaler, frames, corrupt_frames=()):
+    """ put frames into a frame scheduler with one worker and wait for it to finish
+
+    Arguments:
+        upscaler {Upscaler} -- upscaler the frames belong to
+        frames {int} -- number of frames, all in one batch
+
+    Keyword Arguments:
+        corrupt_frames {tuple} -- indices of the frames the driver fails on (default: {()})
+
+    Returns:
+        FrameScheduler -- the finished frame scheduler
+    """
+    scheduler = frame_scheduler.FrameScheduler(upscaler, 1, FakeFfmpeg(), frames)
+    for frame_index in range(1, frames + 1):
+        frame = upscaler.extracted_frames / f'extracted_{frame_index}.png'
+        frame.write_bytes(b'corrupt' if frame_index in corrupt_frames else b'frame')
+        scheduler.put(frame_index, [frame])
+
+    scheduler.start()
+    scheduler.finish()
+    scheduler.join()
+    upscaler.frame_reclaimer.stop()
+    return scheduler
+
+
+def copy_frames(input_directory, output_directory, address=None):
+    # the driver fails on the whole batch if any of its frames is corrupt
+    frames = list(input_directory.iterdir())
+    if any(frame.read_bytes() == b'corrupt' for frame in frames):
+        return FakeProcess(1)
+    for frame in frames:
+        shutil.copyfile(frame, output_directory / frame.name)
+    return FakeProcess(0)
+
+
+@pytest.fixture(autouse=True)
+def no_retry_delay(monkeypatch):
+    monkeypatch.setattr(frame_scheduler, 'RETRY_DELAY', 0)
+
+
+def test_all_frames_are_upscaled(tmp_path):
+    upscaler = create_upscaler(tmp_path, copy_frames)
+    scheduler = upscale_frames(upscaler, 8)
+
+    assert scheduler.exception is None
+    assert upscaler.total_frames_upscaled == 8
+    assert sorted(frame.name for frame in upscaler.upscaled_frames.iterdir()) == sorted(f'extracted_{i}.png' for i in range(1, 9))
+    assert not list(upscaler.extracted_frames.iterdir())
+
+
+def test_corrupt_frame_in_first_batch_is_quarantined(tmp_path):
+    upscaler = create_upscaler(tmp_path, copy_frames)
+
+    # the first half of the first batch fails before any batch has been upscaled
+    scheduler = upscale_frames(upscaler, 8, corrupt_frames=(1,))
+
+    assert scheduler.exception is None
+    assert upscaler.quarantined_frames == [1]
+    assert upscaler.total_frames_upscaled == 8
+    assert len(list(upscaler.upscaled_frames.iterdir())) == 8
+
+
+def test_broken_driver_stops_the_job(tmp_path):
+    upscaler = create_upscaler(tmp_path, lambda input_directory, output_directory, address=None: FakeProcess(1))
+    scheduler = upscale_frames(upscaler, 4)
+
+    assert isinstance(scheduler.exception, subprocess.CalledProcessError)
+    assert upscaler.quarantined_frames == []
+
+    # frames that have not been upscaled are put back for resumed jobs
+    assert len(list(upscaler.extracted_frames.glob('extracted_*'))) == 4
+
+
+class HangingProcess:
+    """ a driver process that runs until it is terminated
+    """
+
+    def __init__(self):
+        self.pid = 0
+        self.args = ['driver']
+        self.terminated = threading.Event()
+
+    def wait(self):
+        self.terminated.wait(10)
+        return -15
+
+    def terminate(self):
+        self.terminated.set()
+
+
+def test_copy_of_straggling_batch_is_moved_into_place_before_it_is_finished(tmp_path, monkeypatch):
+    monkeypatch.setattr(frame_scheduler, 'STRAGGLER_INTERVAL', 0.01)
+
+    # the first driver run on frame 1 hangs, its copy on the other worker finishes
+    # the other frames are only upscaled once frame 1 is running, so that frame 1 is left to be copied
+    hanging = threading.Event()
+
+    def launch_driver(input_directory, output_directory, address=None):
+        if (input_directory / 'extracted_1.png').is_file() and not hanging.is_set():
+            hanging.set()
+            return HangingProcess()
+        hanging.wait(10)
+        return copy_frames(input_directory, output_directory)
+
+    upscaler = create_upscaler(tmp_path, launch_driver)
+    upscaler.speculative_execution = True
+    scheduler = frame_scheduler.FrameScheduler(upscaler, 2, FakeFfmpeg(), 1)
+
+    # the copy takes a while to move its frames into place
+    move_upscaled_frames = scheduler._move_upscaled_frames
+
+    def slow_move_upscaled_frames(output_directory):
+        time.sleep(0.2)
+        move_upscaled_frames(output_directory)
+
+    # frames must be in place once their batch is finished
+    missing_frames = []
+    finish_batch = scheduler._finish_batch
+
+    def checked_finish_batch(batch):
+        missing_frames.extend(frame_index for frame_index, frame in batch if not (upscaler.upscaled_frames / frame.name).is_file())
+        finish_batch(batch)
+
+    scheduler._move_upscaled_frames = slow_move_upscaled_frames
+    scheduler._finish_batch = checked_finish_batch
+
+    for frame_index in range(1, 4):
+        frame = upscaler.extracted_frames / f'extracted_{frame_index}.png'
+        frame.write_bytes(b'frame')
+        scheduler.put(frame_index, [frame])
+    scheduler.start()
+    scheduler.finish()
+    scheduler.join()
+    upscaler.frame_reclaimer.stop()
+
+    assert scheduler.exception is None
+    assert upscaler.stragglers_overtaken == 1
+    assert missing_frames == []
+    assert upscaler.total_frames_upscaled == 3
+
+
+def test_tiled_frames_are_pending_as_one_frame(tmp_path):
+    upscaler = create_upscaler(tmp_path, copy_frames)
+    scheduler = frame_scheduler.FrameScheduler(upscaler, 1, FakeFfmpeg(), 2)
+
+    # the frame feeder compares pending frames, not tiles, against the pipeline window
+    for frame_index in range(1, 3):
+        tiles = [upscaler.extracted_frames / f'tile_{frame_index}_{tile_index}.png' for tile_index in range(3)]
+        for tile in tiles:
+            tile.write_bytes(b'tile')
+        scheduler.put(frame_index, tiles)
+    assert scheduler.pending_frames == 2
+
+    scheduler.start()
+    scheduler.finish()
+    scheduler.join()
+    upscaler.frame_reclaimer.stop()
+
+    assert scheduler.exception is None
+    assert scheduler.pending_frames == 0
+    assert upscaler.total_frames_upscaled == 2
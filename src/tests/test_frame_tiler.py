@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Name: Video2X Frame Tiler Tests
+Author: K4YT3X
+Date Created: October 17, 2026
+Last Modified: October 17, 2026
+"""
+
+# local imports
+from frame_tiler import FrameTiler
+
+# built-in imports
+import io
+
+# third-party imports
+from PIL import Image
+import numpy
+
+
+def save_frame(path, pixels):
+    Image.fromarray(numpy.asarray(pixels, dtype=numpy.uint8), 'RGB').save(path)
+    return path
+
+
+def upscale(path, output_path, ratio):
+    with Image.open(path) as image:
+        image.resize((image.width * ratio, image.height * ratio), Image.NEAREST).save(output_path)
+
+
+def test_only_changed_tiles_are_split_off(tmp_path):
+    background = numpy.full((64, 64, 3), 128)
+    changed = background.copy()
+    changed[40:48, 8:16] = 0
+
+    frame_tiler = FrameTiler(32, 4, 1.0, 0.5)
+
+    # the first frame is upscaled whole, an unchanged frame has no tiles to upscale
+    assert frame_tiler.split(1, save_frame(tmp_path / 'extracted_1.png', background)) is None
+    assert frame_tiler.split(2, save_frame(tmp_path / 'extracted_2.png', background)) == []
+
+    tiles = frame_tiler.split(3, save_frame(tmp_path / 'extracted_3.png', changed))
+    assert tiles == [tmp_path / 'tile_3_0.png']
+
+    # the bottom left tile with its padding, cut off at the edges of the frame
+    assert frame_tiler.tiled_frames[3] == [((0, 32, 32, 64), (0, 28, 36, 64))]
+    with Image.open(tiles[0]) as tile:
+        assert tile.size == (36, 36)
+
+
+def test_frames_with_too_many_changes_are_upscaled_whole(tmp_path):
+    frame_tiler = FrameTiler(32, 4, 1.0, 0.5)
+    frame_tiler.split(1, save_frame(tmp_path / 'extracted_1.png', numpy.zeros((64, 64, 3))))
+    assert frame_tiler.split(2, save_frame(tmp_path / 'extracted_2.png', numpy.full((64, 64, 3), 255))) is None
+
+
+def test_composite_pastes_upscaled_tiles(tmp_path):
+    background = numpy.full((64, 64, 3), 128)
+    changed = background.copy()
+    changed[40:48, 8:16] = 0
+
+    frame_tiler = FrameTiler(32, 4, 1.0, 0.5)
+    frame_tiler.split(1, save_frame(tmp_path / 'extracted_1.png', background))
+    tiles = frame_tiler.split(2, save_frame(tmp_path / 'extracted_2.png', changed))
+
+    upscaled_frames = tmp_path / 'upscaled'
+    upscaled_frames.mkdir()
+    upscale(tmp_path / 'extracted_1.png', upscaled_frames / 'extracted_1.png', 2)
+    upscale(tiles[0], upscaled_frames / tiles[0].name, 2)
+
+    frame = frame_tiler.composite(2, (upscaled_frames / 'extracted_1.png').read_bytes(), upscaled_frames)
+
+    expected = numpy.asarray(Image.fromarray(numpy.asarray(changed, dtype=numpy.uint8)).resize((128, 128), Image.NEAREST))
+    with Image.open(io.BytesIO(frame)) as image:
+        assert numpy.array_equal(numpy.asarray(image), expected)
+
+    # upscaled tiles are deleted once they have been composited
+    assert not list(upscaled_frames.glob('tile_*'))
+    assert 2 not in frame_tiler.tiled_frames
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Name: Video2X Job Ledger Tests
+Author: K4YT3X
+Date Created: October 17, 2026
+Last Modified: October 17, 2026
+"""
+
+# local imports
+from job_ledger import JobLedger
+
+FINGERPRINT = {'size': 1024, 'mtime': 1, 'segment_start_time': None, 'segment_frames': None}
+
+
+def test_marked_frames_survive_saving_and_loading(tmp_path):
+    job_ledger = JobLedger(tmp_path)
+    job_ledger.reset(FINGERPRINT)
+    for frame_index in [1, 8, 9, 1000]:
+        job_ledger.mark('upscaled', frame_index)
+    job_ledger.mark('duplicate', 9)
+    job_ledger.complete_stage('extracted', frames=1000)
+
+    loaded_ledger = JobLedger(tmp_path)
+    assert loaded_ledger.load(FINGERPRINT)
+    assert loaded_ledger.get_frames('upscaled') == [1, 8, 9, 1000]
+    assert loaded_ledger.get_frames('duplicate') == [9]
+    assert loaded_ledger.is_marked('upscaled', 8)
+    assert not loaded_ledger.is_marked('upscaled', 2)
+    assert not loaded_ledger.is_marked('upscaled', 5000)
+    assert loaded_ledger.is_completed('extracted')
+    assert loaded_ledger.manifest['frames'] == 1000
+
+
+def test_ledger_of_another_video_is_not_loaded(tmp_path):
+    job_ledger = JobLedger(tmp_path)
+    job_ledger.reset(FINGERPRINT)
+    job_ledger.mark('upscaled', 1)
+    job_ledger.save()
+
+    loaded_ledger = JobLedger(tmp_path)
+    assert not loaded_ledger.load(dict(FINGERPRINT, size=2048))
+    assert loaded_ledger.get_frames('upscaled') == []
+    assert loaded_ledger.manifest['stages'] == []
+
+
+def test_missing_ledger_starts_over(tmp_path):
+    assert not JobLedger(tmp_path / 'job').load(FINGERPRINT)
+
+
+def test_jobs_are_saved_and_loaded(tmp_path):
+    JobLedger.save_job(tmp_path / 'job', {'driver': 'waifu2x_ncnn_vulkan', 'input_path': tmp_path})
+    assert JobLedger.load_job(tmp_path / 'job') == {'driver': 'waifu2x_ncnn_vulkan', 'input_path': str(tmp_path)}
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Name: Video2X Job Server Tests
+Author: K4YT3X
+Date Created: October 17, 2026
+Last Modified: October 17, 2026
+"""
+
+# local imports
+from exceptions import ArgumentError
+from job_server import JobServer
+import job_server
+
+# built-in imports
+import http.client
+import json
+import pathlib
+import socket
+import threading
+import time
+
+# third-party imports
+import pytest
+
+
+class FakeUpscaler:
+    """ upscales the frames of a job once the job is allowed to finish
+    """
+
+    def __init__(self, job, finish):
+        self.input_path = pathlib.Path(job['input'])
+        self.output_path = pathlib.Path(job['output'])
+        self.driver = job.get('driver', 'waifu2x_caffe')
+        self.driver_settings = {}
+        self.ffmpeg_settings = {}
+        self.driver_checked = False
+        self.progress_listeners = []
+        self.finish = finish
+        self.stopped = threading.Event()
+
+    def _check_arguments(self):
+        if not self.input_path.is_absolute():
+            raise ArgumentError('input path must be absolute')
+
+    def run(self):
+        while not self.finish.is_set():
+            if self.stopped.wait(0.01):
+                raise SystemExit
+        for frame in range(1, 4):
+            for listener in self.progress_listeners:
+                listener(frame, 3)
+
+    def stop(self):
+        self.stopped.set()
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """ HTTP connection over a Unix socket
+    """
+
+    def __init__(self, socket_path):
+        super().__init__('localhost', timeout=10)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(str(self.socket_path))
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    """ start a job server upscaling one job at a time on a Unix socket
+
+    Yields:
+        tuple -- function sending requests to the server and the event letting jobs finish
+    """
+    monkeypatch.setattr(job_server, 'PROGRESS_INTERVAL', 0.01)
+    finish = threading.Event()
+    server = JobServer(lambda job: FakeUpscaler(job, finish), 1)
+    socket_path = tmp_path / 'video2x.sock'
+    thread = threading.Thread(target=server.serve, args=(None, None, socket_path))
+    thread.start()
+    while server.server is None or not socket_path.exists():
+        time.sleep(0.01)
+
+    def request(method, path, body=None):
+        connection = UnixHTTPConnection(socket_path)
+        try:
+            connection.request(method, path, body=None if body is None else json.dumps(body).encode('utf-8'))
+            response = connection.getresponse()
+            lines = [json.loads(line) for line in response.read().decode('utf-8').splitlines()]
+        finally:
+            connection.close()
+
+        # progress is streamed as one JSON line per status
+        return response.status, lines if path.endswith('/progress') else lines[0]
+
+    yield request, finish
+
+    finish.set()
+    server.stop()
+    thread.join()
+    assert not socket_path.exists()
+
+
+def wait_for_status(request, job_id, status):
+    for attempt in range(1000):
+        if request('GET', f'/jobs/{job_id}')[1]['status'] == status:
+            return
+        time.sleep(0.01)
+    raise AssertionError(f'job {job_id} is not {status}')
+
+
+@pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason='Unix sockets are not available')
+def test_jobs_are_queued_and_cancelled(server):
+    request, finish = server
+
+    response_status, running_job = request('POST', '/jobs', {'input': '/videos/a.mp4', 'output': '/videos/a_2x.mp4'})
+    assert response_status == 201
+    response_status, queued_job = request('POST', '/jobs', {'input': '/videos/b.mp4', 'output': '/videos/b_2x.mp4'})
+    assert response_status == 201
+
+    # one job is upscaled at a time
+    wait_for_status(request, running_job['id'], 'running')
+    response_status, status = request('GET', f'/jobs/{queued_job["id"]}')
+    assert (response_status, status['status'], status['input']) == (200, 'queued', '/videos/b.mp4')
+    assert [status['status'] for status in request('GET', '/jobs')[1]] == ['running', 'queued']
+
+    # queued jobs are cancelled right away, running jobs once their upscaler has stopped
+    assert request('DELETE', f'/jobs/{queued_job["id"]}')[1]['status'] == 'cancelled'
+    assert request('DELETE', f'/jobs/{running_job["id"]}')[0] == 200
+    wait_for_status(request, running_job['id'], 'cancelled')
+
+    assert request('DELETE', '/jobs/unknown')[0] == 404
+    assert request('GET', '/jobs/unknown')[0] == 404
+
+
+@pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason='Unix sockets are not available')
+def test_progress_is_streamed_until_the_job_ends(server):
+    request, finish = server
+
+    job_id = request('POST', '/jobs', {'input': '/videos/a.mp4', 'output': '/videos/a_2x.mp4'})[1]['id']
+    wait_for_status(request, job_id, 'running')
+    finish.set()
+
+    response_status, statuses = request('GET', f'/jobs/{job_id}/progress')
+    assert response_status == 200
+    assert all(status['status'] == 'running' for status in statuses[:-1])
+    assert (statuses[-1]['status'], statuses[-1]['frames_upscaled'], statuses[-1]['total_frames']) == ('finished', 3, 3)
+
+
+@pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason='Unix sockets are not available')
+def test_invalid_jobs_are_rejected(server):
+    request, finish = server
+
+    assert request('POST', '/jobs', ['/videos/a.mp4'])[0] == 400
+    assert request('POST', '/jobs', {'output': '/videos/a_2x.mp4'})[0] == 400
+
+    response_status, response = request('POST', '/jobs', {'input': 'a.mp4', 'output': '/videos/a_2x.mp4'})
+    assert response_status == 400
+    assert 'ArgumentError' in response['error']
+    assert request('GET', '/jobs')[1] == []
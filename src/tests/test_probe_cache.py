@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Name: Video2X Probe Cache Tests
+Author: K4YT3X
+Date Created: October 17, 2026
+Last Modified: October 17, 2026
+"""
+
+# local imports
+from probe_cache import ProbeCache
+from wrappers.ffmpeg import Ffmpeg
+
+# built-in imports
+import json
+import os
+import pathlib
+
+
+def test_information_is_kept_for_later_runs(tmp_path):
+    input_video = tmp_path / 'input.mp4'
+    input_video.write_bytes(b'video')
+    database_path = tmp_path / 'cache' / 'probes.db'
+
+    probe_cache = ProbeCache(database_path)
+    key = ProbeCache.get_key(input_video, pathlib.Path('ffprobe'))
+    assert probe_cache.get(key) is None
+    probe_cache.put(key, '{"streams": []}')
+
+    assert ProbeCache(database_path).get(key) == '{"streams": []}'
+
+    # information read by another FFprobe binary is not used
+    assert ProbeCache(database_path).get(ProbeCache.get_key(input_video, pathlib.Path('other/ffprobe'))) is None
+
+
+def test_changed_videos_are_probed_again(tmp_path):
+    input_video = tmp_path / 'input.mp4'
+    input_video.write_bytes(b'video')
+    database_path = tmp_path / 'probes.db'
+
+    probe_cache = ProbeCache(database_path)
+    probe_cache.put(ProbeCache.get_key(input_video, pathlib.Path('ffprobe')), '{"streams": []}')
+
+    input_video.write_bytes(b'another video')
+    video_stat = input_video.stat()
+    os.utime(input_video, ns=(video_stat.st_atime_ns, video_stat.st_mtime_ns + 1000000000))
+    key = ProbeCache.get_key(input_video, pathlib.Path('ffprobe'))
+    assert probe_cache.get(key) is None
+    assert ProbeCache(database_path).get(key) is None
+
+    # only the latest information of a path is kept
+    probe_cache.put(key, '{"streams": [{}]}')
+    assert ProbeCache(database_path).get(key) == '{"streams": [{}]}'
+
+
+def test_ffmpeg_reads_probed_videos_from_the_cache(tmp_path):
+    input_video = tmp_path / 'input.mp4'
+    input_video.write_bytes(b'video')
+
+    # FFprobe cannot be run from this directory, the information has to come from the cache
+    fm = Ffmpeg({'ffmpeg_path': tmp_path / 'missing'}, 'png')
+    fm.probe_cache = ProbeCache()
+    video_info = {'streams': [{'codec_type': 'video', 'pix_fmt': 'yuv420p'}]}
+    fm.probe_cache.put(ProbeCache.get_key(input_video, fm.ffmpeg_probe_binary), json.dumps(video_info))
+
+    assert fm.get_video_info(input_video) == video_info
+
+    # callers get their own copy
+    fm.get_video_info(input_video)['streams'].clear()
+    assert fm.get_video_info(input_video) == video_info
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Name: Video2X Process Supervisor Tests
+Author: K4YT3X
+Date Created: October 17, 2026
+Last Modified: October 17, 2026
+"""
+
+# local imports
+from process_supervisor import ProcessSupervisor
+
+# built-in imports
+import subprocess
+import sys
+
+
+def test_exit_events_carry_the_return_code():
+    supervisor = ProcessSupervisor()
+    process = subprocess.Popen([sys.executable, '-c', 'import sys; sys.exit(3)'])
+    supervisor.watch(process)
+
+    event = supervisor.next_event()
+    assert event[:3] == ('exit', process, 3)
+    assert event[3] >= 0
+
+
+def test_processes_are_watched_once():
+    supervisor = ProcessSupervisor()
+    process = subprocess.Popen([sys.executable, '-c', ''])
+    supervisor.watch(process)
+    supervisor.watch(process)
+
+    assert supervisor.next_event()[0] == 'exit'
+    supervisor.notify('marker')
+    assert supervisor.next_event() == ('notify', 'marker')
+
+
+def test_cancel_wakes_up_the_waiting_thread():
+    supervisor = ProcessSupervisor()
+    assert not supervisor.is_cancelled()
+    supervisor.cancel()
+    assert supervisor.is_cancelled()
+    assert supervisor.next_event() == ('cancel',)
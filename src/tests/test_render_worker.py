@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Name: Video2X Render Worker Tests
+Author: K4YT3X
+Date Created: October 17, 2026
+Last Modified: October 17, 2026
+"""
+
+# local imports
+from remote_batch import RemoteBatch
+from render_nodes import RenderNodes
+from render_worker import RenderWorker
+import remote_batch
+import render_nodes
+import render_worker
+
+# built-in imports
+import shutil
+import threading
+import time
+
+# third-party imports
+import pytest
+
+JOB = {'driver': 'waifu2x_ncnn_vulkan',
+       'driver_settings': {},
+       'scale_ratio': 2,
+       'scale_width': None,
+       'scale_height': None,
+       'image_format': 'png',
+       'bit_depth': 8}
+
+
+class FakeDriver:
+    """ a driver process copying frames, or hanging until it is terminated
+    """
+
+    def __init__(self, input_directory, output_directory, hang):
+        self.pid = 0
+        self.args = ['driver']
+        self.input_directory = input_directory
+        self.output_directory = output_directory
+        self.hang = hang
+        self.terminated = threading.Event()
+
+    def wait(self):
+        if self.hang:
+            self.terminated.wait(10)
+            return -15
+        for frame in self.input_directory.iterdir():
+            shutil.copyfile(frame, self.output_directory / frame.name)
+        return 0
+
+    def terminate(self):
+        self.terminated.set()
+
+
+@pytest.fixture(autouse=True)
+def short_intervals(monkeypatch):
+    monkeypatch.setattr(render_nodes, 'HEARTBEAT_INTERVAL', 0.1)
+    monkeypatch.setattr(remote_batch, 'HEARTBEAT_INTERVAL', 0.1)
+    monkeypatch.setattr(render_worker, 'LEASE_INTERVAL', 0.1)
+
+
+def start_worker(tmp_path, name, launch_driver):
+    """ start a video2x worker on an ephemeral port of 127.0.0.1
+
+    Arguments:
+        tmp_path {pathlib.Path} -- directory of the test
+        name {str} -- name of the worker's directory
+        launch_driver {callable} -- replaces Upscaler._launch_driver of the worker's batches
+
+    Returns:
+        tuple -- the worker, its serving thread and its address
+    """
+    worker = RenderWorker({'waifu2x_ncnn_vulkan': {'path': 'waifu2x-ncnn-vulkan'}, 'ffmpeg': {}}, 1, 10, tmp_path / name)
+
+    # batches are upscaled with the settings of their job, but by the given driver
+    create_upscaler = worker._create_upscaler
+
+    def create_job_upscaler(job):
+        upscaler = create_upscaler(job)
+        upscaler._launch_driver = launch_driver
+        return upscaler
+
+    worker._create_upscaler = create_job_upscaler
+    thread = threading.Thread(target=worker.serve, args=('127.0.0.1', 0))
+    thread.start()
+    while worker.server is None:
+        time.sleep(0.01)
+    return worker, thread, f'127.0.0.1:{worker.server.server_address[1]}'
+
+
+def stop_worker(worker, thread):
+    worker.stop()
+    thread.join()
+
+
+def create_batch(tmp_path, frames):
+    input_directory = tmp_path / 'input'
+    output_directory = tmp_path / 'output'
+    input_directory.mkdir()
+    output_directory.mkdir()
+    for frame_index in range(1, frames + 1):
+        (input_directory / f'extracted_{frame_index}.png').write_bytes(f'frame {frame_index}'.encode())
+    return input_directory, output_directory
+
+
+def test_batch_of_lost_worker_is_sent_to_another_worker(tmp_path):
+    # the first worker never finishes, the second one copies the frames
+    hanging_driver = threading.Event()
+
+    def hang(input_directory, output_directory, address=None):
+        hanging_driver.set()
+        return FakeDriver(input_directory, output_directory, hang=True)
+
+    lost_worker, lost_thread, lost_address = start_worker(tmp_path, 'lost', hang)
+    worker, thread, address = start_worker(tmp_path, 'worker', lambda input_directory, output_directory, address=None: FakeDriver(input_directory, output_directory, hang=False))
+
+    nodes = RenderNodes([lost_address, address], 1)
+    nodes.start()
+    assert nodes.get_slots() == [lost_address, address]
+
+    input_directory, output_directory = create_batch(tmp_path, 4)
+    batch = RemoteBatch(nodes, lost_address, JOB, input_directory, output_directory)
+    batch_thread = threading.Thread(target=batch.wait)
+    batch_thread.start()
+
+    # kill the first worker while it is upscaling the batch
+    assert hanging_driver.wait(10)
+    stop_worker(lost_worker, lost_thread)
+
+    batch_thread.join(10)
+    nodes.stop()
+    stop_worker(worker, thread)
+
+    assert batch.returncode == 0
+    assert batch.address == address
+    assert sorted(frame.name for frame in output_directory.iterdir()) == sorted(frame.name for frame in input_directory.iterdir())
+    assert (output_directory / 'extracted_3.png').read_bytes() == b'frame 3'
+
+
+def test_failing_driver_finishes_the_batch(tmp_path):
+    def fail(input_directory, output_directory, address=None):
+        raise RuntimeError('driver wrapper failed')
+
+    worker, thread, address = start_worker(tmp_path, 'worker', fail)
+    nodes = RenderNodes([address], 1)
+    nodes.start()
+
+    # the batch fails instead of being reported as upscaling forever
+    input_directory, output_directory = create_batch(tmp_path, 2)
+    batch = RemoteBatch(nodes, address, JOB, input_directory, output_directory)
+    assert batch.wait() == 1
+
+    nodes.stop()
+    stop_worker(worker, thread)
+
+
+def test_frames_of_cancelled_batch_are_unknown(tmp_path):
+    worker = RenderWorker({}, 1, 10, tmp_path)
+    batch_directory = tmp_path / 'batch'
+    (batch_directory / 'output').mkdir(parents=True)
+    (batch_directory / 'output' / 'extracted_1.png').write_bytes(b'frame')
+    worker.batches['batch'] = {'directory': batch_directory,
+                               'status': 'finished',
+                               'return_code': 0,
+                               'process': None,
+                               'last_seen': time.time(),
+                               'cancelled': threading.Event()}
+
+    assert worker.get_frames('batch') == [batch_directory / 'output' / 'extracted_1.png']
+    assert worker.cancel('batch')
+    assert worker.get_frames('batch') is None
+    assert not batch_directory.exists()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Name: Video2X Upscale Cache Tests
+Author: K4YT3X
+Date Created: October 17, 2026
+Last Modified: October 17, 2026
+"""
+
+# local imports
+from upscale_cache import UpscaleCache
+
+# built-in imports
+import os
+
+
+def create_frame(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return path
+
+
+def test_stored_frames_are_fetched(tmp_path):
+    upscale_cache = UpscaleCache(tmp_path / 'cache', 1024 ** 2, {'driver': 'waifu2x_ncnn_vulkan', 'scale_ratio': 2})
+    key = upscale_cache.get_key(create_frame(tmp_path / 'extracted' / 'extracted_1.png', b'source'))
+    assert not upscale_cache.fetch(key, tmp_path / 'upscaled' / 'extracted_1.png')
+
+    upscale_cache.store(key, create_frame(tmp_path / 'upscaled' / 'extracted_1.png', b'upscaled'))
+    assert upscale_cache.fetch(key, tmp_path / 'extracted_7.png')
+    assert (tmp_path / 'extracted_7.png').read_bytes() == b'upscaled'
+    assert (upscale_cache.hits, upscale_cache.misses) == (1, 1)
+
+
+def test_keys_depend_on_settings(tmp_path):
+    frame = create_frame(tmp_path / 'extracted_1.png', b'source')
+    ratio_2 = UpscaleCache(tmp_path / 'cache', 1024 ** 2, {'scale_ratio': 2})
+    ratio_3 = UpscaleCache(tmp_path / 'cache', 1024 ** 2, {'scale_ratio': 3})
+    assert ratio_2.get_key(frame) != ratio_3.get_key(frame)
+    assert ratio_2.get_key(frame) == UpscaleCache(tmp_path / 'cache', 1024 ** 2, {'scale_ratio': 2}).get_key(frame)
+
+
+def test_normalize_settings_drops_performance_settings():
+    settings = {'path': '/opt/waifu2x', 'g': 0, 'j': '1:2:2', 'n': 2, 'x': False, 'm': None}
+    assert UpscaleCache.normalize_settings('waifu2x_ncnn_vulkan', settings) == {'n': 2}
+
+    # only the path is dropped for drivers without a list of performance settings
+    assert UpscaleCache.normalize_settings('plugin_driver', settings) == {'g': 0, 'j': '1:2:2', 'n': 2}
+
+
+def test_prune_evicts_least_recently_used_entries(tmp_path):
+    upscale_cache = UpscaleCache(tmp_path / 'cache', 20)
+    for index, key in enumerate(['aa01', 'bb02', 'cc03']):
+        upscale_cache.store(key, create_frame(tmp_path / f'extracted_{index}.png', b'0123456789'))
+        os.unlink(tmp_path / f'extracted_{index}.png')
+        entry = tmp_path / 'cache' / key[:2] / f'{key}.png'
+        os.utime(entry, (1000 + index, 1000 + index))
+
+    # fetching an entry counts as using it
+    assert upscale_cache.fetch('aa01', tmp_path / 'fetched.png')
+
+    assert upscale_cache.prune() == (1, 10)
+    assert not (tmp_path / 'cache' / 'bb' / 'bb02.png').exists()
+    assert upscale_cache.stats()['entries'] == 2
+
+
+def test_fetch_replaces_frames_left_behind(tmp_path):
+    upscale_cache = UpscaleCache(tmp_path / 'cache', 1024 ** 2)
+    upscale_cache.store('aa01', create_frame(tmp_path / 'stored.png', b'upscaled'))
+
+    # a resumed job may find a frame upscaled by its earlier attempt in place
+    upscaled_frame = create_frame(tmp_path / 'upscaled' / 'extracted_1.png', b'left behind')
+    assert upscale_cache.fetch('aa01', upscaled_frame)
+    assert upscaled_frame.read_bytes() == b'upscaled'
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Name: Video2X Upscaler Tests
+Author: K4YT3X
+Date Created: October 17, 2026
+Last Modified: October 17, 2026
+"""
+
+# local imports
+from job_ledger import JobLedger
+from upscaler import Upscaler
+
+# third-party imports
+import pytest
+
+
+def create_resumed_upscaler(tmp_path, frames, upscaled_frames):
+    """ create an upscaler for a video whose earlier attempt upscaled some frames
+
+    Arguments:
+        tmp_path {pathlib.Path} -- directory of the test
+        frames {int} -- number of frames of the video
+        upscaled_frames {list} -- indices of the frames recorded as upscaled
+
+    Returns:
+        Upscaler -- upscaler with the job ledger of the earlier attempt opened
+    """
+    input_video = tmp_path / 'input.mp4'
+    input_video.write_bytes(b'video')
+
+    upscaler = Upscaler(input_video, tmp_path / 'output.mp4', {}, {})
+    upscaler.job_directory = tmp_path / 'job'
+    upscaler.extracted_frames = upscaler.job_directory / 'extracted'
+    upscaler.upscaled_frames = upscaler.job_directory / 'upscaled'
+    upscaler.extracted_frames.mkdir(parents=True, exist_ok=True)
+    upscaler.upscaled_frames.mkdir(parents=True, exist_ok=True)
+
+    input_video_status = input_video.stat()
+    job_ledger = JobLedger(upscaler.job_directory)
+    job_ledger.reset({'size': input_video_status.st_size,
+                      'mtime': input_video_status.st_mtime_ns,
+                      'segment_start_time': None,
+                      'segment_frames': None})
+    for frame_index in upscaled_frames:
+        job_ledger.mark('upscaled', frame_index)
+    job_ledger.complete_stage('extracted', frames=frames)
+
+    upscaler._open_job_ledger(input_video)
+    return upscaler
+
+
+def test_resume_drops_upscaled_frames_not_in_the_ledger(tmp_path):
+    job_directory = tmp_path / 'job'
+    for frame_index in [1, 2]:
+        (job_directory / 'upscaled').mkdir(parents=True, exist_ok=True)
+        (job_directory / 'upscaled' / f'extracted_{frame_index}.png').write_bytes(b'upscaled')
+
+    # frame 2 was upscaled after the ledger was last saved
+    upscaler = create_resumed_upscaler(tmp_path, 2, [1])
+    assert (upscaler.upscaled_frames / 'extracted_1.png').is_file()
+    assert not (upscaler.upscaled_frames / 'extracted_2.png').exists()
+
+
+def test_resume_looks_for_frames_in_the_intermediate_format(tmp_path):
+    job_directory = tmp_path / 'job'
+    (job_directory / 'extracted').mkdir(parents=True)
+    for frame_index in [2, 3]:
+        (job_directory / 'extracted' / f'extracted_{frame_index}.bmp').write_bytes(b'extracted')
+
+    upscaler = create_resumed_upscaler(tmp_path, 3, [1])
+    assert upscaler.job_ledger.is_completed('extracted')
+
+    # the driver's intermediate format is chosen after the ledger has been opened
+    upscaler.image_format = 'bmp'
+    upscaler._check_extracted_frames()
+    assert upscaler.job_ledger.is_completed('extracted')
+
+    (job_directory / 'extracted' / 'extracted_3.bmp').unlink()
+    upscaler._check_extracted_frames()
+    assert not upscaler.job_ledger.is_completed('extracted')
+
+
+class FakeFfmpeg:
+    """ knows the bit depths of a few pixel formats
+    """
+
+    def __init__(self):
+        self.image_format = 'png'
+
+    def get_bit_depths(self):
+        return {'yuv420p': 8, 'yuv420p10le': 10}
+
+
+def choose_intermediate_format(driver, pixel_format, tile_upscaling=False):
+    upscaler = Upscaler(None, None, {}, {'video_to_frames': {'output_options': {'-pix_fmt': 'rgba64be'}}})
+    upscaler.driver = driver
+    upscaler.scale_ratio = 2
+    upscaler.tile_upscaling = tile_upscaling
+    upscaler._choose_intermediate_format(FakeFfmpeg(), {'pix_fmt': pixel_format})
+    return upscaler.image_format, upscaler.ffmpeg_settings['video_to_frames']['output_options']['-pix_fmt'], upscaler.intermediate_depth
+
+
+def test_intermediate_format_follows_the_driver():
+    assert choose_intermediate_format('waifu2x_caffe', 'yuv420p') == ('bmp', 'rgb24', 8)
+    assert choose_intermediate_format('waifu2x_ncnn_vulkan', 'yuv420p') == ('png', 'rgb24', 8)
+
+    # only drivers keeping 16 bits per channel get 16-bit frames of 10-bit sources
+    assert choose_intermediate_format('waifu2x_caffe', 'yuv420p10le') == ('png', 'rgb48be', 16)
+    assert choose_intermediate_format('waifu2x_ncnn_vulkan', 'yuv420p10le') == ('png', 'rgb24', 8)
+
+
+def test_tiled_frames_are_extracted_with_8_bits_per_channel():
+    assert choose_intermediate_format('waifu2x_caffe', 'yuv420p10le', tile_upscaling=True) == ('bmp', 'rgb24', 8)
+
+
+def test_intermediate_format_does_not_carry_over_to_the_next_video(tmp_path):
+    ffmpeg_settings = {'video_to_frames': {'output_options': {'-pix_fmt': None}}}
+    upscaler = Upscaler(tmp_path / 'input.mp4', tmp_path / 'output.mp4', {}, ffmpeg_settings)
+    upscaler.preserve_frames = True
+
+    # a video choosing its formats and failing partway
+    def create_temp_directories():
+        upscaler._choose_intermediate_format(FakeFfmpeg(), {'pix_fmt': 'yuv420p'})
+        raise OSError('no space left on device')
+
+    upscaler.create_temp_directories = create_temp_directories
+    with pytest.raises(OSError):
+        upscaler._upscale_video(tmp_path / 'input.mp4', tmp_path / 'output.mp4')
+
+    assert upscaler.ffmpeg_settings is ffmpeg_settings
+    assert ffmpeg_settings['video_to_frames']['output_options']['-pix_fmt'] is None
+    assert upscaler.image_format == 'png'
+    assert upscaler.intermediate_depth is None
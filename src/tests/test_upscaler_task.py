@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Name: Video2X Upscaler Task Tests
+Author: K4YT3X
+Date Created: October 17, 2026
+Last Modified: October 17, 2026
+"""
+
+# local imports
+from upscaler_task import UpscalerTask
+
+# built-in imports
+import asyncio
+import os
+import threading
+
+# third-party imports
+import pytest
+
+# more jobs than the event loop's default executor has threads
+JOBS = min(32, (os.cpu_count() or 1) + 4) + 4
+
+
+class FakeUpscaler:
+    """ blocks in run() like an upscaler does until its videos are upscaled
+    """
+
+    def __init__(self, running, finish):
+        self.running = running
+        self.finish = finish
+        self.stopped = threading.Event()
+        self.progress_listeners = []
+
+    def run(self):
+        self.running.release()
+        while not self.finish.is_set():
+            if self.stopped.wait(0.01):
+                raise SystemExit
+        for listener in self.progress_listeners:
+            listener(1, 1)
+
+    def stop(self):
+        self.stopped.set()
+
+
+async def wait_for_jobs(semaphore, jobs):
+    for job in range(jobs):
+        while not semaphore.acquire(blocking=False):
+            await asyncio.sleep(0.01)
+
+
+async def collect_progress(job):
+    return [event async for event in job.progress()]
+
+
+def test_jobs_run_at_once_and_can_be_cancelled():
+    async def run_jobs():
+        running = threading.Semaphore(0)
+        finish = threading.Event()
+        jobs = [UpscalerTask(FakeUpscaler(running, finish)) for job in range(JOBS)]
+        tasks = [asyncio.create_task(job.run()) for job in jobs]
+
+        # every job is running, none of them waits for a free thread
+        await asyncio.wait_for(wait_for_jobs(running, JOBS), 10)
+
+        tasks[0].cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await tasks[0]
+        assert jobs[0].upscaler.stopped.is_set()
+
+        progress = asyncio.create_task(collect_progress(jobs[1]))
+        await asyncio.sleep(0)
+        finish.set()
+        await asyncio.wait_for(asyncio.gather(*tasks[1:]), 10)
+        assert await progress == [(1, 1)]
+        assert not any(job.upscaler.stopped.is_set() for job in jobs[1:])
+
+    asyncio.run(run_jobs())
+
+
+def test_stopped_upscaler_raises_cancelled_error():
+    async def run_job():
+        job = UpscalerTask(FakeUpscaler(threading.Semaphore(0), threading.Event()))
+        task = asyncio.create_task(job.run())
+        await asyncio.sleep(0.05)
+        job.stop()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert job.finished
+
+    asyncio.run(run_job())
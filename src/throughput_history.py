@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Name: Video2X Throughput History
+Author: K4YT3X
+Date Created: October 17, 2026
+Last Modified: October 17, 2026
+
+Description: This class records how long earlier videos took
+to upscale, so the time later videos take can be predicted.
+"""
+
+# built-in imports
+import contextlib
+import json
+import sqlite3
+import time
+
+# columns of the settings a run is recorded with
+KEY_COLUMNS = ['driver', 'settings', 'processes', 'segments', 'source_width', 'source_height', 'scale_width', 'scale_height']
+
+# columns earlier runs have to match, from the closest match to the loosest
+MATCH_COLUMNS = [KEY_COLUMNS,
+                 ['driver', 'settings', 'processes', 'segments'],
+                 ['driver', 'settings']]
+
+# number of the most recent matching runs a prediction is based on
+RECENT_RUNS = 10
+
+
+class ThroughputHistory:
+    """ Video2X Throughput History
+
+    Every upscaled video is recorded in a SQLite database with
+    the time spent extracting, upscaling and encoding it, keyed
+    by the driver, its settings, the number of processes and
+    the resolution. Throughput is measured in upscaled pixels
+    per second, so runs of other videos predict how long a video
+    takes even if it has a different resolution.
+
+    Runs with the same resolution are preferred, then runs with
+    the same number of processes, then any run with the same
+    driver settings.
+    """
+
+    def __init__(self, database_path):
+        self.database_path = database_path
+
+    @staticmethod
+    def get_key(driver, driver_settings, processes, segments, source_width, source_height, scale_width, scale_height):
+        """ collect the settings that affect how fast a video is upscaled
+
+        Arguments:
+            driver {str} -- name of the driver
+            driver_settings {dict} -- settings of the driver
+            processes {int} -- number of driver processes
+            segments {int} -- number of segments upscaled concurrently
+            source_width {int} -- width of the input video
+            source_height {int} -- height of the input video
+            scale_width {int} -- width of the upscaled video
+            scale_height {int} -- height of the upscaled video
+
+        Returns:
+            dict -- values of KEY_COLUMNS
+        """
+        # the same driver may be installed in different places
+        settings = {key: value for key, value in driver_settings.items()
+                    if key != 'path' and value is not None and value is not False}
+        return {'driver': driver,
+                'settings': json.dumps(settings, sort_keys=True, default=str),
+                'processes': processes,
+                'segments': segments,
+                'source_width': source_width,
+                'source_height': source_height,
+                'scale_width': scale_width,
+                'scale_height': scale_height}
+
+    def record(self, key, frames, stage_times, total_time):
+        """ record an upscaled video
+
+        Arguments:
+            key {dict} -- settings returned by get_key()
+            frames {int} -- number of frames in the video
+            stage_times {dict} -- seconds spent in the extract, upscale and encode stages
+            total_time {float} -- seconds taken to upscale the video
+        """
+        self.database_path.parent.mkdir(parents=True, exist_ok=True)
+        with contextlib.closing(self._connect()) as connection, connection:
+            connection.execute(f'INSERT INTO runs ({", ".join(KEY_COLUMNS)}, finished, frames, extract_time, upscale_time, encode_time, total_time) '
+                               f'VALUES ({", ".join("?" * len(KEY_COLUMNS))}, ?, ?, ?, ?, ?, ?)',
+                               [key[column] for column in KEY_COLUMNS] +
+                               [time.time(), frames, stage_times.get('extract'), stage_times.get('upscale'), stage_times.get('encode'), total_time])
+
+    def predict(self, key):
+        """ predict the throughput of a video from the closest matching earlier runs
+
+        Arguments:
+            key {dict} -- settings returned by get_key()
+
+        Returns:
+            tuple -- upscaled pixels per second and the number of runs it is based on, None if there are no matching runs
+        """
+        if not self.database_path.is_file():
+            return None
+
+        with contextlib.closing(self._connect()) as connection:
+            for columns in MATCH_COLUMNS:
+                pixels, total_time, runs = connection.execute(
+                    'SELECT SUM(frames * scale_width * scale_height), SUM(total_time), COUNT(*) FROM '
+                    f'(SELECT * FROM runs WHERE {" AND ".join(f"{column} = ?" for column in columns)} ORDER BY finished DESC LIMIT ?)',
+                    [key[column] for column in columns] + [RECENT_RUNS]).fetchone()
+                if runs > 0 and total_time > 0:
+                    return pixels / total_time, runs
+
+        return None
+
+    def _connect(self):
+        connection = sqlite3.connect(self.database_path, timeout=30)
+        connection.execute('CREATE TABLE IF NOT EXISTS runs ('
+                           'driver TEXT, settings TEXT, processes INTEGER, segments INTEGER, '
+                           'source_width INTEGER, source_height INTEGER, scale_width INTEGER, scale_height INTEGER, '
+                           'finished REAL, frames INTEGER, extract_time REAL, upscale_time REAL, encode_time REAL, total_time REAL)')
+        return connection
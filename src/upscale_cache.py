@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Name: Video2X Upscale Cache
+Author: K4YT3X
+Date Created: October 17, 2026
+Last Modified: October 17, 2026
+
+Description: This class stores upscaled frames on disk so
+frames that show up again in other videos (e.g. openings and
+endings of a series) do not have to be upscaled again.
+"""
+
+# built-in imports
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+# driver settings that change how fast frames are upscaled
+# but not what the upscaled frames look like
+PERFORMANCE_SETTINGS = {
+    'waifu2x_caffe': ['path', 'gpu', 'batch_size', 'crop_h', 'crop_w', 'crop_size', 'process'],
+    'waifu2x_converter_cpp': ['path', 'png-compression', 'block-size', 'disable-gpu', 'force-OpenCL', 'processor', 'jobs', 'log-level', 'silent'],
+    'waifu2x_ncnn_vulkan': ['path', 'v', 't', 'g', 'j'],
+    'srmd_ncnn_vulkan': ['path', 'v', 't', 'g', 'j']
+}
+
+
+class UpscaleCache:
+    """ Video2X Upscale Cache
+
+    Each entry is keyed by the hash of the extracted frame and
+    of all settings that affect how the frame is upscaled, so
+    changing the driver, its settings or the scale never returns
+    stale frames.
+
+    Entries are hard links to the upscaled frames when possible,
+    so storing a frame costs no extra disk space while the frame
+    is still in the upscaled frames directory. The modification
+    time of an entry is the last time it was used. The least
+    recently used entries are evicted when the cache grows larger
+    than its size limit.
+    """
+
+    def __init__(self, cache_directory, max_size, settings=None):
+        self.cache_directory = cache_directory
+        self.max_size = max_size
+        self.settings_hash = hashlib.blake2b(json.dumps(settings, sort_keys=True, default=str).encode()).digest()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize_settings(driver, driver_settings):
+        """ remove driver settings that do not affect the upscaled frames
+
+        Arguments:
+            driver {str} -- name of the driver
+            driver_settings {dict} -- settings of the driver
+
+        Returns:
+            dict -- driver settings that affect the upscaled frames
+        """
+        return {key: value for key, value in driver_settings.items()
+                if key not in PERFORMANCE_SETTINGS.get(driver, ['path']) and value is not None and value is not False}
+
+    def get_key(self, frame):
+        """ compute the cache key of an extracted frame
+
+        Arguments:
+            frame {pathlib.Path} -- path of the extracted frame
+
+        Returns:
+            str -- cache key of the frame
+        """
+        return hashlib.blake2b(frame.read_bytes(), digest_size=20, key=self.settings_hash).hexdigest()
+
+    def fetch(self, key, upscaled_frame):
+        """ fill in an upscaled frame from the cache
+
+        Arguments:
+            key {str} -- cache key of the frame
+            upscaled_frame {pathlib.Path} -- path to save the upscaled frame to
+
+        Returns:
+            bool -- True if the frame was found in the cache
+        """
+        entry = self._get_entry(key, upscaled_frame.suffix)
+        try:
+            os.utime(entry)
+
+            # an earlier attempt of a resumed job may have left the frame behind
+            with contextlib.suppress(FileNotFoundError):
+                upscaled_frame.unlink()
+            self._link(entry, upscaled_frame)
+
+        # the entry does not exist or has been evicted in the meantime
+        except FileNotFoundError:
+            self.misses += 1
+            return False
+
+        self.hits += 1
+        return True
+
+    def store(self, key, upscaled_frame):
+        """ add an upscaled frame to the cache
+
+        Arguments:
+            key {str} -- cache key of the frame
+            upscaled_frame {pathlib.Path} -- path of the upscaled frame
+        """
+        entry = self._get_entry(key, upscaled_frame.suffix)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+
+        # another upscaler may have stored the same frame already
+        with contextlib.suppress(FileExistsError):
+            self._link(upscaled_frame, entry)
+
+    def stats(self):
+        """ collect statistics of the cache
+
+        Returns:
+            dict -- number of entries, total size in bytes, last use times of the oldest and newest entries
+        """
+        entries = self._list_entries()
+        return {'entries': len(entries),
+                'size': sum(size for entry, size, last_used in entries),
+                'oldest': min((last_used for entry, size, last_used in entries), default=None),
+                'newest': max((last_used for entry, size, last_used in entries), default=None)}
+
+    def prune(self, max_size=None):
+        """ evict least recently used entries until the cache fits in its size limit
+
+        Arguments:
+            max_size {int} -- size limit in bytes, defaults to the cache's size limit
+
+        Returns:
+            tuple -- number of evicted entries and bytes freed
+        """
+        if max_size is None:
+            max_size = self.max_size
+
+        entries = sorted(self._list_entries(), key=lambda entry: entry[2])
+        total_size = sum(size for entry, size, last_used in entries)
+
+        evicted_entries = 0
+        freed_size = 0
+        for entry, size, last_used in entries:
+            if total_size - freed_size <= max_size:
+                break
+            with contextlib.suppress(FileNotFoundError):
+                entry.unlink()
+                evicted_entries += 1
+                freed_size += size
+
+        return evicted_entries, freed_size
+
+    def _get_entry(self, key, suffix):
+        # spread entries over subdirectories to keep directories small
+        return self.cache_directory / key[:2] / f'{key}{suffix}'
+
+    def _list_entries(self):
+        """ list all entries in the cache
+
+        Returns:
+            list -- list of (path, size, last_used) tuples
+        """
+        entries = []
+        if not self.cache_directory.is_dir():
+            return entries
+
+        for directory in self.cache_directory.iterdir():
+            if not directory.is_dir():
+                continue
+            for entry in directory.iterdir():
+                with contextlib.suppress(FileNotFoundError):
+                    status = entry.stat()
+                    entries.append((entry, status.st_size, status.st_mtime))
+        return entries
+
+    @staticmethod
+    def _link(source, destination):
+        """ hard link a file, falling back to copying
+
+        Arguments:
+            source {pathlib.Path} -- existing file
+            destination {pathlib.Path} -- path of the new file
+        """
+        try:
+            os.link(source, destination)
+
+        except FileExistsError:
+            raise
+
+        # fall back to copying if the file system does not support hard links
+        # the copy is renamed into place so a partial file is never visible
+        except OSError:
+            if not source.is_file():
+                raise FileNotFoundError(source)
+            file_descriptor, temp_path = tempfile.mkstemp(dir=destination.parent)
+            os.close(file_descriptor)
+            shutil.copyfile(source, temp_path)
+            os.replace(temp_path, destination)
@@ -4,7 +4,7 @@
 Name: Video2X Upscaler
 Author: K4YT3X
 Date Created: December 10, 2018
-Last Modified: May 7, 2020
+Last Modified: October 17, 2026
 
 Description: This file contains the Upscaler class. Each
 instance of the Upscaler class is an upscaler on an image or
@@ -12,18 +12,25 @@ a folder.
 """
 
 # local imports
+from driver_registry import get_driver_wrapper
 from exceptions import *
-from image_cleaner import ImageCleaner
+from frame_encoder import FrameEncoder
+from frame_feeder import FrameFeeder
+from frame_reclaimer import FrameReclaimer
+from frame_scheduler import FrameScheduler
+from process_supervisor import ProcessSupervisor
 from progress_monitor import ProgressMonitor
 from wrappers.ffmpeg import Ffmpeg
 
 # built-in imports
 from fractions import Fraction
+import concurrent.futures
 import contextlib
 import copy
 import gettext
-import importlib
+import json
 import locale
+import math
 import os
 import pathlib
 import queue
@@ -35,6 +42,7 @@ import tempfile
 import threading
 import time
 import traceback
+import uuid
 
 # third-party imports
 from avalon_framework import Avalon
@@ -49,15 +57,23 @@ language = gettext.translation(DOMAIN, LOCALE_DIRECTORY, [default_locale], fallb
 language.install()
 _ = language.gettext
 
-# these names are consistent for
-# - driver selection in command line
-# - driver wrapper file names
-# - config file keys
-AVAILABLE_DRIVERS = ['waifu2x_caffe',
-                     'waifu2x_converter_cpp',
-                     'waifu2x_ncnn_vulkan',
-                     'srmd_ncnn_vulkan',
-                     'anime4kcpp']
+# number of times a failed segment is attempted
+SEGMENT_ATTEMPTS = 2
+
+# size of frames relative to uncompressed frames, used to estimate disk usage
+# lossless formats are counted as uncompressed so estimates err on the safe side
+IMAGE_COMPRESSION_RATIOS = {'jpg': 0.15, 'jpeg': 0.15, 'webp': 0.15}
+
+# batch size used when it is chosen automatically and the throughput is unknown
+DEFAULT_BATCH_SIZE = 20
+
+# largest fraction of the time of a batch automatically chosen batch sizes spend loading the model
+MODEL_LOAD_FRACTION = 0.1
+
+# columns of the table returned by Upscaler.plan()
+PLAN_COLUMNS = ['input', 'output', 'frames', 'source_resolution', 'target_resolution', 'pixel_format', 'bit_depth',
+                'extracted_size', 'upscaled_size', 'output_size', 'peak_scratch_size', 'scratch_directory',
+                'free_space', 'fits', 'estimated_time']
 
 
 class Upscaler:
@@ -82,14 +98,92 @@ class Upscaler:
         self.scale_height = None
         self.scale_ratio = None
         self.processes = 1
+        self.batch_size = 20
         self.video2x_cache_directory = pathlib.Path(tempfile.gettempdir()) / 'video2x'
         self.image_format = 'png'
         self.preserve_frames = False
+        self.pipelined_extraction = False
+        self.pipeline_window = 2000
+        self.incremental_encoding = False
+        self.max_cache_size = None
+        self.ram_disk_directory = None
+        self.ram_disk_fraction = 0.5
+        self.segments = 1
+        self.concurrent_videos = 1
+        self.concurrent_encodes = 1
+        self.deduplication = None
+        self.deduplication_threshold = 1.0
+        self.tile_upscaling = False
+        self.tile_size = 128
+        self.tile_padding = 16
+        self.tile_threshold = 1.0
+        self.tile_max_changed = 0.5
+        self.upscale_cache = False
+        self.upscale_cache_size = 20 * 1024 ** 3
+        self.resumable_jobs = False
+        self.job_id = None
+        self.speculative_execution = True
+        self.throughput_history = True
+        self.optimize_intermediate_format = True
+        self.remote_workers = []
+        self.worker_timeout = 10
+        self.progress_bar = True
+        self.probe_cache = True
+        self.probe_processes = 8
+
+        # a segment of a video when created by another upscaler
+        self.segment_index = None
+        self.segment_start_time = None
+        self.segment_frames = None
+
+        # directory of the job a video or segment belongs to
+        self.job_directory = None
+        self.job_ledger = None
+
+        # resources shared by videos upscaled at the same time
+        self.batch_scheduler = None
+
+        # information of probed videos, shared by all videos and segments
+        self.video_info_cache = None
+
+        # video2x workers on other machines, shared by all videos and segments
+        self.render_nodes = None
+
+        # set once FFmpeg, the driver and its settings have been checked
+        self.driver_checked = False
+
+        # wrapper class of the driver, imported once and shared by all videos and segments
+        self.driver_wrapper = None
 
         # other internal members and signals
-        self.stop_signal = False
+        # stop requests arrive through the supervisor, see stop()
+        self.supervisor = ProcessSupervisor()
+        self.parent_supervisor = None
+
+        # called with (total_frames_upscaled, total_frames) from worker threads
+        self.progress_listeners = []
         self.total_frames_upscaled = 0
         self.total_frames = 0
+        self.frame_deduplicator = None
+        self.frame_tiler = None
+        self.frame_cache = None
+        self.frame_reclaimer = None
+        self.cache_keys = {}
+        self.duplicate_frames = {}
+        self.quarantined_frames = []
+        self.stragglers = 0
+        self.stragglers_overtaken = 0
+        self.straggler_time_saved = 0
+
+        # bits per channel of extracted frames, set when the intermediate format is chosen
+        self.intermediate_depth = None
+
+        # seconds spent in each stage of the current video
+        self.history = None
+        self.throughput_key = None
+        self.stage_times = {}
+        self.resumed_video = False
+        self.expected_frames_per_second = None
 
     def create_temp_directories(self):
         """create temporary directories
@@ -113,17 +207,174 @@ class Upscaler:
                 Avalon.error(_('Unable to create {}').format(self.video2x_cache_directory))
                 raise exception
 
+        # frames of resumable jobs are kept in the job directory so they can be found again
+        if self.job_directory is not None:
+            self.extracted_frames = self.job_directory / 'extracted'
+            self.upscaled_frames = self.job_directory / 'upscaled'
+            self.extracted_frames.mkdir(parents=True, exist_ok=True)
+            self.upscaled_frames.mkdir(parents=True, exist_ok=True)
+
         # create temp directories for extracted frames and upscaled frames
-        self.extracted_frames = pathlib.Path(tempfile.mkdtemp(dir=self.video2x_cache_directory))
+        else:
+            self.extracted_frames = pathlib.Path(tempfile.mkdtemp(dir=self.video2x_cache_directory))
+            self.upscaled_frames = pathlib.Path(tempfile.mkdtemp(dir=self.video2x_cache_directory))
         Avalon.debug_info(_('Extracted frames are being saved to: {}').format(self.extracted_frames))
-        self.upscaled_frames = pathlib.Path(tempfile.mkdtemp(dir=self.video2x_cache_directory))
         Avalon.debug_info(_('Upscaled frames are being saved to: {}').format(self.upscaled_frames))
 
+    def _use_ram_disk(self, input_video, video_stream, pixel_formats):
+        """ move the frame directories onto the RAM disk if the frames fit in memory
+
+        Arguments:
+            input_video {pathlib.Path} -- input video path
+            video_stream {dict} -- video stream information from FFprobe
+            pixel_formats {dict} -- bits per pixel of each pixel format
+        """
+        available_size = self._get_ram_disk_space()
+        if available_size is None:
+            return
+
+        working_set_size = self._estimate_disk_usage(input_video, video_stream, pixel_formats, self.total_frames,
+                                                     self.scale_width, self.scale_height)['peak_size']
+        if working_set_size > available_size:
+            Avalon.debug_info(_('Frames need about {:.2f} MiB, more than the {:.2f} MiB available on the RAM disk').format(
+                working_set_size / 1024 ** 2, available_size / 1024 ** 2))
+            return
+
+        Avalon.info(_('Keeping frames on RAM disk {}, about {:.2f} MiB needed').format(self.ram_disk_directory, working_set_size / 1024 ** 2))
+        self.extracted_frames.rmdir()
+        self.upscaled_frames.rmdir()
+        self.extracted_frames = pathlib.Path(tempfile.mkdtemp(prefix='video2x_', dir=self.ram_disk_directory))
+        self.upscaled_frames = pathlib.Path(tempfile.mkdtemp(prefix='video2x_', dir=self.ram_disk_directory))
+
+    def _get_ram_disk_space(self):
+        """ get the space frames may take up on the RAM disk
+
+        Frames of resumable jobs stay on disk so they survive a reboot.
+
+        Returns:
+            float -- available space in bytes, None if frames cannot be kept on the RAM disk
+        """
+        if self.ram_disk_directory is None or self.job_directory is not None or not self.ram_disk_directory.is_dir():
+            return None
+
+        # psutil takes a while to import and is only needed for the RAM disk
+        import psutil
+
+        # segments and videos upscaled at the same time share the RAM disk
+        available_size = psutil.virtual_memory().available * self.ram_disk_fraction
+        if self.segment_index is not None:
+            available_size /= self.segments
+        if self.batch_scheduler is not None:
+            available_size /= self.batch_scheduler.concurrent_videos
+        return min(available_size, shutil.disk_usage(self.ram_disk_directory).free)
+
+    def _choose_intermediate_format(self, fm, video_stream):
+        """ choose the cheapest lossless format for extracted and upscaled frames
+
+        Frames are extracted as RGB without alpha, which the encoded
+        video never keeps, with 16 bits per channel only if the
+        source has more than 8 bits per channel, the driver keeps
+        them and frames are not split into tiles. The image format
+        is the cheapest lossless format the driver accepts, PNGs are
+        compressed with the fastest level.
+
+        Arguments:
+            fm {Ffmpeg} -- initialized FFmpeg object
+            video_stream {dict} -- video stream information from FFprobe
+        """
+        driver_wrapper = self._get_driver_wrapper()
+        if not driver_wrapper.IMAGE_FORMATS:
+            return
+
+        # older versions of FFprobe only tell the bit depth of the stream
+        source_depth = fm.get_bit_depths().get(video_stream['pix_fmt'])
+        if source_depth is None:
+            source_depth = 8
+            with contextlib.suppress(KeyError, ValueError):
+                source_depth = int(video_stream['bits_per_raw_sample'])
+
+        high_bit_depth = source_depth > 8 and 16 in driver_wrapper.BIT_DEPTHS
+
+        # tiles are cut and composited with Pillow, which reads 16-bit RGB PNGs as 8 bits per channel
+        if high_bit_depth and self.tile_upscaling and self.scale_ratio:
+            Avalon.warning(_('Tile upscaling keeps 8 bits per channel, extracting frames with 8 bits per channel'))
+            high_bit_depth = False
+
+        if high_bit_depth:
+            self.intermediate_depth = 16
+            pixel_format = 'rgb48be'
+            image_format = 'png'
+        else:
+            self.intermediate_depth = 8
+            pixel_format = 'rgb24'
+            image_format = driver_wrapper.IMAGE_FORMATS[0]
+
+        output_options = self.ffmpeg_settings['video_to_frames'].setdefault('output_options', {})
+        output_options['-pix_fmt'] = pixel_format
+        if image_format == 'png':
+            output_options.setdefault('-compression_level', 1)
+
+        self.image_format = fm.image_format = image_format
+        Avalon.info(_('Intermediate frames: {} {} ({} bits per channel in the source)').format(image_format.upper(), pixel_format, source_depth))
+
+    def _estimate_disk_usage(self, input_video, video_stream, pixel_formats, total_frames, scale_width, scale_height):
+        """ estimate the disk space taken up by the frames of a video
+
+        Frames are assumed to be as large as uncompressed frames in
+        the pixel format used for extraction, less what lossy image
+        formats save. The peak size is the most space taken up at
+        once under the configured pipeline settings.
+
+        Arguments:
+            input_video {pathlib.Path} -- input video path
+            video_stream {dict} -- video stream information from FFprobe
+            pixel_formats {dict} -- bits per pixel of each pixel format
+            total_frames {int} -- number of frames to upscale
+            scale_width {int} -- width of upscaled frames
+            scale_height {int} -- height of upscaled frames
+
+        Returns:
+            dict -- sizes in bytes of all extracted frames, all upscaled frames,
+                    the upscaled video and the peak usage
+        """
+        # extracted frames are saved in the pixel format set for extraction
+        pixel_format = self.ffmpeg_settings['video_to_frames'].get('output_options', {}).get('-pix_fmt') or video_stream['pix_fmt']
+        bytes_per_pixel = pixel_formats.get(pixel_format, 64) / 8 * IMAGE_COMPRESSION_RATIOS.get(self.image_format, 1)
+        frame_size = video_stream['width'] * video_stream['height'] * bytes_per_pixel
+        upscaled_frame_size = scale_width * scale_height * bytes_per_pixel
+
+        # frames are only deleted while the video is being extracted if extraction is pipelined,
+        # and upscaled frames only if they are encoded incrementally
+        # each segment of a video keeps its own window of frames
+        windows = self.segments if self.segments > 1 and self.segment_index is None else 1
+        window = min(self.pipeline_window * windows, total_frames)
+        extracted_frames = window if self.pipelined_extraction else total_frames
+        upscaled_frames = window if self.incremental_encoding else total_frames
+        peak_size = extracted_frames * frame_size + upscaled_frames * upscaled_frame_size
+        if self.max_cache_size is not None:
+            peak_size = min(peak_size, self.max_cache_size)
+
+        # the upscaled video is encoded next to the upscaled frames
+        # it is assumed to grow with the number of pixels
+        video_size = input_video.stat().st_size * upscaled_frame_size / frame_size
+        if self.segment_index is not None:
+            video_size /= self.segments
+
+        # encoded segments are concatenated into another copy of the video
+        elif windows > 1:
+            peak_size += video_size
+        peak_size += video_size
+
+        return {'extracted_size': total_frames * frame_size,
+                'upscaled_size': total_frames * upscaled_frame_size,
+                'video_size': video_size,
+                'peak_size': peak_size}
+
     def cleanup_temp_directories(self):
         """delete temp directories when done
         """
         if not self.preserve_frames:
-            for directory in [self.extracted_frames, self.upscaled_frames, self.video2x_cache_directory]:
+            for directory in [self.extracted_frames, self.upscaled_frames]:
                 try:
                     # avalon framework cannot be used if python is shutting down
                     # therefore, plain print is used
@@ -133,6 +384,12 @@ class Upscaler:
                     print(_('Unable to delete: {}').format(directory))
                     traceback.print_exc()
 
+            # the cache directory may still be used by other upscalers
+            # or hold the upscale cache, only delete it if nothing else is left in it
+            with contextlib.suppress(OSError):
+                self.video2x_cache_directory.rmdir()
+                print(_('Cleaning up cache directory: {}').format(self.video2x_cache_directory))
+
     def _check_arguments(self):
         # if input is a file
         if self.input_path.is_file():
@@ -157,6 +414,28 @@ class Upscaler:
             Avalon.error(_('Input path is neither a file nor a directory'))
             raise FileNotFoundError(f'{self.input_path} is neither file nor directory')
 
+        # check if the driver can scale as asked
+        driver_wrapper = self._get_driver_wrapper()
+        if self.scale_ratio:
+            if driver_wrapper.SCALE_RATIOS is not None and self.scale_ratio not in driver_wrapper.SCALE_RATIOS:
+                Avalon.error(_('{} only supports scaling ratios {}').format(self.driver, ', '.join(str(ratio) for ratio in driver_wrapper.SCALE_RATIOS)))
+                raise ArgumentError('unsupported scaling ratio')
+        elif not driver_wrapper.SCALE_TO_RESOLUTION:
+            Avalon.error(_('{} can only scale by a ratio').format(self.driver))
+            raise ArgumentError('scaling ratio required')
+
+        # drivers are only checked once by long-running instances such as video2x serve
+        if not self.driver_checked:
+            self._check_driver()
+            self.driver_checked = True
+
+    def _check_driver(self):
+        """ check the FFmpeg and driver paths and parse the driver settings with the driver's parser
+
+        Raises:
+            FileNotFoundError -- if FFmpeg or the driver cannot be found
+            AttributeError -- if the driver settings are not valid
+        """
         # check Fmpeg settings
         ffmpeg_path = pathlib.Path(self.ffmpeg_settings['ffmpeg_path'])
         if not ((pathlib.Path(ffmpeg_path / 'ffmpeg.exe').is_file() and
@@ -197,168 +476,545 @@ class Upscaler:
                     if value is not True:
                         driver_arguments.append(str(value))
 
-            DriverWrapperMain = getattr(importlib.import_module(f'wrappers.{self.driver}'), 'WrapperMain')
-            DriverWrapperMain.parse_arguments(driver_arguments)
+            self._get_driver_wrapper().parse_arguments(driver_arguments)
         except AttributeError as e:
             Avalon.error(_('Failed to parse driver argument: {}').format(e.args[0]))
             raise e
 
-    def _upscale_frames(self):
-        """ Upscale video frames with waifu2x-caffe
+    def _get_driver_wrapper(self):
+        """ import the wrapper of the driver once per run
+
+        Returns:
+            class -- wrapper class of the driver, declaring its capabilities
+
+        Raises:
+            UnrecognizedDriverError -- if the driver is neither built in nor installed as a plugin
+        """
+        if self.driver_wrapper is None:
+            try:
+                self.driver_wrapper = get_driver_wrapper(self.driver)
+            except UnrecognizedDriverError as e:
+                Avalon.error(_('Unrecognized driver: {}').format(self.driver))
+                raise e
+        return self.driver_wrapper
+
+    def _upscales_whole_videos(self):
+        """ check if the driver upscales whole videos instead of extracted frames
+
+        Returns:
+            bool -- True if videos are handed to the driver as they are
+        """
+        driver_wrapper = self._get_driver_wrapper()
+        return driver_wrapper.VIDEO_INPUT and not driver_wrapper.DIRECTORY_INPUT
+
+    def _get_driver_processes(self):
+        """ get the number of driver processes a video runs at once
+
+        Returns:
+            int -- one for drivers with their own threads, otherwise the number of processes
+        """
+        return 1 if self._get_driver_wrapper().INTERNAL_THREADING else self.processes
+
+    def _choose_batch_size(self, workers):
+        """ choose how many frames each driver process upscales at once
 
-        This function upscales all the frames extracted
-        by ffmpeg using the waifu2x-caffe binary.
+        The configured batch size is used unless it is null. Batches
+        are then made large enough for loading the driver's model to
+        take at most MODEL_LOAD_FRACTION of each batch, but small
+        enough for each worker to get a batch.
 
         Arguments:
-            w2 {Waifu2x Object} -- initialized waifu2x object
+            workers {int} -- number of driver processes upscaling the video
+
+        Returns:
+            int -- number of frames in each batch
         """
+        if self.batch_size is not None:
+            return self.batch_size
+
+        batch_size = DEFAULT_BATCH_SIZE
+        if self.expected_frames_per_second:
+            frames_per_process_second = self.expected_frames_per_second / workers
+            batch_size = math.ceil(self._get_driver_wrapper().MODEL_LOAD_COST * frames_per_process_second * (1 - MODEL_LOAD_FRACTION) / MODEL_LOAD_FRACTION)
+
+        if self.total_frames > 0:
+            batch_size = min(batch_size, math.ceil(self.total_frames / workers))
+        batch_size = max(batch_size, 1)
+        Avalon.debug_info(_('Upscaling {} frames per batch').format(batch_size))
+        return batch_size
+
+    def _get_job_settings(self):
+        """ collect the settings that affect the frames of a job
+
+        Returns:
+            dict -- settings of the job
+        """
+        from upscale_cache import UpscaleCache
+
+        return {'driver': self.driver,
+                'driver_settings': UpscaleCache.normalize_settings(self.driver, self.driver_settings),
+                'scale_width': self.scale_width,
+                'scale_height': self.scale_height,
+                'scale_ratio': self.scale_ratio,
+                'image_format': self.image_format,
+                'segments': self.segments,
+                'deduplication': self.deduplication,
+                'deduplication_threshold': self.deduplication_threshold,
+                'tile_upscaling': self.tile_upscaling,
+                'tile_size': self.tile_size,
+                'tile_padding': self.tile_padding,
+                'tile_threshold': self.tile_threshold,
+                'tile_max_changed': self.tile_max_changed}
+
+    def _open_job(self):
+        """ create a new resumable job or open the job to resume
+
+        Frames upscaled with different settings cannot be reused,
+        so a job can only be resumed with the settings it was
+        created with.
+        """
+        from job_ledger import JobLedger
+
+        settings = json.loads(json.dumps(self._get_job_settings(), default=str))
+
+        if self.job_id is None:
+            self.job_id = uuid.uuid4().hex[:12]
+            JobLedger.save_job(self.video2x_cache_directory / 'jobs' / self.job_id,
+                               {'input_path': self.input_path.absolute(),
+                                'output_path': self.output_path.absolute(),
+                                'driver': self.driver,
+                                'scale_width': self.scale_width,
+                                'scale_height': self.scale_height,
+                                'scale_ratio': self.scale_ratio,
+                                'processes': self.processes,
+                                'settings': settings})
+            Avalon.info(_('Job ID: {}').format(self.job_id))
+
+        else:
+            try:
+                job = JobLedger.load_job(self.video2x_cache_directory / 'jobs' / self.job_id)
+            except FileNotFoundError:
+                Avalon.error(_('Job {} cannot be found').format(self.job_id))
+                raise
 
-        # initialize waifu2x driver
-        if self.driver not in AVAILABLE_DRIVERS:
-            raise UnrecognizedDriverError(_('Unrecognized driver: {}').format(self.driver))
+            if job['settings'] != settings:
+                Avalon.error(_('Settings differ from the settings job {} was started with').format(self.job_id))
+                raise ArgumentError('job settings mismatch')
+            Avalon.info(_('Resuming job {}').format(self.job_id))
 
-        # list all images in the extracted frames
-        frames = [(self.extracted_frames / f) for f in self.extracted_frames.iterdir() if f.is_file]
+    def _open_job_ledger(self, input_video):
+        """ open the ledger of a video or segment and recover its frames
 
-        # if we have less images than processes,
-        # create only the processes necessary
-        if len(frames) < self.processes:
-            self.processes = len(frames)
+        Frames that were being upscaled when the job stopped are put
+        back with the extracted frames. Frames of a job that did not
+        stop cleanly are discarded and the video is started over.
 
-        # create a directory for each process and append directory
-        # name into a list
-        process_directories = []
-        for process_id in range(self.processes):
-            process_directory = self.extracted_frames / str(process_id)
-            process_directories.append(process_directory)
+        Arguments:
+            input_video {pathlib.Path} -- input video path
+        """
+        input_video_status = input_video.stat()
+        fingerprint = {'size': input_video_status.st_size,
+                       'mtime': input_video_status.st_mtime_ns,
+                       'segment_start_time': self.segment_start_time,
+                       'segment_frames': self.segment_frames}
+
+        from job_ledger import JobLedger
+        self.job_ledger = JobLedger(self.job_directory)
+        resumed = self.job_ledger.load(fingerprint)
+
+        # encoded frames have been deleted and a partially encoded video cannot be continued
+        if resumed and self.job_ledger.get_frames('encoded'):
+            Avalon.warning(_('Incrementally encoded frames cannot be resumed, starting over'))
+            self.job_ledger.reset(fingerprint)
+            resumed = False
+
+        if not resumed:
+            for directory in [self.extracted_frames, self.upscaled_frames]:
+                shutil.rmtree(directory)
+                directory.mkdir(parents=True)
+            self.job_ledger.save()
+            return
+
+        # frames in worker directories had not been upscaled yet
+        for directory in [d for d in self.extracted_frames.iterdir() if d.is_dir()]:
+            for frame in directory.iterdir():
+                frame.replace(self.extracted_frames / frame.name)
+            shutil.rmtree(directory)
+
+        # drivers may have left partially written frames and tiles of frames that were never composited
+        for directory in [d for d in self.upscaled_frames.iterdir() if d.is_dir()]:
+            shutil.rmtree(directory)
+        for tile in self.upscaled_frames.glob('tile_*'):
+            tile.unlink()
+
+        # frames upscaled after the ledger was last saved are upscaled again
+        for frame in self.upscaled_frames.glob('extracted_*'):
+            match = re.match(r'extracted_(\d+)\.', frame.name)
+            if match is not None and not self.job_ledger.is_marked('upscaled', int(match.group(1))):
+                frame.unlink()
+
+        for frame_index in self.job_ledger.get_frames('duplicate'):
+            if self.job_ledger.is_marked('upscaled', frame_index):
+                self.duplicate_frames[frame_index] = frame_index - 1
+
+        Avalon.info(_('Resuming with {} frames already upscaled').format(len(self.job_ledger.get_frames('upscaled'))))
+        self.resumed_video = True
+
+    def _check_extracted_frames(self):
+        """ extract the frames of a resumed video again if any frame that still has to be upscaled is missing
+
+        The intermediate format decides the names of the extracted
+        frames, so it has to be chosen before frames are looked for.
+        """
+        if self.job_ledger is None or not self.job_ledger.is_completed('extracted'):
+            return
 
-            # delete old directories and create new directories
-            if process_directory.is_dir():
-                shutil.rmtree(process_directory)
-            process_directory.mkdir(parents=True, exist_ok=True)
+        for frame_index in range(1, self.job_ledger.manifest['frames'] + 1):
+            frame = self.extracted_frames / f'extracted_{frame_index}.{self.image_format}'
+            if not (self.job_ledger.is_marked('upscaled', frame_index) or frame.is_file()):
+                Avalon.warning(_('Extracted frame {} is missing, extracting frames again').format(frame_index))
+                self.job_ledger.manifest['stages'].remove('extracted')
+                break
 
-        # waifu2x-converter-cpp will perform multi-threading within its own process
-        if self.driver == 'waifu2x_converter_cpp':
-            process_directories = [self.extracted_frames]
+    def _launch_driver(self, input_directory, output_directory, address=None):
+        """ launch one driver process on a directory of frames
 
+        Arguments:
+            input_directory {pathlib.Path} -- directory containing frames to upscale
+            output_directory {pathlib.Path} -- directory to save upscaled frames into
+
+        Keyword Arguments:
+            address {str} -- address of the video2x worker to upscale the frames on (default: {None})
+
+        Returns:
+            subprocess.Popen -- the driver process, a RemoteBatch if upscaled on a worker
+        """
+        # the batch is sent to the worker once the frame scheduler waits for it
+        if address is not None:
+            from remote_batch import RemoteBatch
+            return RemoteBatch(self.render_nodes, address, self._get_remote_job(), input_directory, output_directory)
+
+        driver = self._get_driver_wrapper()(copy.deepcopy(self.driver_settings))
+        return driver.upscale_frames(input_directory, output_directory, self._get_driver_job())
+
+    def _get_driver_job(self):
+        """ collect the settings of the job driver wrappers are given
+
+        Returns:
+            dict -- settings passed to upscale_frames() and upscale_video() of the wrapper
+        """
+        return {'scale_ratio': self.scale_ratio,
+                'scale_width': self.scale_width,
+                'scale_height': self.scale_height,
+                'image_format': self.image_format,
+                'bit_depth': self.intermediate_depth or self.bit_depth,
+                'processes': self.processes}
+
+    def _get_remote_job(self):
+        """ collect the settings video2x workers need to upscale frames like this upscaler
+
+        Workers run as many processes as they have been started with.
+
+        Returns:
+            dict -- settings sent to workers with each batch
+        """
+        job = self._get_driver_job()
+        del job['processes']
+        job.update({'driver': self.driver,
+                    'driver_settings': {key: value for key, value in self.driver_settings.items() if key != 'path'}})
+        return job
+
+    def _extract_and_upscale_frames(self, fm, input_video, framerate):
+        """ extract and upscale video frames through the frame scheduler
+
+        Idle workers take batches of frames, sized by _choose_batch_size(),
+        from a shared queue, so faster workers upscale more frames
+        instead of waiting for a fixed share. With pipelined extraction, frames are handed to the drivers
+        as soon as FFmpeg has finished writing them, instead of
+        waiting for the whole video to be extracted first. With
+        incremental encoding, upscaled frames are piped into FFmpeg
+        in order while the other frames are still being upscaled.
+
+        Arguments:
+            fm {Ffmpeg} -- initialized FFmpeg object
+            input_video {pathlib.Path} -- input video path
+            framerate {float} -- framerate of the output video
+        """
+
+        # drivers with their own threads run one process
+        # batches are sized for local and remote processes alike
+        workers = self._get_driver_processes()
+        remote_workers = len(self.render_nodes.get_slots()) if self.render_nodes is not None else 0
+        self.frame_scheduler = FrameScheduler(self, workers, fm, self._choose_batch_size(workers + remote_workers))
+
+        # frames of resumed jobs may have been extracted already
+        if self.job_ledger is not None and self.job_ledger.is_completed('extracted'):
+            Avalon.info(_('Frames have already been extracted'))
+            extraction_process = None
+
+        # extract frames from video
         else:
-            # evenly distribute images into each directory
-            # until there is none left in the directory
-            for image in frames:
-                # move image
-                image.rename(process_directories[0] / image.name)
-                # rotate list
-                process_directories = process_directories[-1:] + process_directories[:-1]
-
-        # create threads and start them
-        for process_directory in process_directories:
-
-            DriverWrapperMain = getattr(importlib.import_module(f'wrappers.{self.driver}'), 'WrapperMain')
-            driver = DriverWrapperMain(copy.deepcopy(self.driver_settings))
-
-            # if the driver being used is waifu2x-caffe
-            if self.driver == 'waifu2x_caffe':
-                self.process_pool.append(driver.upscale(process_directory,
-                                                         self.upscaled_frames,
-                                                         self.scale_ratio,
-                                                         self.scale_width,
-                                                         self.scale_height,
-                                                         self.image_format,
-                                                         self.bit_depth))
-
-            # if the driver being used is waifu2x-converter-cpp
-            elif self.driver == 'waifu2x_converter_cpp':
-                self.process_pool.append(driver.upscale(process_directory,
-                                                         self.upscaled_frames,
-                                                         self.scale_ratio,
-                                                         self.processes,
-                                                         self.image_format))
-
-            # if the driver being used is waifu2x-ncnn-vulkan
-            elif self.driver == 'waifu2x_ncnn_vulkan':
-                self.process_pool.append(driver.upscale(process_directory,
-                                                         self.upscaled_frames,
-                                                         self.scale_ratio))
-
-            # if the driver being used is srmd_ncnn_vulkan
-            elif self.driver == 'srmd_ncnn_vulkan':
-                self.process_pool.append(driver.upscale(process_directory,
-                                                         self.upscaled_frames,
-                                                         self.scale_ratio))
-
-        # start progress bar in a different thread
+            extraction_started = time.time()
+            extraction_process = fm.extract_frames(input_video, self.extracted_frames, self.segment_start_time, self.segment_frames)
+            self.process_pool.append(extraction_process)
+
+            # wait for all frames to be extracted unless extraction is pipelined
+            if not self.pipelined_extraction:
+                self._wait()
+                self.stage_times['extract'] = time.time() - extraction_started
+
+        # frames that are no longer needed are deleted in the background
+        self.frame_reclaimer = FrameReclaimer()
+        self.frame_reclaimer.start()
+
+        self.frame_feeder = FrameFeeder(self, extraction_process, self.frame_scheduler)
+
+        if self.incremental_encoding:
+            Avalon.debug_info(_('Starting frame encoder'))
+            self.frame_encoder = FrameEncoder(self, fm.convert_video_stream(framerate, f'{self.scale_width}x{self.scale_height}', self.upscaled_frames))
+            self.frame_encoder.start()
+
+        # total number of frames is unknown until extraction finishes
+        # the estimation from video information is used until then
         Avalon.debug_info(_('Starting progress monitor'))
-        self.progress_monitor = ProgressMonitor(self, process_directories)
+        self.total_frames_upscaled = 0
+        self.progress_monitor = ProgressMonitor(self)
         self.progress_monitor.start()
 
-        # create the clearer and start it
-        Avalon.debug_info(_('Starting upscaled image cleaner'))
-        self.image_cleaner = ImageCleaner(self.extracted_frames, self.upscaled_frames, len(self.process_pool))
-        self.image_cleaner.start()
+        Avalon.debug_info(_('Starting frame scheduler and frame feeder'))
+        upscale_started = time.time()
+        self.frame_scheduler.start()
+        self.frame_feeder.start()
 
-        # wait for all process to exit
         try:
+            # wait for extraction and all drivers to exit
             self._wait()
+            self.stage_times['upscale'] = time.time() - upscale_started
+            if self.pipelined_extraction and self.frame_feeder.extraction_time is not None:
+                self.stage_times['extract'] = self.frame_feeder.extraction_time
+
+            # wait for the encoder to pipe the remaining frames
+            if self.frame_encoder is not None:
+                Avalon.info(_('Converting remaining upscaled frames into video'))
+                encode_started = time.time()
+                self.frame_encoder.finish()
+                self.frame_encoder.join()
+                if self.frame_encoder.exception is not None:
+                    raise self.frame_encoder.exception
+                self.process_pool.append(self.frame_encoder.encoder_process)
+                self._wait()
+                self.stage_times['encode'] = time.time() - encode_started
+
         except (Exception, KeyboardInterrupt, SystemExit) as e:
-            # cleanup
+            if self.frame_encoder is not None:
+                self.frame_encoder.stop()
+            raise e
+
+        finally:
             Avalon.debug_info(_('Killing progress monitor'))
             self.progress_monitor.stop()
 
-            Avalon.debug_info(_('Killing upscaled image cleaner'))
-            self.image_cleaner.stop()
-            raise e
+            Avalon.debug_info(_('Killing frame feeder'))
+            self.frame_feeder.stop()
+            self.frame_feeder = None
+            self.frame_scheduler = None
+            self.frame_encoder = None
 
-        # if the driver is waifu2x-converter-cpp
-        # images need to be renamed to be recognizable for FFmpeg
-        if self.driver == 'waifu2x_converter_cpp':
-            for image in [f for f in self.upscaled_frames.iterdir() if f.is_file()]:
-                renamed = re.sub(f'_\\[.*\\]\\[x(\\d+(\\.\\d+)?)\\]\\.{self.image_format}',
-                                 f'.{self.image_format}',
-                                 str(image.name))
-                (self.upscaled_frames / image).rename(self.upscaled_frames / renamed)
+            Avalon.debug_info(_('Killing frame reclaimer'))
+            self.frame_reclaimer.stop()
 
-        # upscaling done, kill helper threads
-        Avalon.debug_info(_('Killing progress monitor'))
-        self.progress_monitor.stop()
+    def _report_progress(self):
+        """ tell the upscaler of the whole video and progress listeners that frames have been upscaled
+        """
+        # segments report their progress to the upscaler of the whole video
+        if self.parent_supervisor is not None:
+            self.parent_supervisor.notify()
+
+        for listener in self.progress_listeners:
+            listener(self.total_frames_upscaled, self.total_frames)
+
+    def _find_changes(self, frame_index, frame):
+        """ find out what has to be upscaled for an extracted frame
 
-        Avalon.debug_info(_('Killing upscaled image cleaner'))
-        self.image_cleaner.stop()
+        Frames have to be checked in order. Duplicate frames are
+        recorded in self.duplicate_frames and deleted. Frames split
+        into tiles are deleted and replaced by their changed tiles.
+        Frames found in the upscale cache are filled in and deleted.
+
+        Arguments:
+            frame_index {int} -- index of the frame in extracted_%d
+            frame {pathlib.Path} -- path of the extracted frame
+
+        Returns:
+            list -- paths of the images to upscale, empty if the frame is a duplicate
+        """
+        self.frame_reclaimer.track([frame])
+
+        if self.job_ledger is not None:
+
+            # frames upscaled by an earlier attempt of the job are not compared against
+            # the frames after them, their source pixels are no longer known
+            if self.job_ledger.is_marked('upscaled', frame_index):
+                self.frame_reclaimer.reclaim([frame])
+                if self.frame_deduplicator is not None:
+                    self.frame_deduplicator.reset()
+                if self.frame_tiler is not None:
+                    self.frame_tiler.reset()
+                return []
+
+            self.job_ledger.mark('extracted', frame_index)
+
+        if self.frame_tiler is not None:
+            tiles = self.frame_tiler.split(frame_index, frame)
+
+            # a frame without changed tiles duplicates the frame before it
+            if tiles is not None:
+                if not tiles:
+                    self._mark_duplicate(frame_index, frame_index - 1)
+                self.frame_reclaimer.track(tiles)
+                self.frame_reclaimer.reclaim([frame])
+                return tiles
+
+        elif self.frame_deduplicator is not None:
+            source_frame_index = self.frame_deduplicator.find_duplicate(frame_index, frame)
+            if source_frame_index is not None:
+                self._mark_duplicate(frame_index, source_frame_index)
+                self.frame_reclaimer.reclaim([frame])
+                return []
+
+        # remember the key of frames that are not cached yet
+        # so they can be stored once they are upscaled
+        if self.frame_cache is not None:
+            key = self.frame_cache.get_key(frame)
+            if self.frame_cache.fetch(key, self.upscaled_frames / frame.name):
+                self.frame_reclaimer.track([self.upscaled_frames / frame.name])
+                self.frame_reclaimer.reclaim([frame])
+                return []
+            self.cache_keys[frame_index] = key
+
+        return [frame]
+
+    def _mark_duplicate(self, frame_index, source_frame_index):
+        """ record a frame that duplicates an earlier frame
+
+        Arguments:
+            frame_index {int} -- index of the duplicate frame
+            source_frame_index {int} -- index of the frame it duplicates
+        """
+        self.duplicate_frames[frame_index] = source_frame_index
+        if self.job_ledger is not None:
+            self.job_ledger.mark('duplicate', frame_index)
+
+    def _cache_frames(self, frame_indices):
+        """ store upscaled frames in the upscale cache
+
+        Arguments:
+            frame_indices {list} -- indices of the upscaled frames
+        """
+        if self.frame_cache is None:
+            return
+
+        for frame_index in frame_indices:
+            key = self.cache_keys.pop(frame_index, None)
+            if key is not None:
+                self.frame_cache.store(key, self.upscaled_frames / f'extracted_{frame_index}.{self.image_format}')
+
+    def _assemble_frames(self):
+        """ fill in duplicate frames and composite tiled frames
+
+        Frames are assembled in order since tiled frames and
+        duplicate frames of tiled frames build on the frame
+        before them. Hard links are used for duplicate frames
+        so no extra disk space is needed.
+        """
+        tiled_frames = self.frame_tiler.tiled_frames if self.frame_tiler is not None else {}
+        for frame_index in sorted([*self.duplicate_frames, *tiled_frames]):
+            frame = self.upscaled_frames / f'extracted_{frame_index}.{self.image_format}'
+
+            if frame_index in self.duplicate_frames:
+                source_frame = self.upscaled_frames / f'extracted_{self.duplicate_frames[frame_index]}.{self.image_format}'
+
+                # an earlier attempt of a resumed job may have filled it in already
+                with contextlib.suppress(FileNotFoundError):
+                    frame.unlink()
+
+                try:
+                    os.link(source_frame, frame)
+
+                # fall back to copying if the file system does not support hard links
+                except OSError:
+                    shutil.copyfile(source_frame, frame)
+
+            else:
+                previous_frame = self.upscaled_frames / f'extracted_{frame_index - 1}.{self.image_format}'
+                frame.write_bytes(self.frame_tiler.composite(frame_index, previous_frame.read_bytes(), self.upscaled_frames))
+                if self.job_ledger is not None:
+                    self.job_ledger.mark('upscaled', frame_index)
 
     def _terminate_subprocesses(self):
         Avalon.warning(_('Terminating all processes'))
+
+        # suspended FFmpeg has to be resumed before it can be terminated
+        if self.frame_feeder is not None:
+            self.frame_feeder.stop()
+
+        if self.frame_scheduler is not None:
+            self.frame_scheduler.stop()
+
+        if self.frame_encoder is not None:
+            self.frame_encoder.stop()
+
         for process in self.process_pool:
             process.terminate()
 
     def _wait(self):
-        """ wait for subprocesses in process pool to complete
+        """ wait for subprocesses in process pool and frame scheduler workers to finish
+
+        Subprocess exits, failures of worker threads and stop
+        requests all arrive as events from the process supervisor,
+        so they are handled as soon as they happen.
         """
         Avalon.debug_info(_('Main process waiting for subprocesses to exit'))
 
         try:
-            # while process pool not empty
-            while self.process_pool:
+            for process in self.process_pool:
+                self.supervisor.watch(process)
+
+            while True:
 
                 # if stop signal received, terminate all processes
-                if self.stop_signal is True:
+                if self.supervisor.is_cancelled():
                     raise SystemExit
 
-                for process in self.process_pool:
-                    process_status = process.poll()
+                # if the frame feeder failed while finding the frames to upscale
+                if self.frame_feeder is not None and self.frame_feeder.exception is not None:
+                    raise self.frame_feeder.exception
 
-                    # if process finished
-                    if process_status is None:
-                        continue
+                # if one of the frame scheduler's workers failed
+                if self.frame_scheduler is not None and self.frame_scheduler.exception is not None:
+                    raise self.frame_scheduler.exception
 
-                    # if return code is not 0
-                    elif process_status != 0:
-                        Avalon.error(_('Subprocess {} exited with code {}').format(process.pid, process_status))
-                        raise subprocess.CalledProcessError(process_status, process.args)
+                # if the frame encoder failed
+                if self.frame_encoder is not None and self.frame_encoder.exception is not None:
+                    raise self.frame_encoder.exception
 
-                    else:
-                        Avalon.debug_info(_('Subprocess {} exited with code {}').format(process.pid, process_status))
-                        self.process_pool.remove(process)
+                # process pool empty and frame scheduler finished
+                if not self.process_pool and (self.frame_scheduler is None or not self.frame_scheduler.is_alive()):
+                    break
+
+                event = self.supervisor.next_event()
+                if event[0] != 'exit' or event[1] not in self.process_pool:
+                    continue
+
+                process, process_status, elapsed_time = event[1:]
 
-                time.sleep(0.1)
+                # if return code is not 0
+                if process_status != 0:
+                    Avalon.error(_('Subprocess {} exited with code {}').format(process.pid, process_status))
+                    raise subprocess.CalledProcessError(process_status, process.args)
+
+                Avalon.debug_info(_('Subprocess {} exited with code {} after {:.1f} seconds').format(process.pid, process_status, elapsed_time))
+                self.process_pool.remove(process)
 
         except (KeyboardInterrupt, SystemExit) as e:
             Avalon.warning(_('Stop signal received'))
@@ -370,6 +1026,193 @@ class Upscaler:
             self._terminate_subprocesses()
             raise e
 
+    def stop(self):
+        """ stop upscaling
+
+        Can be called from any thread, e.g. by the GUI. Running
+        subprocesses are terminated and run() raises SystemExit.
+        """
+        self.supervisor.cancel()
+
+    def plan(self):
+        """ estimate what upscaling the input takes without upscaling anything
+
+        Videos are upscaled one after another, so the frames of only
+        one video are on disk at a time while the upscaled videos
+        pile up in the output directory.
+
+        Returns:
+            list -- one dict per input video with the keys in PLAN_COLUMNS
+        """
+        self._check_arguments()
+        self._open_probe_cache()
+
+        if self.input_path.is_file():
+            videos = [(self.input_path.absolute(), self.output_path.absolute())]
+        else:
+            videos = [(f.absolute(), (self.output_path / f.name).absolute()) for f in sorted(self.input_path.iterdir()) if f.is_file()]
+            self._probe_videos([input_video for input_video, output_video in videos])
+
+        fm = Ffmpeg(self.ffmpeg_settings, self.image_format)
+        fm.probe_cache = self.video_info_cache
+        pixel_formats = fm.get_pixel_formats()
+
+        # frames of resumable jobs are never kept on the RAM disk
+        resumable = (self.resumable_jobs or self.job_id is not None) and not self._upscales_whole_videos()
+        ram_disk_space = None if resumable else self._get_ram_disk_space()
+        scratch_volume = self._get_volume(self.video2x_cache_directory)
+        output_volume = self._get_volume(self.output_path)
+        output_free_space = shutil.disk_usage(output_volume).free
+        total_output_size = 0
+
+        plans = []
+        for input_video, output_video in videos:
+            plan = dict.fromkeys(PLAN_COLUMNS)
+            plan.update({'input': input_video, 'output': output_video, 'fits': False})
+            plans.append(plan)
+
+            try:
+                video_info = fm.get_video_info(input_video)
+                video_stream = next(stream for stream in video_info['streams'] if stream['codec_type'] == 'video')
+            except (subprocess.CalledProcessError, StopIteration):
+                Avalon.warning(_('No video stream found in {}').format(input_video))
+                continue
+
+            if 'nb_frames' in video_stream:
+                total_frames = int(video_stream['nb_frames'])
+            else:
+                total_frames = int(float(video_info['format']['duration']) * float(Fraction(video_stream['avg_frame_rate'])))
+
+            if self.scale_ratio:
+                scale_width = int(self.scale_ratio * video_stream['width'])
+                scale_height = int(self.scale_ratio * video_stream['height'])
+            else:
+                scale_width, scale_height = self.scale_width, self.scale_height
+
+            # each video chooses its intermediate format on its own copy of the settings
+            video_upscaler = copy.copy(self)
+            video_upscaler.ffmpeg_settings = copy.deepcopy(self.ffmpeg_settings)
+            if self.optimize_intermediate_format:
+                video_upscaler._choose_intermediate_format(Ffmpeg(video_upscaler.ffmpeg_settings, self.image_format), video_stream)
+
+            disk_usage = video_upscaler._estimate_disk_usage(input_video, video_stream, pixel_formats, total_frames, scale_width, scale_height)
+
+            # drivers upscaling whole videos do not save frames
+            if self._upscales_whole_videos():
+                disk_usage['peak_size'] = 0
+
+            # frames are saved in the cache directory unless they fit on the RAM disk
+            if ram_disk_space is not None and disk_usage['peak_size'] <= ram_disk_space:
+                scratch_directory = self.ram_disk_directory
+                free_space = ram_disk_space
+            else:
+                scratch_directory = self.video2x_cache_directory
+                free_space = shutil.disk_usage(scratch_volume).free
+
+                # videos upscaled before this one take up space on the same volume
+                if scratch_volume.stat().st_dev == output_volume.stat().st_dev:
+                    free_space -= total_output_size
+
+            total_output_size += disk_usage['video_size']
+
+            # earlier runs with the same settings predict how long the video takes
+            if self.throughput_history:
+                from throughput_history import ThroughputHistory
+                frames_per_second = self._predict_frames_per_second(ThroughputHistory.get_key(
+                    self.driver, self.driver_settings, self.processes, self.segments,
+                    video_stream['width'], video_stream['height'], scale_width, scale_height))
+                if frames_per_second is not None:
+                    plan['estimated_time'] = round(total_frames / frames_per_second)
+            plan.update({'frames': total_frames,
+                         'source_resolution': f'{video_stream["width"]}x{video_stream["height"]}',
+                         'target_resolution': f'{scale_width}x{scale_height}',
+                         'pixel_format': video_stream['pix_fmt'],
+                         'bit_depth': pixel_formats.get(video_stream['pix_fmt']),
+                         'extracted_size': int(disk_usage['extracted_size']),
+                         'upscaled_size': int(disk_usage['upscaled_size']),
+                         'output_size': int(disk_usage['video_size']),
+                         'peak_scratch_size': int(disk_usage['peak_size']),
+                         'scratch_directory': scratch_directory,
+                         'free_space': int(free_space),
+                         'fits': disk_usage['peak_size'] <= free_space and total_output_size <= output_free_space})
+
+            if plan['bit_depth'] is None:
+                Avalon.warning(_('Unsupported pixel format {} in {}').format(video_stream['pix_fmt'], input_video))
+                plan['fits'] = False
+
+            elif not plan['fits']:
+                Avalon.warning(_('{} needs about {:.2f} GiB of scratch space, only {:.2f} GiB are free').format(
+                    input_video.name, disk_usage['peak_size'] / 1024 ** 3, free_space / 1024 ** 3))
+
+        return plans
+
+    def _predict_frames_per_second(self, throughput_key):
+        """ predict how many frames are upscaled per second from earlier runs
+
+        Arguments:
+            throughput_key {dict} -- settings returned by ThroughputHistory.get_key()
+
+        Returns:
+            float -- frames per second, None if there are no matching earlier runs
+        """
+        import sqlite3
+        from throughput_history import ThroughputHistory
+
+        try:
+            prediction = ThroughputHistory(self.video2x_cache_directory / 'throughput_history.db').predict(throughput_key)
+        except sqlite3.Error as e:
+            Avalon.warning(_('Unable to read throughput history: {}').format(e))
+            return None
+
+        if prediction is None:
+            return None
+
+        pixels_per_second, runs = prediction
+        Avalon.debug_info(_('Earlier runs upscaled {:.0f} pixels per second ({} runs)').format(pixels_per_second, runs))
+        return pixels_per_second / (throughput_key['scale_width'] * throughput_key['scale_height'])
+
+    def _open_probe_cache(self):
+        """ create the probe cache shared by all videos and segments of this upscaler
+        """
+        if self.video_info_cache is None:
+            from probe_cache import ProbeCache
+            self.video_info_cache = ProbeCache(self.video2x_cache_directory / 'probe_cache.db' if self.probe_cache else None)
+
+    def _probe_videos(self, input_videos):
+        """ probe videos concurrently so their information is cached before they are upscaled
+
+        Videos that cannot be probed are left out, they are
+        probed again and reported when they are upscaled.
+
+        Arguments:
+            input_videos {list} -- paths of the videos
+        """
+        fm = Ffmpeg(self.ffmpeg_settings, self.image_format)
+        fm.probe_cache = self.video_info_cache
+
+        def probe_video(input_video):
+            with contextlib.suppress(subprocess.CalledProcessError, OSError, ValueError):
+                fm.get_video_info(input_video)
+
+        Avalon.debug_info(_('Probing {} videos, up to {} at once').format(len(input_videos), self.probe_processes))
+        with concurrent.futures.ThreadPoolExecutor(max(self.probe_processes, 1)) as executor:
+            list(executor.map(probe_video, input_videos))
+
+    @staticmethod
+    def _get_volume(path):
+        """ find the closest existing directory of a path
+
+        Arguments:
+            path {pathlib.Path} -- path that may not exist yet
+
+        Returns:
+            pathlib.Path -- path or its closest existing parent
+        """
+        path = path.absolute()
+        while not path.exists():
+            path = path.parent
+        return path
+
     def run(self):
         """ Main controller for Video2X
 
@@ -377,124 +1220,665 @@ class Upscaler:
         and handles all necessary functions.
         """
 
-        # external stop signal when called in a thread
-        self.stop_signal = False
-
         # define process pool to contain processes
         self.process_pool = []
+        self.frame_feeder = None
+        self.frame_scheduler = None
+        self.frame_encoder = None
 
         # parse arguments for waifu2x
         # check argument sanity
         self._check_arguments()
+        self._open_probe_cache()
+        self._get_driver_wrapper()
+
+        # frames can only be kept within the cache size limit if they
+        # are upscaled and encoded while they are being extracted
+        if self.max_cache_size is not None and not (self.pipelined_extraction and self.incremental_encoding):
+            Avalon.info(_('Cache size limit requires pipelined extraction and incremental encoding, enabling them'))
+            self.pipelined_extraction = True
+            self.incremental_encoding = True
+
+        # frames of resumable jobs are kept until the whole job has finished
+        resumable = (self.resumable_jobs or self.job_id is not None) and not self._upscales_whole_videos()
+        if resumable:
+            self._open_job()
+
+        # batches of frames are also upscaled by video2x workers on other machines
+        if self.remote_workers and not self._upscales_whole_videos():
+            from render_nodes import RenderNodes
+            self.render_nodes = RenderNodes(self.remote_workers, self.worker_timeout)
+            self.render_nodes.start()
 
         # define processing queue
         processing_queue = queue.Queue()
 
-        # if input specified is single file
-        if self.input_path.is_file():
-            Avalon.info(_('Upscaling single video file: {}').format(self.input_path))
-            processing_queue.put((self.input_path.absolute(), self.output_path.absolute()))
+        try:
+            # if input specified is single file
+            if self.input_path.is_file():
+                Avalon.info(_('Upscaling single video file: {}').format(self.input_path))
+                processing_queue.put((self.input_path.absolute(), self.output_path.absolute()))
 
-        # if input specified is a directory
-        elif self.input_path.is_dir():
+            # if input specified is a directory
+            elif self.input_path.is_dir():
 
-            # make output directory if it doesn't exist
-            self.output_path.mkdir(parents=True, exist_ok=True)
-            for input_video in [f for f in self.input_path.iterdir() if f.is_file()]:
-                output_video = self.output_path / input_video.name
-                processing_queue.put((input_video.absolute(), output_video.absolute()))
-
-        while not processing_queue.empty():
-            input_video, output_video = processing_queue.get()
-            # drivers that have native support for video processing
-            if self.driver == 'anime4kcpp':
-                # append FFmpeg path to the end of PATH
-                # Anime4KCPP will then use FFmpeg to migrate audio tracks
-                os.environ['PATH'] += f';{self.ffmpeg_settings["ffmpeg_path"]}'
-                Avalon.info(_('Starting to upscale extracted images'))
-
-                # import and initialize Anime4KCPP wrapper
-                DriverWrapperMain = getattr(importlib.import_module('wrappers.anime4kcpp'), 'WrapperMain')
-                driver = DriverWrapperMain(copy.deepcopy(self.driver_settings))
-
-                # run Anime4KCPP
-                self.process_pool.append(driver.upscale(input_video, output_video, self.scale_ratio, self.processes))
-                self._wait()
-                Avalon.info(_('Upscaling completed'))
+                # make output directory if it doesn't exist
+                self.output_path.mkdir(parents=True, exist_ok=True)
 
-            else:
-                try:
-                    self.create_temp_directories()
-
-                    # initialize objects for ffmpeg and waifu2x-caffe
-                    fm = Ffmpeg(self.ffmpeg_settings, self.image_format)
-
-                    Avalon.info(_('Reading video information'))
-                    video_info = fm.get_video_info(input_video)
-                    # analyze original video with ffprobe and retrieve framerate
-                    # width, height = info['streams'][0]['width'], info['streams'][0]['height']
-
-                    # find index of video stream
-                    video_stream_index = None
-                    for stream in video_info['streams']:
-                        if stream['codec_type'] == 'video':
-                            video_stream_index = stream['index']
-                            break
-
-                    # exit if no video stream found
-                    if video_stream_index is None:
-                        Avalon.error(_('Aborting: No video stream found'))
-                        raise StreamNotFoundError('no video stream found')
-
-                    # extract frames from video
-                    self.process_pool.append((fm.extract_frames(input_video, self.extracted_frames)))
+                # videos are upscaled concurrently by their own upscalers
+                if self.concurrent_videos > 1 and not self._upscales_whole_videos():
+                    self._upscale_videos()
+
+                else:
+                    input_videos = [f.absolute() for f in self.input_path.iterdir() if f.is_file()]
+                    if not self._upscales_whole_videos():
+                        self._probe_videos(input_videos)
+                    for input_video in input_videos:
+                        output_video = self.output_path / input_video.name
+                        processing_queue.put((input_video, output_video.absolute()))
+
+            while not processing_queue.empty():
+                input_video, output_video = processing_queue.get()
+                # drivers that have native support for video processing
+                if self._upscales_whole_videos():
+                    # append FFmpeg path to the end of PATH
+                    # drivers such as Anime4KCPP will then use FFmpeg to migrate audio tracks
+                    os.environ['PATH'] += f';{self.ffmpeg_settings["ffmpeg_path"]}'
+                    Avalon.info(_('Starting to upscale extracted images'))
+
+                    # initialize driver wrapper
+                    driver = self._get_driver_wrapper()(copy.deepcopy(self.driver_settings))
+
+                    # run the driver on the whole video
+                    self.process_pool.append(driver.upscale_video(input_video, output_video, self._get_driver_job()))
                     self._wait()
+                    Avalon.info(_('Upscaling completed'))
 
-                    # get average frame rate of video stream
-                    framerate = float(Fraction(video_info['streams'][video_stream_index]['avg_frame_rate']))
-                    fm.pixel_format = video_info['streams'][video_stream_index]['pix_fmt']
+                else:
+                    self._upscale_video(input_video, output_video)
 
-                    # get a dict of all pixel formats and corresponding bit depth
-                    pixel_formats = fm.get_pixel_formats()
+        finally:
+            if self.render_nodes is not None:
+                self.render_nodes.stop()
+                self.render_nodes = None
 
-                    # try getting pixel format's corresponding bti depth
-                    try:
-                        self.bit_depth = pixel_formats[fm.pixel_format]
-                    except KeyError:
-                        Avalon.error(_('Unsupported pixel format: {}').format(fm.pixel_format))
-                        raise UnsupportedPixelError(f'unsupported pixel format {fm.pixel_format}')
+        if resumable and not self.preserve_frames:
+            shutil.rmtree(self.video2x_cache_directory / 'jobs' / self.job_id)
 
-                    Avalon.info(_('Framerate: {}').format(framerate))
+    def _upscale_video(self, input_video, output_video):
+        """ upscale one video with frame-based drivers
 
-                    # width/height will be coded width/height x upscale factor
-                    if self.scale_ratio:
-                        original_width = video_info['streams'][video_stream_index]['width']
-                        original_height = video_info['streams'][video_stream_index]['height']
-                        self.scale_width = int(self.scale_ratio * original_width)
-                        self.scale_height = int(self.scale_ratio * original_height)
+        The intermediate format and pixel formats of the video are
+        chosen on a copy of the FFmpeg settings, so they do not carry
+        over to the next video.
 
-                    # upscale images one by one using waifu2x
-                    Avalon.info(_('Starting to upscale extracted images'))
-                    self._upscale_frames()
-                    Avalon.info(_('Upscaling completed'))
+        Arguments:
+            input_video {pathlib.Path} -- input video path
+            output_video {pathlib.Path} -- output video path
+        """
+        # segments are given the settings of the whole video
+        ffmpeg_settings, image_format = self.ffmpeg_settings, self.image_format
+        if self.segment_index is None:
+            self.ffmpeg_settings = copy.deepcopy(ffmpeg_settings)
+
+        try:
+            video_started = time.time()
+            self.stage_times = {}
+            self.resumed_video = False
+
+            # each video of a resumable job keeps its frames in its own directory
+            self.job_ledger = None
+            if self.job_id is not None and self.segment_index is None:
+                self.job_directory = self.video2x_cache_directory / 'jobs' / self.job_id / input_video.name
+
+            self.create_temp_directories()
+
+            # split the video into segments that are upscaled by other upscalers
+            segmented = self.segments > 1 and self.segment_index is None
+
+            # frames identical to the frame before them are only upscaled once
+            self.duplicate_frames = {}
+            self.quarantined_frames = []
+            self.frame_reclaimer = None
+            self.stragglers = 0
+            self.stragglers_overtaken = 0
+            self.straggler_time_saved = 0
+            # frames are compared with NumPy, which is only imported when frames are compared
+            if self.deduplication is not None and not segmented:
+                from frame_deduplicator import FrameDeduplicator
+                self.frame_deduplicator = FrameDeduplicator(self.deduplication, self.deduplication_threshold)
+            else:
+                self.frame_deduplicator = None
+
+            # only the changed tiles of frames are upscaled
+            # tiles are upscaled by ratio, a fixed output size would stretch them
+            self.frame_tiler = None
+            if self.tile_upscaling and not segmented:
+                from frame_tiler import BLOCK_SIZE
+                from frame_tiler import FrameTiler
+                if not self.scale_ratio:
+                    Avalon.warning(_('Tile upscaling requires an upscaling ratio, upscaling whole frames'))
+                elif self.tile_size <= 0 or self.tile_size % BLOCK_SIZE != 0:
+                    Avalon.error(_('Tile size must be a positive multiple of {}').format(BLOCK_SIZE))
+                    raise ArgumentError('invalid tile size')
+                else:
+                    self.frame_tiler = FrameTiler(self.tile_size, self.tile_padding, self.tile_threshold, self.tile_max_changed)
+
+            # pick up where an earlier attempt of the job stopped
+            if self.job_directory is not None:
+                self._open_job_ledger(input_video)
+
+                # videos and segments finished by an earlier attempt are skipped
+                if self.job_ledger.is_completed('finished') and output_video.is_file():
+                    Avalon.info(_('{} has already been upscaled').format(output_video.name))
+                    self.total_frames = self.total_frames_upscaled = self.job_ledger.manifest['frames']
+                    return
+
+            # initialize objects for ffmpeg and waifu2x-caffe
+            fm = Ffmpeg(self.ffmpeg_settings, self.image_format)
+            fm.probe_cache = self.video_info_cache
+
+            Avalon.info(_('Reading video information'))
+            video_info = fm.get_video_info(input_video)
+            # analyze original video with ffprobe and retrieve framerate
+            # width, height = info['streams'][0]['width'], info['streams'][0]['height']
+
+            # find index of video stream
+            video_stream_index = None
+            for stream in video_info['streams']:
+                if stream['codec_type'] == 'video':
+                    video_stream_index = stream['index']
+                    break
+
+            # exit if no video stream found
+            if video_stream_index is None:
+                Avalon.error(_('Aborting: No video stream found'))
+                raise StreamNotFoundError('no video stream found')
+
+            # get average frame rate of video stream
+            framerate = float(Fraction(video_info['streams'][video_stream_index]['avg_frame_rate']))
+            fm.pixel_format = video_info['streams'][video_stream_index]['pix_fmt']
+
+            # get a dict of all pixel formats and corresponding bit depth
+            pixel_formats = fm.get_pixel_formats()
+
+            # try getting pixel format's corresponding bti depth
+            try:
+                self.bit_depth = pixel_formats[fm.pixel_format]
+            except KeyError:
+                Avalon.error(_('Unsupported pixel format: {}').format(fm.pixel_format))
+                raise UnsupportedPixelError(f'unsupported pixel format {fm.pixel_format}')
+
+            Avalon.info(_('Framerate: {}').format(framerate))
+
+            # segments use the intermediate format chosen for the whole video
+            if self.optimize_intermediate_format and self.segment_index is None:
+                self._choose_intermediate_format(fm, video_info['streams'][video_stream_index])
+            self._check_extracted_frames()
+
+            # width/height will be coded width/height x upscale factor
+            if self.scale_ratio:
+                original_width = video_info['streams'][video_stream_index]['width']
+                original_height = video_info['streams'][video_stream_index]['height']
+                self.scale_width = int(self.scale_ratio * original_width)
+                self.scale_height = int(self.scale_ratio * original_height)
+
+            # frames upscaled before with the same settings are reused
+            self.cache_keys = {}
+            if self.upscale_cache and not segmented:
+                from upscale_cache import UpscaleCache
+                self.frame_cache = UpscaleCache(self.video2x_cache_directory / 'upscale_cache',
+                                                self.upscale_cache_size,
+                                                {'driver': self.driver,
+                                                 'driver_settings': UpscaleCache.normalize_settings(self.driver, self.driver_settings),
+                                                 'scale_ratio': self.scale_ratio,
+                                                 'scale_width': self.scale_width,
+                                                 'scale_height': self.scale_height,
+                                                 'bit_depth': self.bit_depth})
+            else:
+                self.frame_cache = None
+
+            # estimate total number of frames for the progress monitor
+            video_stream = video_info['streams'][video_stream_index]
+            if self.job_ledger is not None and 'frames' in self.job_ledger.manifest:
+                self.total_frames = self.job_ledger.manifest['frames']
+            elif self.segment_frames is not None:
+                self.total_frames = self.segment_frames
+            elif 'nb_frames' in video_stream:
+                self.total_frames = int(video_stream['nb_frames'])
+            else:
+                self.total_frames = int(float(video_info['format']['duration']) * framerate)
+
+            # earlier runs with the same settings predict how long the video takes
+            # segments are recorded as part of the whole video
+            self.history = None
+            self.expected_frames_per_second = None
+            if self.throughput_history and self.segment_index is None:
+                from throughput_history import ThroughputHistory
+                self.history = ThroughputHistory(self.video2x_cache_directory / 'throughput_history.db')
+                self.throughput_key = ThroughputHistory.get_key(self.driver, self.driver_settings, self.processes, self.segments,
+                                                                video_stream['width'], video_stream['height'], self.scale_width, self.scale_height)
+                self.expected_frames_per_second = self._predict_frames_per_second(self.throughput_key)
+                if self.expected_frames_per_second is not None:
+                    from tqdm import tqdm
+                    Avalon.info(_('Upscaling is expected to take about {}').format(
+                        tqdm.format_interval(self.total_frames / self.expected_frames_per_second)))
+
+            # split the video into segments and upscale them concurrently
+            if segmented:
+                upscale_started = time.time()
+                self._upscale_segments(fm, input_video, video_info, video_stream_index, framerate)
+                self.stage_times['upscale'] = time.time() - upscale_started
+
+            # upscale frames in batches through the frame scheduler
+            else:
+                self._use_ram_disk(input_video, video_stream, pixel_formats)
+
+                Avalon.info(_('Starting to extract and upscale frames'))
+                self._extract_and_upscale_frames(fm, input_video, framerate)
+                Avalon.info(_('Upscaling completed'))
+
+            if self.frame_deduplicator is not None or self.frame_tiler is not None:
+                Avalon.info(_('Skipped upscaling {} duplicate frames').format(len(self.duplicate_frames)))
+
+            if self.frame_tiler is not None:
+                Avalon.info(_('Upscaled {} changed tiles instead of whole frames').format(self.frame_tiler.tiles))
+
+            if self.frame_cache is not None:
+                Avalon.info(_('Reused {} frames from the upscale cache').format(self.frame_cache.hits))
+
+            if self.quarantined_frames:
+                Avalon.warning(_('{} frames could not be upscaled by the driver and were scaled by FFmpeg: {}').format(
+                    len(self.quarantined_frames), ', '.join(str(i) for i in sorted(self.quarantined_frames))))
+
+            if self.frame_reclaimer is not None:
+                Avalon.info(_('Reclaimed {:.2f} MiB of frames, at most {:.2f} MiB were on disk at once').format(
+                    self.frame_reclaimer.bytes_reclaimed / 1024 ** 2, self.frame_reclaimer.peak_disk_usage / 1024 ** 2))
+
+            if self.stragglers > 0:
+                Avalon.info(_('Re-ran {} straggling batches on idle workers, {} finished first, saving about {:.1f} seconds').format(
+                    self.stragglers, self.stragglers_overtaken, self.straggler_time_saved))
 
-                    # frames to Video
+            # frames to Video
+            # incrementally encoded frames and segments have already been converted
+            encode_started = time.time()
+
+            # videos upscaled at the same time share the encode slots
+            encode_slot = self._acquire_encode_slot()
+            try:
+                if not (self.incremental_encoding or segmented):
+                    self._assemble_frames()
                     Avalon.info(_('Converting extracted frames into video'))
 
                     # use user defined output size
                     self.process_pool.append(fm.convert_video(framerate, f'{self.scale_width}x{self.scale_height}', self.upscaled_frames))
                     self._wait()
-                    Avalon.info(_('Conversion completed'))
+                Avalon.info(_('Conversion completed'))
+
+                # segments are concatenated and muxed by the upscaler they belong to
+                if self.segment_index is not None:
+                    shutil.move(str(self.upscaled_frames / 'no_audio.mp4'), str(output_video))
 
+                else:
                     # migrate audio tracks and subtitles
                     Avalon.info(_('Migrating audio tracks and subtitles to upscaled video'))
                     self.process_pool.append(fm.migrate_audio_tracks_subtitles(input_video, output_video, self.upscaled_frames))
                     self._wait()
 
-                    # destroy temp directories
+            finally:
+                if encode_slot:
+                    self.batch_scheduler.encode_slots.release()
+            self.stage_times['encode'] = self.stage_times.get('encode', 0) + time.time() - encode_started
+
+            # timings of resumed videos only cover part of the work
+            if self.history is not None and not self.resumed_video:
+                import sqlite3
+                try:
+                    self.history.record(self.throughput_key, self.total_frames, self.stage_times, time.time() - video_started)
+                except sqlite3.Error as e:
+                    Avalon.warning(_('Unable to record throughput history: {}').format(e))
+
+            # destroy temp directories
+            self.cleanup_temp_directories()
+
+            # later attempts of the job skip this video
+            if self.job_ledger is not None:
+                self.job_ledger.complete_stage('finished')
+
+            # keep the upscale cache within its size limit
+            if self.frame_cache is not None:
+                evicted_entries, freed_size = self.frame_cache.prune()
+                if evicted_entries:
+                    Avalon.debug_info(_('Evicted {} frames ({} bytes) from the upscale cache').format(evicted_entries, freed_size))
+
+        except (Exception, KeyboardInterrupt, SystemExit) as e:
+
+            # keep the frames of resumable jobs for the next attempt
+            if self.job_ledger is not None:
+                self.job_ledger.save()
+                if self.segment_index is None:
+                    Avalon.warning(_('Run video2x with --resume {} to resume this job').format(self.job_id))
+
+            else:
+                with contextlib.suppress(ValueError):
                     self.cleanup_temp_directories()
+            raise e
+
+        finally:
+            if self.segment_index is None:
+                self.ffmpeg_settings, self.image_format = ffmpeg_settings, image_format
+                self.intermediate_depth = None
+
+    def _split_segments(self, packets, start_time):
+        """ split a video into segments at key frames
 
-                except (Exception, KeyboardInterrupt, SystemExit) as e:
-                    with contextlib.suppress(ValueError):
-                        self.cleanup_temp_directories()
-                    raise e
+        Segment boundaries are placed on the key frames closest
+        to evenly dividing the video's packets.
+
+        Arguments:
+            packets {list} -- list of (pts_time, key_frame) tuples in decoding order
+            start_time {float} -- start time of the video file
+
+        Returns:
+            list -- list of (start_time, frames) tuples, start_time is None for the first segment
+        """
+        key_frames = [index for index, (pts_time, key_frame) in enumerate(packets) if key_frame and pts_time is not None]
+
+        boundaries = [0]
+        for segment in range(1, self.segments):
+            target = len(packets) * segment / self.segments
+            candidates = [index for index in key_frames if index > boundaries[-1]]
+            if not candidates:
+                break
+            boundary = min(candidates, key=lambda index: abs(index - target))
+            if boundary not in boundaries:
+                boundaries.append(boundary)
+        boundaries.append(len(packets))
+
+        segments = []
+        for segment_start, segment_end in zip(boundaries[:-1], boundaries[1:]):
+
+            # seek slightly before the key frame so rounding in the printed timestamp
+            # cannot skip the key frame, seeking further back would make FFmpeg
+            # duplicate the first frame to fill the gap
+            if segment_start == 0:
+                segment_start_time = None
+            else:
+                segment_start_time = max(0, packets[segment_start][0] - start_time - 0.000001)
+            segments.append((segment_start_time, segment_end - segment_start))
+        return segments
+
+    def _create_segment_upscaler(self, segment_index, segment_start_time, segment_frames):
+        """ create an upscaler for one segment of the video
+
+        The segment upscaler has the same settings as this
+        upscaler but keeps its own temp directories and state.
+
+        Arguments:
+            segment_index {int} -- index of the segment
+            segment_start_time {float} -- time to start extracting frames from
+            segment_frames {int} -- number of frames in the segment
+
+        Returns:
+            Upscaler -- upscaler for the segment
+        """
+        upscaler = copy.copy(self)
+        upscaler.driver_settings = copy.deepcopy(self.driver_settings)
+        upscaler.ffmpeg_settings = copy.deepcopy(self.ffmpeg_settings)
+        upscaler.processes = max(1, self.processes // self.segments)
+        if self.max_cache_size is not None:
+            upscaler.max_cache_size = self.max_cache_size // self.segments
+        upscaler.segment_index = segment_index
+        upscaler.segment_start_time = segment_start_time
+        upscaler.segment_frames = segment_frames
+        upscaler.exception = None
+        upscaler.parent_supervisor = self.supervisor
+        upscaler.progress_listeners = []
+
+        # segments of resumable jobs are resumed separately
+        if self.job_directory is not None:
+            upscaler.job_directory = self.job_directory / f'segment_{segment_index}'
+        return upscaler
+
+    def _upscale_segment(self, upscaler, input_video, segment_video):
+        """ upscale one segment, retrying it once if it fails
+
+        Arguments:
+            upscaler {Upscaler} -- upscaler of the segment
+            input_video {pathlib.Path} -- input video path
+            segment_video {pathlib.Path} -- path to save the upscaled segment to
+        """
+        try:
+            for attempt in range(SEGMENT_ATTEMPTS):
+                upscaler.supervisor = ProcessSupervisor()
+                upscaler.process_pool = []
+                upscaler.frame_feeder = None
+                upscaler.frame_scheduler = None
+                upscaler.frame_encoder = None
+                upscaler.total_frames_upscaled = 0
+
+                # checked after replacing the supervisor so no stop request is lost
+                if self.supervisor.is_cancelled():
+                    return
+
+                try:
+                    upscaler._upscale_video(input_video, segment_video)
+                    upscaler.exception = None
+                    return
+                except (Exception, SystemExit) as e:
+                    upscaler.exception = e
+                    if self.supervisor.is_cancelled():
+                        return
+                    Avalon.warning(_('Segment {} failed: {}').format(upscaler.segment_index, e))
+
+        finally:
+            self.supervisor.notify(upscaler)
+
+    def _upscale_segments(self, fm, input_video, video_info, video_stream_index, framerate):
+        """ upscale key frame-aligned segments of a video concurrently
+
+        Each segment is extracted, upscaled and encoded by its own
+        upscaler. The encoded segments are then concatenated without
+        re-encoding.
+
+        Arguments:
+            fm {Ffmpeg} -- initialized FFmpeg object
+            input_video {pathlib.Path} -- input video path
+            video_info {dict} -- video information from FFprobe
+            video_stream_index {int} -- index of the video stream
+            framerate {float} -- framerate of the video stream
+        """
+        Avalon.info(_('Reading video packet information'))
+        packets = fm.get_video_packets(input_video, video_stream_index)
+        segments = self._split_segments(packets, float(video_info['format'].get('start_time', 0)))
+        Avalon.info(_('Splitting video into {} segments').format(len(segments)))
+
+        upscalers = []
+        threads = []
+        segment_videos = []
+        for segment_index, (segment_start_time, segment_frames) in enumerate(segments):
+            upscaler = self._create_segment_upscaler(segment_index, segment_start_time, segment_frames)
+            segment_video = self.upscaled_frames / f'segment_{segment_index}.mp4'
+            upscalers.append(upscaler)
+            segment_videos.append(segment_video)
+            threads.append(threading.Thread(target=self._upscale_segment, args=(upscaler, input_video, segment_video)))
+
+        # segments report their progress through this upscaler
+        self.total_frames = len(packets)
+        self.total_frames_upscaled = 0
+        Avalon.debug_info(_('Starting progress monitor'))
+        self.progress_monitor = ProgressMonitor(self)
+        self.progress_monitor.start()
+
+        for thread in threads:
+            thread.start()
+
+        try:
+            # segments notify this upscaler when they have upscaled frames and when they have finished
+            remaining_upscalers = set(upscalers)
+            while remaining_upscalers:
+                if self.supervisor.is_cancelled():
+                    raise SystemExit
+                event = self.supervisor.next_event()
+                if event[0] == 'notify' and event[1] in remaining_upscalers:
+                    remaining_upscalers.discard(event[1])
+                self.total_frames_upscaled = sum(upscaler.total_frames_upscaled for upscaler in upscalers)
+                self._report_progress()
+
+        except (KeyboardInterrupt, SystemExit) as e:
+            Avalon.warning(_('Stop signal received'))
+            for upscaler in upscalers:
+                upscaler.stop()
+            for thread in threads:
+                thread.join()
+            raise e
+
+        finally:
+            Avalon.debug_info(_('Killing progress monitor'))
+            self.progress_monitor.stop()
+
+        for upscaler in upscalers:
+            if upscaler.exception is not None:
+                Avalon.error(_('Segment {} could not be upscaled').format(upscaler.segment_index))
+                raise upscaler.exception
+
+        # concatenate segments without re-encoding
+        Avalon.info(_('Concatenating upscaled segments'))
+        self.process_pool.append(fm.concatenate_videos(segment_videos, self.upscaled_frames / 'no_audio.mp4'))
+        self._wait()
+
+    def _acquire_encode_slot(self):
+        """ take one of the encode slots shared by videos upscaled at the same time
+
+        Returns:
+            bool -- True if a slot has been taken, False if no slots are shared
+        """
+        if self.batch_scheduler is None:
+            return False
+
+        if not self.batch_scheduler.acquire(self.batch_scheduler.encode_slots, self.supervisor.is_cancelled):
+            raise SystemExit
+        return True
+
+    def _create_video_upscaler(self, plan):
+        """ create an upscaler for one video of the input directory
+
+        Arguments:
+            plan {dict} -- estimates of the video from plan()
+
+        Returns:
+            Upscaler -- upscaler for the video
+        """
+        upscaler = copy.copy(self)
+        upscaler.driver_settings = copy.deepcopy(self.driver_settings)
+        upscaler.ffmpeg_settings = copy.deepcopy(self.ffmpeg_settings)
+        upscaler.supervisor = ProcessSupervisor()
+        upscaler.parent_supervisor = self.supervisor
+        upscaler.progress_listeners = []
+        upscaler.process_pool = []
+        upscaler.frame_feeder = None
+        upscaler.frame_scheduler = None
+        upscaler.frame_encoder = None
+        upscaler.total_frames = plan['frames'] or 0
+        upscaler.total_frames_upscaled = 0
+        upscaler.exception = None
+
+        # frames of the video are kept within the scratch space reserved for it
+        if self.max_cache_size is not None:
+            upscaler.max_cache_size = self.batch_scheduler.get_scratch_size(plan)
+        return upscaler
+
+    def _upscale_batch_video(self, upscaler, input_video, output_video):
+        """ upscale one video of the input directory
+
+        Arguments:
+            upscaler {Upscaler} -- upscaler of the video
+            input_video {pathlib.Path} -- input video path
+            output_video {pathlib.Path} -- output video path
+        """
+        try:
+            upscaler._upscale_video(input_video, output_video)
+        except (Exception, SystemExit) as e:
+            upscaler.exception = e
+        finally:
+            self.supervisor.notify(upscaler)
+
+    def _upscale_videos(self):
+        """ upscale the videos of the input directory concurrently
+
+        Each video is upscaled by its own upscaler in its own
+        thread. The batch scheduler decides when each video is
+        started and shares the driver slots, encode slots and
+        scratch space between the videos that are running.
+        """
+        plans = self.plan()
+
+        # scratch space is the cache size limit or what is free on the cache volume
+        if self.max_cache_size is not None:
+            scratch_size = self.max_cache_size
+        else:
+            scratch_size = shutil.disk_usage(self._get_volume(self.video2x_cache_directory)).free
+
+        # drivers with their own threads run one process per video
+        driver_slots = self._get_driver_processes()
+        from batch_scheduler import BatchScheduler
+        self.batch_scheduler = BatchScheduler(plans, self.concurrent_videos, driver_slots, self.concurrent_encodes, scratch_size)
+        Avalon.info(_('Upscaling {} videos, up to {} at once').format(len(plans), self.concurrent_videos))
+
+        # videos report their progress through this upscaler
+        self.total_frames = sum(plan['frames'] or 0 for plan in plans)
+        self.total_frames_upscaled = 0
+        Avalon.debug_info(_('Starting progress monitor'))
+        self.progress_monitor = ProgressMonitor(self)
+        self.progress_monitor.start()
+
+        running_upscalers = {}
+        finished_frames = 0
+        try:
+            while self.batch_scheduler.pending_videos or running_upscalers:
+                if self.supervisor.is_cancelled():
+                    raise SystemExit
+
+                # start the shortest videos that fit into the free resources
+                plan = self.batch_scheduler.next_video()
+                while plan is not None:
+                    Avalon.info(_('Starting to upscale {}').format(plan['input'].name))
+                    upscaler = self._create_video_upscaler(plan)
+                    thread = threading.Thread(target=self._upscale_batch_video, args=(upscaler, plan['input'], plan['output']))
+                    running_upscalers[upscaler] = (thread, plan)
+                    thread.start()
+                    plan = self.batch_scheduler.next_video()
+
+                # videos notify this upscaler when they have upscaled frames and when they have finished
+                event = self.supervisor.next_event()
+                if event[0] == 'notify' and event[1] in running_upscalers:
+                    upscaler = event[1]
+                    thread, plan = running_upscalers.pop(upscaler)
+                    thread.join()
+                    self.batch_scheduler.finish_video(plan)
+                    if upscaler.exception is not None:
+                        Avalon.error(_('{} could not be upscaled').format(plan['input'].name))
+                        raise upscaler.exception
+                    finished_frames += upscaler.total_frames
+                    Avalon.info(_('Finished upscaling {}').format(plan['input'].name))
+
+                # the number of frames of a video is exact once it has been extracted
+                self.total_frames = (finished_frames +
+                                     sum(upscaler.total_frames for upscaler in running_upscalers) +
+                                     sum(plan['frames'] or 0 for plan in self.batch_scheduler.pending_videos))
+                self.total_frames_upscaled = finished_frames + sum(upscaler.total_frames_upscaled for upscaler in running_upscalers)
+                self._report_progress()
+
+        except (Exception, KeyboardInterrupt, SystemExit) as e:
+            if isinstance(e, (KeyboardInterrupt, SystemExit)):
+                Avalon.warning(_('Stop signal received'))
+            for upscaler in running_upscalers:
+                upscaler.stop()
+            for thread, plan in running_upscalers.values():
+                thread.join()
+            raise e
+
+        finally:
+            Avalon.debug_info(_('Killing progress monitor'))
+            self.progress_monitor.stop()
+            self.batch_scheduler = None
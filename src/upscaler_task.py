@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Name: Video2X Upscaler Task
+Author: K4YT3X
+Date Created: October 17, 2026
+Last Modified: October 17, 2026
+
+Description: This class lets coroutines await an upscaler that
+runs on a thread of its own, follow its progress and cancel it.
+"""
+
+# built-in imports
+import asyncio
+import concurrent.futures
+import contextlib
+
+
+class UpscalerTask:
+    """ Video2X Upscaler Task
+
+    This is not an asyncio pipeline. The upscaler still launches
+    FFprobe, FFmpeg and the drivers with subprocess and waits for
+    them on its own threads. Upscaler.run() is called on a thread
+    of the task's own, so the event loop is never blocked. Each
+    running task takes that thread in addition to the threads of
+    its pipeline. Tasks never wait for threads of the event loop's
+    default executor, which is shared and limited in size.
+
+    What does run on the event loop is waiting for the result,
+    progress events and cancellation.
+
+    Cancelling the task running run() stops the upscaler, waits
+    for its subprocesses to be terminated and then raises
+    CancelledError.
+
+    Example:
+        job = UpscalerTask(upscaler)
+        task = asyncio.create_task(job.run())
+        async for frames_upscaled, total_frames in job.progress():
+            print(f'{frames_upscaled}/{total_frames}')
+        await task
+    """
+
+    def __init__(self, upscaler):
+        self.upscaler = upscaler
+        self.progress_queues = []
+        self.finished = False
+        self.upscaler.progress_listeners.append(self._put_progress)
+
+    async def run(self):
+        """ run the upscaler until all videos are upscaled
+
+        Raises:
+            asyncio.CancelledError -- if the upscaler has been stopped
+        """
+        # the default executor would make jobs beyond its size wait for each other
+        executor = concurrent.futures.ThreadPoolExecutor(1, thread_name_prefix='video2x_job')
+        future = asyncio.get_running_loop().run_in_executor(executor, self.upscaler.run)
+
+        try:
+            await asyncio.shield(future)
+
+        # the upscaler raises SystemExit when it has been stopped
+        except SystemExit:
+            raise asyncio.CancelledError
+
+        except asyncio.CancelledError:
+            self.upscaler.stop()
+            with contextlib.suppress(SystemExit, Exception):
+                await future
+            raise
+
+        finally:
+            executor.shutdown(wait=False)
+            self.finished = True
+            for loop, queue in list(self.progress_queues):
+                loop.call_soon_threadsafe(queue.put_nowait, None)
+
+    def stop(self):
+        """ stop the upscaler
+
+        run() raises CancelledError once the upscaler has stopped.
+        """
+        self.upscaler.stop()
+
+    async def progress(self):
+        """ iterate over progress events until the upscaler finishes
+
+        Yields:
+            tuple -- number of frames upscaled and total number of frames
+        """
+        if self.finished:
+            return
+
+        entry = (asyncio.get_running_loop(), asyncio.Queue())
+        self.progress_queues.append(entry)
+
+        try:
+            while True:
+                event = await entry[1].get()
+                if event is None:
+                    return
+                yield event
+
+        finally:
+            self.progress_queues.remove(entry)
+
+    def _put_progress(self, total_frames_upscaled, total_frames):
+        # called from the upscaler's worker threads
+        # the event loop of a queue may have been closed in the meantime
+        for loop, queue in list(self.progress_queues):
+            with contextlib.suppress(RuntimeError):
+                loop.call_soon_threadsafe(queue.put_nowait, (total_frames_upscaled, total_frames))
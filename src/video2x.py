@@ -49,24 +49,27 @@ smooth and edges sharp.
 """
 
 # local imports
-from upscaler import AVAILABLE_DRIVERS
-from upscaler import Upscaler
+from driver_registry import BUILTIN_DRIVERS
+from driver_registry import get_available_drivers
+from driver_registry import get_driver_wrapper
 
 # built-in imports
 import argparse
 import contextlib
+import copy
+import csv
 import gettext
-import importlib
 import locale
 import os
 import pathlib
 import re
 import shutil
+import signal
+import socket
 import sys
 import tempfile
 import time
 import traceback
-import yaml
 
 # third-party imports
 from avalon_framework import Avalon
@@ -112,8 +115,12 @@ def parse_arguments():
     general_options.add_argument('-o', '--output', type=pathlib.Path, help=_('output video file/directory'))
     general_options.add_argument('-c', '--config', type=pathlib.Path, help=_('video2x config file path'), action='store',
                                  default=pathlib.Path(__file__).parent.absolute() / 'video2x.yaml')
-    general_options.add_argument('-d', '--driver', help=_('upscaling driver'), choices=AVAILABLE_DRIVERS, default='waifu2x_caffe')
+    general_options.add_argument('-d', '--driver', help=_('upscaling driver, one of {} or a driver installed as a plugin').format(', '.join(BUILTIN_DRIVERS)),
+                                 default='waifu2x_caffe')
     general_options.add_argument('-p', '--processes', help=_('number of processes to use for upscaling'), action='store', type=int, default=1)
+    general_options.add_argument('--resume', help=_('resume an interrupted job, input, output, driver and scaling options are taken from the job'), metavar='JOB', action='store')
+    general_options.add_argument('--dry-run', help=_('estimate the disk space each video needs without upscaling, and write the estimates as a tab-separated table to TABLE or stdout'),
+                                 metavar='TABLE', action='store', nargs='?', const='-')
     general_options.add_argument('-v', '--version', help=_('display version, lawful information and exit'), action='store_true')
 
     # scaling options
@@ -125,14 +132,205 @@ def parse_arguments():
     # if no driver arguments are specified
     if '--' not in sys.argv:
         video2x_args = parser.parse_args()
+    else:
+        video2x_args = parser.parse_args(sys.argv[1:sys.argv.index('--')])
+
+    # installed plugins are only looked up for drivers that are not built in
+    if video2x_args.driver not in BUILTIN_DRIVERS and video2x_args.driver not in get_available_drivers():
+        parser.error(_('unrecognized driver {}, available drivers: {}').format(video2x_args.driver, ', '.join(get_available_drivers())))
+
+    # if no driver arguments are specified
+    if '--' not in sys.argv:
         return video2x_args, None
 
     # if driver arguments are specified
-    else:
-        video2x_args = parser.parse_args(sys.argv[1:sys.argv.index('--')])
-        wrapper = getattr(importlib.import_module(f'wrappers.{video2x_args.driver}'), 'WrapperMain')
-        driver_args = wrapper.parse_arguments(sys.argv[sys.argv.index('--') + 1:])
-        return video2x_args, driver_args
+    driver_args = get_driver_wrapper(video2x_args.driver).parse_arguments(sys.argv[sys.argv.index('--') + 1:])
+    return video2x_args, driver_args
+
+
+def parse_cache_arguments():
+    """ parse CLI arguments of the cache command
+    """
+    parser = argparse.ArgumentParser(prog='video2x cache', formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('action', help=_('show statistics of the upscale cache or evict least recently used frames'), choices=['stats', 'prune'])
+    parser.add_argument('-c', '--config', type=pathlib.Path, help=_('video2x config file path'), action='store',
+                        default=pathlib.Path(__file__).parent.absolute() / 'video2x.yaml')
+    parser.add_argument('-s', '--size', help=_('size in GiB to prune the cache down to, defaults to upscale_cache_size'), action='store', type=float)
+    return parser.parse_args(sys.argv[2:])
+
+
+def parse_worker_arguments():
+    """ parse CLI arguments of the worker command
+    """
+    from render_nodes import WORKER_PORT
+
+    parser = argparse.ArgumentParser(prog='video2x worker', formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('-c', '--config', type=pathlib.Path, help=_('video2x config file path'), action='store',
+                        default=pathlib.Path(__file__).parent.absolute() / 'video2x.yaml')
+    parser.add_argument('--host', help=_('address to listen on, 0.0.0.0 accepts batches from other machines'), action='store', default='127.0.0.1')
+    parser.add_argument('--port', help=_('port to listen on'), action='store', type=int, default=WORKER_PORT)
+    parser.add_argument('-p', '--processes', help=_('number of batches to upscale at once'), action='store', type=int, default=1)
+    return parser.parse_args(sys.argv[2:])
+
+
+def parse_serve_arguments():
+    """ parse CLI arguments of the serve command
+    """
+    from job_server import SERVER_PORT
+
+    parser = argparse.ArgumentParser(prog='video2x serve', formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('-c', '--config', type=pathlib.Path, help=_('video2x config file path'), action='store',
+                        default=pathlib.Path(__file__).parent.absolute() / 'video2x.yaml')
+    parser.add_argument('--host', help=_('address to listen on'), action='store', default='127.0.0.1')
+    parser.add_argument('--port', help=_('port to listen on'), action='store', type=int, default=SERVER_PORT)
+    if hasattr(socket, 'AF_UNIX'):
+        parser.add_argument('--socket', type=pathlib.Path, help=_('listen on this Unix socket instead of a port'), action='store')
+    parser.add_argument('-j', '--jobs', help=_('number of jobs to upscale at once'), action='store', type=int, default=1)
+    return parser.parse_args(sys.argv[2:])
+
+
+def get_cache_directory(config):
+    """ get the video2x cache directory from the configuration
+
+    Arguments:
+        config {dict} -- video2x configuration
+
+    Returns:
+        pathlib.Path -- path of the cache directory, %TEMP%\\video2x by default
+    """
+    video2x_cache_directory = config['video2x']['video2x_cache_directory']
+    if video2x_cache_directory is None:
+        return pathlib.Path(tempfile.gettempdir()) / 'video2x'
+    return pathlib.Path(os.path.expandvars(video2x_cache_directory))
+
+
+def manage_upscale_cache(cache_args, config):
+    """ print statistics of the upscale cache or prune it
+
+    Arguments:
+        cache_args {argparse.Namespace} -- parsed arguments of the cache command
+        config {dict} -- video2x configuration
+    """
+    from upscale_cache import UpscaleCache
+
+    upscale_cache = UpscaleCache(get_cache_directory(config) / 'upscale_cache',
+                                 int(config['video2x']['upscale_cache_size'] * 1024 ** 3))
+
+    if cache_args.action == 'stats':
+        stats = upscale_cache.stats()
+        Avalon.info(_('Upscale cache: {}').format(upscale_cache.cache_directory))
+        Avalon.info(_('Frames: {}').format(stats['entries']))
+        Avalon.info(_('Size: {:.2f} GiB of {:.2f} GiB').format(stats['size'] / 1024 ** 3, upscale_cache.max_size / 1024 ** 3))
+        if stats['entries']:
+            Avalon.info(_('Least recently used: {}').format(time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(stats['oldest']))))
+            Avalon.info(_('Most recently used: {}').format(time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(stats['newest']))))
+
+    elif cache_args.action == 'prune':
+        max_size = None if cache_args.size is None else int(cache_args.size * 1024 ** 3)
+        evicted_entries, freed_size = upscale_cache.prune(max_size)
+        Avalon.info(_('Evicted {} frames, freed {:.2f} GiB').format(evicted_entries, freed_size / 1024 ** 3))
+
+
+def run_worker(worker_args, config):
+    """ upscale batches of frames sent by other video2x instances until interrupted
+
+    Arguments:
+        worker_args {argparse.Namespace} -- parsed arguments of the worker command
+        config {dict} -- video2x configuration
+    """
+    from render_worker import RenderWorker
+
+    # workers on the same machine listen on different ports
+    worker = RenderWorker(config, worker_args.processes, config['video2x']['worker_timeout'],
+                          get_cache_directory(config) / f'worker_{worker_args.port}')
+    # workers running as services are stopped with SIGTERM
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    with contextlib.suppress(KeyboardInterrupt):
+        worker.serve(worker_args.host, worker_args.port)
+    Avalon.info(_('Worker stopped'))
+
+
+def create_job_upscaler(job, config):
+    """ create the upscaler of a job submitted to video2x serve
+
+    Arguments:
+        job {dict} -- input, output, driver, processes, width, height, ratio and driver_settings of the job
+        config {dict} -- video2x configuration
+
+    Returns:
+        Upscaler -- the upscaler
+
+    Raises:
+        ValueError -- if the job is invalid
+    """
+    video2x_args = argparse.Namespace(input=pathlib.Path(job['input']),
+                                      output=pathlib.Path(job['output']),
+                                      driver=job.get('driver', 'waifu2x_caffe'),
+                                      processes=int(job.get('processes', 1)),
+                                      width=job.get('width'),
+                                      height=job.get('height'),
+                                      ratio=job.get('ratio'),
+                                      resume=None)
+
+    # relative paths would depend on where the server has been started
+    if not (video2x_args.input.is_absolute() and video2x_args.output.is_absolute()):
+        raise ValueError('input and output paths must be absolute')
+    if video2x_args.driver not in get_available_drivers() or video2x_args.driver not in config:
+        raise ValueError(f'driver {video2x_args.driver} is not available')
+
+    # drivers are always run from where the configuration says they are installed
+    driver_args = job.get('driver_settings', {})
+    unknown_settings = [key for key in driver_args if key not in config[video2x_args.driver] or key == 'path']
+    if unknown_settings:
+        raise ValueError(f'unknown driver settings {", ".join(unknown_settings)}')
+
+    upscaler = create_upscaler(video2x_args, driver_args, config)
+    upscaler.progress_bar = False
+    return upscaler
+
+
+def run_job_server(serve_args, config):
+    """ upscale jobs submitted over the local HTTP API until interrupted
+
+    Arguments:
+        serve_args {argparse.Namespace} -- parsed arguments of the serve command
+        config {dict} -- video2x configuration
+    """
+    from job_server import JobServer
+
+    job_server = JobServer(lambda job: create_job_upscaler(job, config), serve_args.jobs)
+    # servers running as services are stopped with SIGTERM
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    with contextlib.suppress(KeyboardInterrupt):
+        job_server.serve(serve_args.host, serve_args.port, getattr(serve_args, 'socket', None))
+    Avalon.info(_('Server stopped'))
+
+
+def write_plan(plans, table):
+    """ summarize the estimates of Upscaler.plan() and write them as a table
+
+    Arguments:
+        plans {list} -- estimates of each video
+        table {str} -- path of the table file, - for stdout
+    """
+    from upscaler import PLAN_COLUMNS
+
+    for plan in plans:
+        if plan['frames'] is not None:
+            Avalon.info(_('{}: {} frames, {} to {}, {} ({} bits per pixel)').format(
+                plan['input'].name, plan['frames'], plan['source_resolution'], plan['target_resolution'], plan['pixel_format'], plan['bit_depth']))
+            Avalon.info(_('Frames: {:.2f} GiB extracted, {:.2f} GiB upscaled, at most {:.2f} GiB in {} at once ({:.2f} GiB free)').format(
+                plan['extracted_size'] / 1024 ** 3, plan['upscaled_size'] / 1024 ** 3, plan['peak_scratch_size'] / 1024 ** 3,
+                plan['scratch_directory'], plan['free_space'] / 1024 ** 3))
+
+    with contextlib.ExitStack() as stack:
+        if table == '-':
+            table_file = sys.stdout
+        else:
+            table_file = stack.enter_context(open(table, 'w', newline=''))
+        writer = csv.DictWriter(table_file, PLAN_COLUMNS, delimiter='\t', lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(plans)
 
 
 def print_logo():
@@ -152,55 +350,76 @@ def read_config(config_file: pathlib.Path) -> dict:
         dict -- dictionary of video2x configuration
     """
 
+    # yaml is only imported by commands that read the configuration
+    import yaml
+
     with open(config_file, 'r') as config:
         return yaml.load(config, Loader=yaml.FullLoader)
 
 
-# /////////////////// Execution /////////////////// #
-
-# this is not a library
-if __name__ != '__main__':
-    Avalon.error(_('This file cannot be imported'))
-    raise ImportError(f'{__file__} cannot be imported')
-
-# print video2x logo
-print_logo()
-
-# parse command line arguments
-video2x_args, driver_args = parse_arguments()
-
-# display version and lawful informaition
-if video2x_args.version:
-    print(LEGAL_INFO)
-    sys.exit(0)
+def create_upscaler(video2x_args, driver_args, config):
+    """ create an upscaler with the settings of the command line and the configuration file
 
-# read configurations from configuration file
-config = read_config(video2x_args.config)
+    The configuration is not modified, so it can be used for
+    more than one upscaler.
 
-# load waifu2x configuration
-driver_settings = config[video2x_args.driver]
-driver_settings['path'] = os.path.expandvars(driver_settings['path'])
-
-# read FFmpeg configuration
-ffmpeg_settings = config['ffmpeg']
-ffmpeg_settings['ffmpeg_path'] = os.path.expandvars(ffmpeg_settings['ffmpeg_path'])
-
-# load video2x settings
-image_format = config['video2x']['image_format'].lower()
-preserve_frames = config['video2x']['preserve_frames']
-video2x_cache_directory = config['video2x']['video2x_cache_directory']
+    Arguments:
+        video2x_args {argparse.Namespace} -- input, output, driver, processes and scaling options
+        driver_args {dict} -- driver settings overriding the configuration, can be None
+        config {dict} -- video2x configuration
 
-# overwrite driver_settings with driver_args
-if driver_args is not None:
-    driver_args_dict = vars(driver_args)
-    for key in driver_args_dict:
-        if driver_args_dict[key] is not None:
-            driver_settings[key] = driver_args_dict[key]
+    Returns:
+        Upscaler -- the upscaler
+    """
 
-# start execution
-try:
-    # start timer
-    begin_time = time.time()
+    # the upscaler is only imported once a job runs, the other commands start without it
+    from upscaler import Upscaler
+
+    # load waifu2x configuration
+    driver_settings = copy.deepcopy(config[video2x_args.driver])
+    driver_settings['path'] = os.path.expandvars(driver_settings['path'])
+
+    # read FFmpeg configuration
+    ffmpeg_settings = copy.deepcopy(config['ffmpeg'])
+    ffmpeg_settings['ffmpeg_path'] = os.path.expandvars(ffmpeg_settings['ffmpeg_path'])
+
+    # load video2x settings
+    image_format = config['video2x']['image_format'].lower()
+    optimize_intermediate_format = config['video2x']['optimize_intermediate_format']
+    preserve_frames = config['video2x']['preserve_frames']
+    ram_disk_directory = config['video2x']['ram_disk_directory']
+    ram_disk_fraction = config['video2x']['ram_disk_fraction']
+    batch_size = config['video2x']['batch_size']
+    speculative_execution = config['video2x']['speculative_execution']
+    video2x_cache_directory = get_cache_directory(config)
+    pipelined_extraction = config['video2x']['pipelined_extraction']
+    pipeline_window = config['video2x']['pipeline_window']
+    incremental_encoding = config['video2x']['incremental_encoding']
+    max_cache_size = config['video2x']['max_cache_size']
+    segments = config['video2x']['segments']
+    concurrent_videos = config['video2x']['concurrent_videos']
+    concurrent_encodes = config['video2x']['concurrent_encodes']
+    deduplication = config['video2x']['deduplication']
+    deduplication_threshold = config['video2x']['deduplication_threshold']
+    tile_upscaling = config['video2x']['tile_upscaling']
+    tile_size = config['video2x']['tile_size']
+    tile_padding = config['video2x']['tile_padding']
+    tile_threshold = config['video2x']['tile_threshold']
+    tile_max_changed = config['video2x']['tile_max_changed']
+    upscale_cache = config['video2x']['upscale_cache']
+    upscale_cache_size = config['video2x']['upscale_cache_size']
+    resumable_jobs = config['video2x']['resumable_jobs']
+    throughput_history = config['video2x']['throughput_history']
+    probe_cache = config['video2x']['probe_cache']
+    probe_processes = config['video2x']['probe_processes']
+    remote_workers = config['video2x']['remote_workers']
+    worker_timeout = config['video2x']['worker_timeout']
+
+    # overwrite driver_settings with driver_args
+    if driver_args is not None:
+        for key in driver_args:
+            if driver_args[key] is not None:
+                driver_settings[key] = driver_args[key]
 
     # initialize upscaler object
     upscaler = Upscaler(input_path=video2x_args.input,
@@ -216,13 +435,118 @@ try:
     upscaler.processes = video2x_args.processes
     upscaler.video2x_cache_directory = video2x_cache_directory
     upscaler.image_format = image_format
+    upscaler.optimize_intermediate_format = optimize_intermediate_format
     upscaler.preserve_frames = preserve_frames
+    if ram_disk_directory is not None:
+        upscaler.ram_disk_directory = pathlib.Path(ram_disk_directory)
+    upscaler.ram_disk_fraction = ram_disk_fraction
+    upscaler.batch_size = batch_size
+    upscaler.speculative_execution = speculative_execution
+    upscaler.pipelined_extraction = pipelined_extraction
+    upscaler.pipeline_window = pipeline_window
+    upscaler.incremental_encoding = incremental_encoding
+    if max_cache_size is not None:
+        upscaler.max_cache_size = int(max_cache_size * 1024 ** 3)
+    upscaler.segments = segments
+    upscaler.concurrent_videos = concurrent_videos
+    upscaler.concurrent_encodes = concurrent_encodes
+    upscaler.deduplication = deduplication
+    upscaler.deduplication_threshold = deduplication_threshold
+    upscaler.tile_upscaling = tile_upscaling
+    upscaler.tile_size = tile_size
+    upscaler.tile_padding = tile_padding
+    upscaler.tile_threshold = tile_threshold
+    upscaler.tile_max_changed = tile_max_changed
+    upscaler.upscale_cache = upscale_cache
+    upscaler.upscale_cache_size = int(upscale_cache_size * 1024 ** 3)
+    upscaler.resumable_jobs = resumable_jobs
+    upscaler.throughput_history = throughput_history
+    upscaler.probe_cache = probe_cache
+    upscaler.probe_processes = probe_processes
+    if remote_workers is not None:
+        upscaler.remote_workers = remote_workers
+    upscaler.worker_timeout = worker_timeout
+    upscaler.job_id = video2x_args.resume
+    return upscaler
+
+
+def main():
+    """ run the command given on the command line
+    """
 
-    # run upscaler
-    upscaler.run()
+    # print video2x logo
+    print_logo()
+
+    # manage the upscale cache instead of upscaling videos
+    if sys.argv[1:2] == ['cache']:
+        cache_args = parse_cache_arguments()
+        manage_upscale_cache(cache_args, read_config(cache_args.config))
+        sys.exit(0)
+
+    # upscale frames for video2x instances on other machines instead of upscaling videos
+    if sys.argv[1:2] == ['worker']:
+        worker_args = parse_worker_arguments()
+        run_worker(worker_args, read_config(worker_args.config))
+        sys.exit(0)
+
+    # upscale jobs submitted over the local HTTP API instead of upscaling videos
+    if sys.argv[1:2] == ['serve']:
+        serve_args = parse_serve_arguments()
+        run_job_server(serve_args, read_config(serve_args.config))
+        sys.exit(0)
+
+    # parse command line arguments
+    video2x_args, driver_args = parse_arguments()
+
+    # display version and lawful informaition
+    if video2x_args.version:
+        print(LEGAL_INFO)
+        sys.exit(0)
+
+    # read configurations from configuration file
+    config = read_config(video2x_args.config)
+
+    # take the input, output and upscaling options from the job to resume
+    if video2x_args.resume is not None:
+        from job_ledger import JobLedger
+        job = JobLedger.load_job(get_cache_directory(config) / 'jobs' / video2x_args.resume)
+        video2x_args.input = pathlib.Path(job['input_path'])
+        video2x_args.output = pathlib.Path(job['output_path'])
+        video2x_args.driver = job['driver']
+        video2x_args.width = job['scale_width']
+        video2x_args.height = job['scale_height']
+        video2x_args.ratio = job['scale_ratio']
+        video2x_args.processes = job['processes']
+
+    # start execution
+    try:
+        # start timer
+        begin_time = time.time()
+
+        # initialize upscaler object
+        upscaler = create_upscaler(video2x_args, vars(driver_args) if driver_args is not None else None, config)
+
+        # only estimate what upscaling takes
+        # the exit code tells whether every video fits
+        if video2x_args.dry_run is not None:
+            plans = upscaler.plan()
+            write_plan(plans, video2x_args.dry_run)
+            if not all(plan['fits'] for plan in plans):
+                Avalon.error(_('Not every video fits in the free disk space'))
+                sys.exit(1)
+            sys.exit(0)
+
+        # run upscaler
+        upscaler.run()
+
+        Avalon.info(_('Program completed, taking {} seconds').format(round((time.time() - begin_time), 5)))
+
+    except Exception:
+        Avalon.error(_('An exception has occurred'))
+        traceback.print_exc()
 
-    Avalon.info(_('Program completed, taking {} seconds').format(round((time.time() - begin_time), 5)))
 
-except Exception:
-    Avalon.error(_('An exception has occurred'))
-    traceback.print_exc()
+# /////////////////// Execution /////////////////// #
+
+if __name__ == '__main__':
+    main()
@@ -526,7 +526,7 @@ class Video2XMainWindow(QtWidgets.QMainWindow):
     def start_progress_bar(self, progress_callback):
         # wait for progress monitor to come online
         while 'progress_monitor' not in self.upscaler.__dict__:
-            if self.upscaler.stop_signal:
+            if self.upscaler.supervisor.is_cancelled():
                 return
             time.sleep(0.1)
 
@@ -648,7 +648,7 @@ class Video2XMainWindow(QtWidgets.QMainWindow):
 
     def stop(self):
         with contextlib.suppress(AttributeError):
-            self.upscaler.stop_signal = True
+            self.upscaler.stop()
 
     def closeEvent(self, event):
         # try cleaning up temp directories
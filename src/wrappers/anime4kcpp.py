@@ -4,12 +4,15 @@
 Name: Waifu2x Caffe Driver
 Author: K4YT3X
 Date Created: May 3, 2020
-Last Modified: May 7, 2020
+Last Modified: October 17, 2026
 
 Description: This class is a high-level wrapper
 for waifu2x-caffe.
 """
 
+# local imports
+from wrappers.driver_wrapper import DriverWrapper
+
 # built-in imports
 import argparse
 import os
@@ -23,10 +26,16 @@ import threading
 from avalon_framework import Avalon
 
 
-class WrapperMain:
+class WrapperMain(DriverWrapper):
     """ Anime4K CPP wrapper
     """
 
+    # Anime4KCPP reads and writes whole videos with its own threads
+    INTERNAL_THREADING = True
+    DIRECTORY_INPUT = False
+    VIDEO_INPUT = True
+    MODEL_LOAD_COST = 0.0
+
     def __init__(self, driver_settings):
         self.driver_settings = driver_settings
         self.print_lock = threading.Lock()
@@ -105,3 +114,9 @@ class WrapperMain:
         Avalon.debug_info(f'[upscaler] Subprocess {os.getpid()} executing: {shlex.join(execute)}')
         self.print_lock.release()
         return subprocess.Popen(execute)
+
+    def upscale_video(self, input_video, output_video, job):
+        return self.upscale(input_video,
+                            output_video,
+                            job['scale_ratio'],
+                            job['processes'])
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Name: Video2X Driver Wrapper
+Author: K4YT3X
+Date Created: October 17, 2026
+Last Modified: October 17, 2026
+
+Description: This class is the common interface of driver
+wrappers and declares what a driver is capable of.
+"""
+
+
+class DriverWrapper:
+    """ Video2X Driver Wrapper
+
+    Wrappers declare the capabilities of their driver with the
+    class attributes below. The upscaler, the frame scheduler and
+    the intermediate format optimizer decide how to run a driver
+    from these declarations instead of from the driver's name,
+    so drivers installed as plugins are run like built-in ones.
+
+    Drivers with directory input implement upscale_frames(),
+    drivers that only take whole videos implement upscale_video().
+    Both are given the job's settings as a dict with the keys
+    scale_ratio, scale_width, scale_height, image_format,
+    bit_depth and processes, and return the driver's process.
+    """
+
+    # scale ratios the driver supports, None if it supports any ratio
+    SCALE_RATIOS = None
+
+    # the driver can scale frames to a width and height instead of by a ratio
+    SCALE_TO_RESOLUTION = False
+
+    # the driver runs its own threads, only one process is launched and told the number of processes
+    INTERNAL_THREADING = False
+
+    # the driver upscales directories of frames
+    DIRECTORY_INPUT = True
+
+    # the driver upscales whole videos, only used if it cannot upscale directories of frames
+    VIDEO_INPUT = False
+
+    # lossless image formats the driver reads and writes, cheapest first
+    # frames are extracted in the configured image format if this is empty
+    IMAGE_FORMATS = []
+
+    # bits per channel the driver keeps
+    BIT_DEPTHS = [8]
+
+    # rough number of seconds each process takes to load its model before upscaling
+    MODEL_LOAD_COST = 1.0
+
+    def __init__(self, driver_settings):
+        self.driver_settings = driver_settings
+
+    @staticmethod
+    def parse_arguments(arguments):
+        """ parse driver settings with the driver's parser
+
+        Arguments:
+            arguments {list} -- driver settings as command line arguments
+
+        Raises:
+            AttributeError -- if a setting is not valid
+        """
+        raise NotImplementedError
+
+    def upscale_frames(self, input_directory, output_directory, job):
+        """ upscale a directory of frames
+
+        Arguments:
+            input_directory {pathlib.Path} -- directory containing frames to upscale
+            output_directory {pathlib.Path} -- directory to save upscaled frames into
+            job {dict} -- settings of the job
+
+        Returns:
+            subprocess.Popen -- the driver process
+        """
+        raise NotImplementedError
+
+    def upscale_video(self, input_video, output_video, job):
+        """ upscale a whole video
+
+        Arguments:
+            input_video {pathlib.Path} -- input video path
+            output_video {pathlib.Path} -- output video path
+            job {dict} -- settings of the job
+
+        Returns:
+            subprocess.Popen -- the driver process
+        """
+        raise NotImplementedError
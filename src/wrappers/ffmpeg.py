@@ -4,7 +4,7 @@
 Name: Video2X FFmpeg Controller
 Author: K4YT3X
 Date Created: Feb 24, 2018
-Last Modified: May 7, 2020
+Last Modified: October 17, 2026
 
 Description: This class handles all FFmpeg related operations.
 """
@@ -13,10 +13,16 @@ Description: This class handles all FFmpeg related operations.
 import json
 import pathlib
 import subprocess
+import threading
 
 # third-party imports
 from avalon_framework import Avalon
 
+# output of ffprobe -pix_fmts of each FFprobe binary
+# it only changes when the binary is replaced
+PIXEL_FORMATS_OUTPUT = {}
+PIXEL_FORMATS_LOCK = threading.Lock()
+
 
 class Ffmpeg:
     """This class communicates with FFmpeg
@@ -35,6 +41,9 @@ class Ffmpeg:
         self.image_format = image_format
         self.pixel_format = None
 
+        # video information is read from and stored in the probe cache if one is given
+        self.probe_cache = None
+
     def get_pixel_formats(self):
         """ Get a dictionary of supported pixel formats
 
@@ -44,23 +53,11 @@ class Ffmpeg:
         Returns:
             dictionary -- JSON dict of all pixel formats to bit depth
         """
-        execute = [
-            self.ffmpeg_probe_binary,
-            '-v',
-            'quiet',
-            '-pix_fmts'
-        ]
-
-        # turn elements into str
-        execute = [str(e) for e in execute]
-
-        Avalon.debug_info(f'Executing: {" ".join(execute)}')
-
         # initialize dictionary to store pixel formats
         pixel_formats = {}
 
         # record all pixel formats into dictionary
-        for line in subprocess.run(execute, check=True, stdout=subprocess.PIPE).stdout.decode().split('\n'):
+        for line in self._list_pixel_formats().split('\n'):
             try:
                 pixel_formats[' '.join(line.split()).split()[1]] = int(' '.join(line.split()).split()[3])
             except (IndexError, ValueError):
@@ -71,6 +68,65 @@ class Ffmpeg:
 
         return pixel_formats
 
+    def get_bit_depths(self):
+        """ Get a dictionary of the bit depth of each pixel format's components
+
+        Older versions of FFprobe do not list the bit depths of
+        components, the dictionary is empty then.
+
+        Returns:
+            dictionary -- pixel formats to the largest bit depth of their components
+        """
+        # bit depths are listed as e.g. 10-10-10
+        bit_depths = {}
+        for line in self._list_pixel_formats().split('\n'):
+            try:
+                bit_depths[line.split()[1]] = max(int(depth) for depth in line.split()[4].split('-'))
+            except (IndexError, ValueError):
+                pass
+
+        return bit_depths
+
+    def _list_pixel_formats(self):
+        """ run ffprobe -pix_fmts once per FFprobe binary
+
+        Returns:
+            str -- output of ffprobe -pix_fmts
+        """
+        # a binary that has been replaced is run again
+        binary_stat = self._find_binary(self.ffmpeg_probe_binary).stat()
+        key = (str(self.ffmpeg_probe_binary), binary_stat.st_size, binary_stat.st_mtime_ns)
+
+        with PIXEL_FORMATS_LOCK:
+            if key not in PIXEL_FORMATS_OUTPUT:
+                execute = [
+                    self.ffmpeg_probe_binary,
+                    '-v',
+                    'quiet',
+                    '-pix_fmts'
+                ]
+
+                # turn elements into str
+                execute = [str(e) for e in execute]
+
+                Avalon.debug_info(f'Executing: {" ".join(execute)}')
+                PIXEL_FORMATS_OUTPUT[key] = subprocess.run(execute, check=True, stdout=subprocess.PIPE).stdout.decode()
+            return PIXEL_FORMATS_OUTPUT[key]
+
+    @staticmethod
+    def _find_binary(binary):
+        """ find the file of a binary that may have an .exe suffix
+
+        Arguments:
+            binary {pathlib.Path} -- path of the binary without suffix
+
+        Returns:
+            pathlib.Path -- path of the binary's file
+        """
+        if binary.is_file():
+            return binary
+        return binary.with_name(f'{binary.name}.exe')
+
     def get_video_info(self, input_video):
         """ Gets input video information
 
@@ -101,11 +157,57 @@ class Ffmpeg:
         # turn elements into str
         execute = [str(e) for e in execute]
 
+        # videos that have not changed since they were probed are not probed again
+        if self.probe_cache is not None:
+            key = self.probe_cache.get_key(pathlib.Path(input_video), self.ffmpeg_probe_binary)
+            json_str = self.probe_cache.get(key)
+            if json_str is not None:
+                return json.loads(json_str)
+
+        Avalon.debug_info(f'Executing: {" ".join(execute)}')
+        json_str = subprocess.run(execute, check=True, stdout=subprocess.PIPE).stdout.decode('utf-8')
+
+        if self.probe_cache is not None:
+            self.probe_cache.put(key, json_str)
+        return json.loads(json_str)
+
+    def get_video_packets(self, input_video, stream_index):
+        """ Gets presentation times and key frame flags of video packets
+
+        Arguments:
+            input_video {string} -- input video file path
+            stream_index {int} -- index of the video stream
+
+        Returns:
+            list -- list of (pts_time, key_frame) tuples in decoding order
+        """
+        execute = [
+            self.ffmpeg_probe_binary,
+            '-v',
+            'quiet',
+            '-print_format',
+            'json',
+            '-select_streams',
+            stream_index,
+            '-show_entries',
+            'packet=pts_time,flags',
+            '-i',
+            input_video
+        ]
+
+        # turn elements into str
+        execute = [str(e) for e in execute]
+
         Avalon.debug_info(f'Executing: {" ".join(execute)}')
         json_str = subprocess.run(execute, check=True, stdout=subprocess.PIPE).stdout
-        return json.loads(json_str.decode('utf-8'))
 
-    def extract_frames(self, input_video, extracted_frames):
+        packets = []
+        for packet in json.loads(json_str.decode('utf-8')).get('packets', []):
+            pts_time = packet.get('pts_time')
+            packets.append((float(pts_time) if pts_time not in (None, 'N/A') else None, 'K' in packet.get('flags', '')))
+        return packets
+
+    def extract_frames(self, input_video, extracted_frames, start_time=None, frames=None):
         """Extract every frame from original videos
 
         This method extracts every frame from input video using FFmpeg
@@ -113,6 +215,10 @@ class Ffmpeg:
         Arguments:
             input_video {string} -- input video path
             extracted_frames {string} -- video output directory
+
+        Keyword Arguments:
+            start_time {float} -- time in seconds to start extracting from (default: {None})
+            frames {int} -- number of frames to extract (default: {None})
         """
         execute = [
             self.ffmpeg_binary
@@ -120,6 +226,12 @@ class Ffmpeg:
 
         execute.extend(self._read_configuration(phase='video_to_frames'))
 
+        if start_time is not None:
+            execute.extend([
+                '-ss',
+                start_time
+            ])
+
         execute.extend([
             '-i',
             input_video
@@ -127,6 +239,12 @@ class Ffmpeg:
 
         execute.extend(self._read_configuration(phase='video_to_frames', section='output_options'))
 
+        if frames is not None:
+            execute.extend([
+                '-frames:v',
+                frames
+            ])
+
         execute.extend([
             extracted_frames / f'extracted_%0d.{self.image_format}'
         ])
@@ -182,6 +300,52 @@ class Ffmpeg:
 
         return(self._execute(execute))
 
+    def convert_video_stream(self, framerate, resolution, upscaled_frames):
+        """Converts images piped into FFmpeg's stdin into videos
+
+        Unlike convert_video, the images are written into the
+        returned process's stdin one after another.
+
+        Arguments:
+            framerate {float} -- target video framerate
+            resolution {string} -- target video resolution
+            upscaled_frames {string} -- directory to save the video into
+        """
+        execute = [
+            self.ffmpeg_binary,
+            '-r',
+            str(framerate),
+            '-s',
+            resolution
+        ]
+
+        # read other options
+        execute.extend(self._read_configuration(phase='frames_to_video'))
+
+        # read FFmpeg input options
+        # images are read from a pipe instead of the image2 demuxer
+        input_options = self._read_configuration(phase='frames_to_video', section='input_options')
+        if '-f' in input_options:
+            input_options[input_options.index('-f') + 1] = 'image2pipe'
+        else:
+            input_options.extend(['-f', 'image2pipe'])
+        execute.extend(input_options)
+
+        execute.extend([
+            '-i',
+            '-'
+        ])
+
+        # read FFmpeg output options
+        execute.extend(self._read_configuration(phase='frames_to_video', section='output_options'))
+
+        # specify output file location
+        execute.extend([
+            upscaled_frames / 'no_audio.mp4'
+        ])
+
+        return(self._execute(execute, stdin=subprocess.PIPE))
+
     def migrate_audio_tracks_subtitles(self, input_video, output_video, upscaled_frames):
         """ Migrates audio tracks and subtitles from input video to output video
 
@@ -211,6 +375,61 @@ class Ffmpeg:
 
         return(self._execute(execute))
 
+    def concatenate_videos(self, input_videos, output_video):
+        """ Concatenates videos without re-encoding
+
+        Arguments:
+            input_videos {list} -- list of input video paths in order
+            output_video {string} -- output video file path
+        """
+
+        # write the list of videos for FFmpeg's concat demuxer
+        concat_list = output_video.parent / f'{output_video.stem}_concat.txt'
+        with open(concat_list, 'w', encoding='utf-8') as concat_file:
+            for input_video in input_videos:
+                escaped_path = str(input_video.absolute()).replace("'", "'\\''")
+                concat_file.write(f"file '{escaped_path}'\n")
+
+        execute = [
+            self.ffmpeg_binary,
+            '-y',
+            '-f',
+            'concat',
+            '-safe',
+            '0',
+            '-i',
+            concat_list,
+            '-c',
+            'copy',
+            output_video
+        ]
+
+        return(self._execute(execute))
+
+    def scale_image(self, input_image, output_image, resolution):
+        """ Scales one image with FFmpeg's Lanczos scaler
+
+        Used for frames the upscaling driver keeps failing on.
+
+        Arguments:
+            input_image {pathlib.Path} -- input image path
+            output_image {pathlib.Path} -- output image path
+            resolution {string} -- target resolution (e.g. 1920x1080)
+        """
+        execute = [
+            self.ffmpeg_binary,
+            '-y',
+            '-loglevel',
+            'error',
+            '-i',
+            input_image,
+            '-vf',
+            f'scale={resolution.replace("x", ":")}:flags=lanczos',
+            output_image
+        ]
+
+        return(self._execute(execute))
+
     def _read_configuration(self, phase, section=None):
         """ read configuration from JSON
 
@@ -228,23 +447,17 @@ class Ffmpeg:
         # if section is specified, read configurations or keys
         # from only that section
         if section:
-            source = self.ffmpeg_settings[phase][section].keys()
+            options = self.ffmpeg_settings[phase][section]
 
             # if pixel format is not specified, use the source pixel format
-            try:
-                if self.ffmpeg_settings[phase][section].get('-pix_fmt') is None:
-                    self.ffmpeg_settings[phase][section]['-pix_fmt'] = self.pixel_format
-            except KeyError:
-                pass
+            # the settings are left as they are, they may be shared with other videos
+            if options.get('-pix_fmt') is None:
+                options = dict(options, **{'-pix_fmt': self.pixel_format})
         else:
-            source = self.ffmpeg_settings[phase].keys()
+            options = self.ffmpeg_settings[phase]
 
-        for key in source:
-
-            if section:
-                value = self.ffmpeg_settings[phase][section][key]
-            else:
-                value = self.ffmpeg_settings[phase][key]
+        for key in options:
+            value = options[key]
 
             # null or None means that leave this option out (keep default)
             if value is None or value is False or isinstance(value, dict):
@@ -270,12 +483,15 @@ class Ffmpeg:
 
         return configuration
 
-    def _execute(self, execute):
+    def _execute(self, execute, stdin=None):
         """ execute command
 
         Arguments:
             execute {list} -- list of arguments to be executed
 
+        Keyword Arguments:
+            stdin -- stdin of the process, e.g. subprocess.PIPE (default: {None})
+
         Returns:
             int -- execution return code
         """
@@ -284,4 +500,4 @@ class Ffmpeg:
 
         Avalon.debug_info(f'Executing: {execute}')
 
-        return subprocess.Popen(execute)
+        return subprocess.Popen(execute, stdin=stdin)
@@ -4,12 +4,15 @@
 Name: SRMD NCNN Vulkan Driver
 Creator: K4YT3X
 Date Created: April 26, 2020
-Last Modified: May 7, 2020
+Last Modified: October 17, 2026
 
 Description: This class is a high-level wrapper
 for srmd_ncnn_vulkan.
 """
 
+# local imports
+from wrappers.driver_wrapper import DriverWrapper
+
 # built-in imports
 import argparse
 import os
@@ -23,7 +26,7 @@ import threading
 from avalon_framework import Avalon
 
 
-class WrapperMain:
+class WrapperMain(DriverWrapper):
     """This class communicates with SRMD NCNN Vulkan engine
 
     An object will be created for this class, containing information
@@ -32,6 +35,9 @@ class WrapperMain:
     the upscale function.
     """
 
+    SCALE_RATIOS = [2, 3, 4]
+    IMAGE_FORMATS = ['png']
+
     def __init__(self, driver_settings):
         self.driver_settings = driver_settings
         self.print_lock = threading.Lock()
@@ -98,3 +104,8 @@ class WrapperMain:
         Avalon.debug_info(f'[upscaler] Subprocess {os.getpid()} executing: {shlex.join(execute)}')
         self.print_lock.release()
         return subprocess.Popen(execute)
+
+    def upscale_frames(self, input_directory, output_directory, job):
+        return self.upscale(input_directory,
+                            output_directory,
+                            job['scale_ratio'])
@@ -4,12 +4,15 @@
 Name: Waifu2x Caffe Driver
 Author: K4YT3X
 Date Created: Feb 24, 2018
-Last Modified: May 7, 2020
+Last Modified: October 17, 2026
 
 Description: This class is a high-level wrapper
 for waifu2x-caffe.
 """
 
+# local imports
+from wrappers.driver_wrapper import DriverWrapper
+
 # built-in imports
 import argparse
 import os
@@ -21,7 +24,7 @@ import threading
 from avalon_framework import Avalon
 
 
-class WrapperMain:
+class WrapperMain(DriverWrapper):
     """This class communicates with waifu2x cui engine
 
     An object will be created for this class, containing information
@@ -30,6 +33,12 @@ class WrapperMain:
     the upscale function.
     """
 
+    # waifu2x-caffe scales by any ratio or to a width and height
+    SCALE_TO_RESOLUTION = True
+    IMAGE_FORMATS = ['bmp', 'png']
+    BIT_DEPTHS = [8, 16]
+    MODEL_LOAD_COST = 3.0
+
     def __init__(self, driver_settings):
         self.driver_settings = driver_settings
         self.print_lock = threading.Lock()
@@ -109,3 +118,12 @@ class WrapperMain:
         Avalon.debug_info(f'[upscaler] Subprocess {os.getpid()} executing: {shlex.join(execute)}')
         self.print_lock.release()
         return subprocess.Popen(execute)
+
+    def upscale_frames(self, input_directory, output_directory, job):
+        return self.upscale(input_directory,
+                            output_directory,
+                            job['scale_ratio'],
+                            job['scale_width'],
+                            job['scale_height'],
+                            job['image_format'],
+                            job['bit_depth'])
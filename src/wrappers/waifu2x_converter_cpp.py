@@ -4,12 +4,15 @@
 Name: Waifu2x Converter CPP Driver
 Author: K4YT3X
 Date Created: February 8, 2019
-Last Modified: May 7, 2020
+Last Modified: October 17, 2026
 
 Description: This class is a high-level wrapper
 for waifu2x-converter-cpp.
 """
 
+# local imports
+from wrappers.driver_wrapper import DriverWrapper
+
 # built-in imports
 import argparse
 import os
@@ -22,7 +25,7 @@ import threading
 from avalon_framework import Avalon
 
 
-class WrapperMain:
+class WrapperMain(DriverWrapper):
     """This class communicates with waifu2x cui engine
 
     An object will be created for this class, containing information
@@ -31,6 +34,10 @@ class WrapperMain:
     the upscale function.
     """
 
+    # waifu2x-converter-cpp upscales with its own threads
+    INTERNAL_THREADING = True
+    IMAGE_FORMATS = ['bmp', 'png']
+
     def __init__(self, driver_settings):
         self.driver_settings = driver_settings
         self.print_lock = threading.Lock()
@@ -115,3 +122,10 @@ class WrapperMain:
         Avalon.debug_info(f'[upscaler] Subprocess {os.getpid()} executing: {shlex.join(execute)}')
         self.print_lock.release()
         return subprocess.Popen(execute)
+
+    def upscale_frames(self, input_directory, output_directory, job):
+        return self.upscale(input_directory,
+                            output_directory,
+                            job['scale_ratio'],
+                            job['processes'],
+                            job['image_format'])
@@ -7,12 +7,15 @@ Date Created: June 26, 2019
 Last Modified: May 7, 2020
 
 Editor: K4YT3X
-Last Modified: February 22, 2020
+Last Modified: October 17, 2026
 
 Description: This class is a high-level wrapper
 for waifu2x_ncnn_vulkan.
 """
 
+# local imports
+from wrappers.driver_wrapper import DriverWrapper
+
 # built-in imports
 import argparse
 import os
@@ -26,7 +29,7 @@ import threading
 from avalon_framework import Avalon
 
 
-class WrapperMain:
+class WrapperMain(DriverWrapper):
     """This class communicates with waifu2x ncnn vulkan engine
 
     An object will be created for this class, containing information
@@ -35,6 +38,9 @@ class WrapperMain:
     the upscale function.
     """
 
+    SCALE_RATIOS = [1, 2]
+    IMAGE_FORMATS = ['png']
+
     def __init__(self, driver_settings):
         self.driver_settings = driver_settings
         self.print_lock = threading.Lock()
@@ -101,3 +107,8 @@ class WrapperMain:
         Avalon.debug_info(f'[upscaler] Subprocess {os.getpid()} executing: {shlex.join(execute)}')
         self.print_lock.release()
         return subprocess.Popen(execute)
+
+    def upscale_frames(self, input_directory, output_directory, job):
+        return self.upscale(input_directory,
+                            output_directory,
+                            job['scale_ratio'])